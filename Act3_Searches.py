@@ -1,6 +1,9 @@
-import heapq
+from graphCore import GraphBuilder, reconstruct_path
+from searchFrontier import HeapFrontier
+
+class Graph(GraphBuilder):
+    adjacency_attr = "edges"
 
-class Graph:
     def __init__(self):
         self.edges = {}
         self.heuristics = {}
@@ -9,50 +12,56 @@ class Graph:
         if from_node not in self.edges:
             self.edges[from_node] = []
         self.edges[from_node].append((to_node, cost))
+        self.touch()
     
     def set_heuristic(self, node, value):
         self.heuristics[node] = value
+        self.touch(edges=False)
     
-    def a_star(self, start, goal):
-        open_set = []
-        heapq.heappush(open_set, (self.heuristics[start], 0, start, []))  # (f, g, node, path)
-        visited = {}
+    def a_star(self, start, goal, frontier=HeapFrontier):
+        open_set = frontier()
+        open_set.push(start, (self.heuristics[start], 0))  # priority (f, g)
+        visited = {start: 0}
+        parent = {start: None}
         
         while open_set:
-            f, g, current, path = heapq.heappop(open_set)
-            
-            if current in visited and visited[current] <= g:
-                continue
-            
-            path = path + [current]
-            visited[current] = g
+            current, (f, g) = open_set.pop()
             
             if current == goal:
-                return path, g
+                return reconstruct_path(parent, goal), g
             
             for neighbor, cost in self.edges.get(current, []):
                 new_g = g + cost
+                if neighbor in visited and visited[neighbor] <= new_g:
+                    continue
+                visited[neighbor] = new_g
+                parent[neighbor] = current
                 new_f = new_g + self.heuristics[neighbor]
-                heapq.heappush(open_set, (new_f, new_g, neighbor, path))
+                open_set.push(neighbor, (new_f, new_g))
         
         return None, float('inf')
 
 
-graph = Graph()
+def main():
+    graph = Graph()
+
+    graph.add_edge("A", "B", 10)
+    graph.add_edge("A", "C", 15)
+    graph.add_edge("B", "D", 12)
+    graph.add_edge("C", "D", 10)
+    graph.add_edge("D", "E", 5)
+
+    graph.set_heuristic("A", 20)
+    graph.set_heuristic("B", 15)
+    graph.set_heuristic("C", 10)
+    graph.set_heuristic("D", 5)
+    graph.set_heuristic("E", 0)
 
-graph.add_edge("A", "B", 10)
-graph.add_edge("A", "C", 15)
-graph.add_edge("B", "D", 12)
-graph.add_edge("C", "D", 10)
-graph.add_edge("D", "E", 5)
+    start, goal = "A", "E"
+    path, cost = graph.a_star(start, goal)
 
-graph.set_heuristic("A", 20)
-graph.set_heuristic("B", 15)
-graph.set_heuristic("C", 10)
-graph.set_heuristic("D", 5)
-graph.set_heuristic("E", 0)
+    print(f"Ruta óptima: {path}, Costo total: {cost}")
 
-start, goal = "A", "E"
-path, cost = graph.a_star(start, goal)
 
-print(f"Ruta óptima: {path}, Costo total: {cost}")
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
-from queue import PriorityQueue
+import time
 
-class Graph:
+from graphCore import INF, GraphBuilder, reconstruct_path, traced_path
+from searchFrontier import HeapFrontier
+
+class Graph(GraphBuilder):
     def __init__(self):
         self.graph = {}      # Store city connections and distances
         self.heuristic = {}  # Store straight-line distances to goal
@@ -14,29 +17,38 @@ class Graph:
         
         self.graph[city1][city2] = distance
         self.graph[city2][city1] = distance
+        self.touch()
     
     def add_heuristic(self, city, distance_to_goal):
         # Add straight-line distance to goal
         self.heuristic[city] = distance_to_goal
+        self.touch(edges=False)
 
-def astar(graph, start, goal):
-    # Priority queue to store (f_score, city, path, cost)
-    frontier = PriorityQueue()
-    frontier.put((0, start, [start], 0))
+def astar(graph, start, goal, frontier=HeapFrontier, cache=None, stats=None):
+    # Answer repeated queries from a RouteCache when one is given
+    # (cache hits leave stats, an optional SearchStats, untouched)
+    if cache is not None:
+        return cache.query(graph, start, goal,
+                           lambda: astar(graph, start, goal, frontier, stats=stats))
+    if stats is not None:
+        stats.start()
+    
+    # Priority queue of cities with priority (f_score, cost)
+    # (HeapFrontier or IndexedHeap, neither takes a lock like queue.PriorityQueue)
+    open_cities = frontier(stats)
+    open_cities.push(start, (0, 0))
     
+    # Predecessor of each city on the best path found so far
+    parent = {start: None}
     # Keep track of visited cities
     visited = set()
     
-    while not frontier.empty():
-        f_score, current, path, cost = frontier.get()
+    while open_cities:
+        current, (f_score, cost) = open_cities.pop()
         
         # Check if we reached the goal
         if current == goal:
-            return path, cost
-        
-        # Skip if already visited
-        if current in visited:
-            continue
+            return traced_path(parent, goal, stats), cost
             
         visited.add(current)
         
@@ -46,12 +58,100 @@ def astar(graph, start, goal):
                 new_cost = cost + distance
                 h_score = graph.heuristic[next_city]  # Estimated distance to goal
                 f_score = new_cost + h_score         # Total estimated cost
-                new_path = path + [next_city]
                 
-                frontier.put((f_score, next_city, new_path, new_cost))
+                if open_cities.push(next_city, (f_score, new_cost)):
+                    parent[next_city] = current
+        if stats is not None:
+            stats.expanded(len(open_cities))
     
+    if stats is not None:
+        stats.lap("search")
     return None, None
 
+def anytime_astar(graph, start, goal, time_budget=None, deadline=None,
+                  weight=3.0, weight_step=0.5, frontier=HeapFrontier):
+    """
+    Anytime Repairing A* (ARA*): a weighted A* with f = cost + weight * h
+    finds a first path quickly, then the weight is lowered step by step
+    towards 1 and the search is repaired, reusing the costs found so far,
+    to improve the path while time remains.
+    time_budget is in seconds from now; deadline is a time.perf_counter()
+    value. Without either it runs until the path is proven optimal.
+    The bound assumes graph.heuristic is consistent, as straight-line
+    distances are.
+    Returns: (path, cost, bound) where cost <= bound * optimal cost,
+    or (None, None, None) if no path was found in time
+    """
+    if time_budget is not None:
+        budget_end = time.perf_counter() + time_budget
+        deadline = budget_end if deadline is None else min(deadline, budget_end)
+    
+    cost_to = {start: 0}
+    parent = {start: None}
+    # Cities on the frontier, and closed cities whose cost improved since
+    # they were expanded with the current weight
+    open_set = {start}
+    inconsistent = set()
+    best_path, best_cost = None, None
+    # Weight of the last search that ran to completion, which bounds its path
+    proven_weight = INF
+    
+    def priority(city):
+        return (cost_to[city] + weight * graph.heuristic[city], cost_to[city])
+    
+    open_cities = frontier()
+    open_cities.push(start, priority(start))
+    
+    while True:
+        # Expand until no open city could lead to a cheaper goal under this weight
+        closed = set()
+        timed_out = False
+        while open_cities and open_cities.peek()[1][0] < cost_to.get(goal, INF):
+            if deadline is not None and time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            current, (_, cost) = open_cities.pop()
+            open_set.discard(current)
+            closed.add(current)
+            
+            for next_city, distance in graph.graph[current].items():
+                new_cost = cost + distance
+                if new_cost < cost_to.get(next_city, INF):
+                    cost_to[next_city] = new_cost
+                    parent[next_city] = current
+                    if next_city in closed:
+                        inconsistent.add(next_city)
+                    else:
+                        open_set.add(next_city)
+                        open_cities.push(next_city, priority(next_city))
+        
+        if goal in cost_to and (best_cost is None or cost_to[goal] < best_cost):
+            best_path = reconstruct_path(parent, goal)
+            # Cities on the way may have improved after the goal was reached,
+            # so the path can be cheaper than cost_to[goal]
+            best_cost = sum(graph.graph[a][b] for a, b in zip(best_path, best_path[1:]))
+        if best_cost is None:
+            return None, None, None
+        if not timed_out:
+            proven_weight = weight
+        
+        # Unexpanded work bounds the optimal cost from below
+        lower = min((cost_to[city] + graph.heuristic[city] for city in open_set | inconsistent),
+                    default=best_cost)
+        if lower >= best_cost:
+            return best_path, best_cost, 1.0
+        if timed_out:
+            bound = min(proven_weight, best_cost / lower) if lower > 0 else proven_weight
+            return best_path, best_cost, max(bound, 1.0)
+        
+        # Tighten the weight and requeue open and inconsistent cities under it
+        weight = max(1.0, weight - weight_step)
+        open_set |= inconsistent
+        inconsistent = set()
+        open_cities = frontier()
+        for city in open_set:
+            open_cities.push(city, priority(city))
+
 # Example usage
 def main():
     # Create graph
@@ -1,7 +1,13 @@
 from collections import deque, defaultdict
-from queue import PriorityQueue
+from itertools import count
+import heapq
 
-class Graph:
+import numpy as np
+
+from graphCore import INF, NO_PARENT, CompactGraph, GraphBuilder, path_from_parents, traced_path
+from searchFrontier import HeapFrontier
+
+class Graph(GraphBuilder):
     def __init__(self):
         # Initialize an empty adjacency list to store the graph
         self.graph = defaultdict(list)
@@ -9,93 +15,410 @@ class Graph:
     def add_edge(self, source, destination, cost):
         # Add an edge to the graph with its cost
         self.graph[source].append((destination, cost))
+        self.touch()
 
 
-def bfs(graph, start, goal):
+def bfs(graph, start, goal, stats=None):
     """
     Breadth-First Search implementation
     Explores nodes level by level
+    stats is an optional SearchStats to fill in
     """
-    # Queue stores (node, path, cost)
-    queue = deque([(start, [start], 0)])
-    visited = set()
+    # Queue stores (node, previous node, cost)
+    queue = deque([(start, None, 0)])
+    # Predecessor of each visited node, doubles as the visited set
+    parent = {}
+    if stats is not None:
+        stats.start()
     
     while queue:
-        node, path, cost = queue.popleft()
+        node, previous, cost = queue.popleft()
         
         if node == goal:
-            return path, cost
+            parent[node] = previous
+            return traced_path(parent, goal, stats), cost
             
-        if node not in visited:
-            visited.add(node)
+        if node not in parent:
+            parent[node] = previous
             
             # Add all unvisited neighbors to the queue
             for neighbor, edge_cost in graph.graph[node]:
-                if neighbor not in visited:
-                    new_path = path + [neighbor]
+                if neighbor not in parent:
                     new_cost = cost + edge_cost
-                    queue.append((neighbor, new_path, new_cost))
+                    queue.append((neighbor, node, new_cost))
+            if stats is not None:
+                stats.expanded(len(queue))
+        elif stats is not None:
+            # Reached again through another node before being expanded
+            stats.stale_skips += 1
     
+    if stats is not None:
+        stats.lap("search")
     return None, None
 
 
-def dfs(graph, start, goal):
+def level_bfs(graph, start, goal, levels=False, stats=None):
+    """
+    Level-synchronous Breadth-First Search for very large graphs
+    Expands a whole level at once with NumPy gathers over the CSR arrays of
+    graph (a Graph, frozen first, or a CompactGraph, e.g. from
+    CompactGraph.from_edge_file), with a visited map and a parent array
+    instead of per-node Python objects. Nodes are discovered in the same
+    order as bfs(), so it returns the same (path, cost).
+    levels=True explores everything reachable from start (goal may then be
+    None) and also returns the BFS level of every node id, -1 where
+    unreachable: (path, cost, levels)
+    stats is an optional SearchStats to fill in
+    """
+    compact = graph if isinstance(graph, CompactGraph) else graph.freeze()
+    offsets, targets, weights = compact.offsets, compact.targets, compact.weights
+    n = compact.num_nodes
+    level = np.full(n, -1, dtype=np.int32) if levels else None
+
+    def result(path, cost):
+        return (path, cost, level) if levels else (path, cost)
+
+    if start == goal:
+        if levels and start in compact.index:
+            level[compact.index[start]] = 0
+        return result([start], 0)
+    if start not in compact.index or (goal not in compact.index and not levels):
+        return result(None, None)
+    source = compact.index[start]
+    target = compact.index.get(goal, -1)
+    if stats is not None:
+        stats.start()
+
+    visited = np.zeros(n, dtype=bool)
+    parent = np.full(n, NO_PARENT, dtype=np.int32)
+    cost = np.zeros(n, dtype=weights.dtype)
+    visited[source] = True
+    if levels:
+        level[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    depth = 0
+    while len(frontier):
+        # Every out-edge of the level, in the order the queue of bfs() meets them
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        first = np.cumsum(counts) - counts
+        edges = np.arange(total) - np.repeat(first - starts, counts)
+        sources = np.repeat(frontier, counts)
+        neighbors = targets[edges]
+        fresh = ~visited[neighbors]
+        edges, sources, neighbors = edges[fresh], sources[fresh], neighbors[fresh]
+        # A node reached from several sources keeps the first edge to it
+        _, seen_at = np.unique(neighbors, return_index=True)
+        seen_at.sort()
+        frontier = neighbors[seen_at].astype(np.int64)
+        parent[frontier] = sources[seen_at]
+        cost[frontier] = cost[sources[seen_at]] + weights[edges[seen_at]]
+        visited[frontier] = True
+        depth += 1
+        if levels:
+            level[frontier] = depth
+        if stats is not None:
+            stats.expanded(len(frontier), len(starts))
+        if not levels and visited[target]:
+            break
+
+    if stats is not None:
+        stats.lap("search")
+    if target < 0 or not visited[target]:
+        return result(None, None)
+    path = [compact.names[node] for node in path_from_parents(parent, target)]
+    if stats is not None:
+        stats.lap("path")
+    return result(path, cost[target].item())
+
+
+def dfs(graph, start, goal, stats=None):
     """
     Depth-First Search implementation
     Explores nodes in depth, backtracking when necessary
+    stats is an optional SearchStats to fill in
     """
-    # Stack stores (node, path, cost)
-    stack = [(start, [start], 0)]
-    visited = set()
+    # Stack stores (node, previous node, cost)
+    stack = [(start, None, 0)]
+    # Predecessor of each visited node, doubles as the visited set
+    parent = {}
+    if stats is not None:
+        stats.start()
     
     while stack:
-        node, path, cost = stack.pop()
+        node, previous, cost = stack.pop()
         
         if node == goal:
-            return path, cost
+            parent[node] = previous
+            return traced_path(parent, goal, stats), cost
             
-        if node not in visited:
-            visited.add(node)
+        if node not in parent:
+            parent[node] = previous
             
             # Add all unvisited neighbors to the stack
             for neighbor, edge_cost in graph.graph[node]:
-                if neighbor not in visited:
-                    new_path = path + [neighbor]
+                if neighbor not in parent:
                     new_cost = cost + edge_cost
-                    stack.append((neighbor, new_path, new_cost))
+                    stack.append((neighbor, node, new_cost))
+            if stats is not None:
+                stats.expanded(len(stack))
+        elif stats is not None:
+            # Reached again through another node before being expanded
+            stats.stale_skips += 1
     
+    if stats is not None:
+        stats.lap("search")
     return None, None
 
 
-def ucs(graph, start, goal):
+def ucs(graph, start, goal, frontier=HeapFrontier, stats=None):
     """
     Uniform Cost Search implementation
     Explores nodes in order of accumulated cost
+    frontier is the priority queue class (HeapFrontier or IndexedHeap)
+    stats is an optional SearchStats to fill in
     """
-    # Priority queue stores (cost, node, path)
-    pq = PriorityQueue()
-    pq.put((0, start, [start]))
+    # Priority queue of nodes keyed by accumulated cost
+    pq = frontier(stats)
+    pq.push(start, 0)
+    # Predecessor of each node on the cheapest path found so far
+    parent = {start: None}
     visited = set()
+    if stats is not None:
+        stats.start()
     
-    while not pq.empty():
-        cost, node, path = pq.get()
+    while pq:
+        node, cost = pq.pop()
         
         if node == goal:
-            return path, cost
-            
-        if node not in visited:
-            visited.add(node)
+            return traced_path(parent, goal, stats), cost
             
-            # Add all unvisited neighbors to the priority queue
-            for neighbor, edge_cost in graph.graph[node]:
-                if neighbor not in visited:
-                    new_path = path + [neighbor]
-                    new_cost = cost + edge_cost
-                    pq.put((new_cost, neighbor, new_path))
+        visited.add(node)
+        
+        # Add all unvisited neighbors to the priority queue
+        for neighbor, edge_cost in graph.graph[node]:
+            if neighbor not in visited:
+                new_cost = cost + edge_cost
+                if pq.push(neighbor, new_cost):
+                    parent[neighbor] = node
+        if stats is not None:
+            stats.expanded(len(pq))
     
+    if stats is not None:
+        stats.lap("search")
     return None, None
 
 
+def ida_star(graph, start, goal, heuristic=None, stats=None):
+    """
+    Iterative Deepening A* implementation
+    Depth-first passes bounded by f = cost + heuristic, raising the bound to
+    the smallest f that was cut off until the goal fits. Memory holds only
+    the current path, so graph.graph may also be an implicit state space
+    that yields (neighbor, cost) pairs on demand.
+    heuristic(node) must not overestimate; without one every pass is bounded
+    by cost alone. stats is an optional SearchStats to fill in.
+    """
+    heuristic = heuristic or (lambda node: 0)
+    if start == goal:
+        return [start], 0
+    bound = heuristic(start)
+    
+    while True:
+        # Current path with the cost to each node and its unexplored neighbors
+        path = [start]
+        costs = [0]
+        neighbors = [iter(graph.graph[start])]
+        on_path = {start}
+        next_bound = INF
+        if stats is not None:
+            stats.expansions += 1
+            stats.peak_nodes = max(stats.peak_nodes or 0, 1)
+        
+        while neighbors:
+            edge = next(neighbors[-1], None)
+            if edge is None:
+                # All neighbors tried: backtrack
+                neighbors.pop()
+                costs.pop()
+                on_path.discard(path.pop())
+                continue
+            
+            neighbor, edge_cost = edge
+            if neighbor in on_path:
+                continue
+            cost = costs[-1] + edge_cost
+            f_score = cost + heuristic(neighbor)
+            if f_score > bound:
+                next_bound = min(next_bound, f_score)
+                continue
+            if neighbor == goal:
+                return path + [neighbor], cost
+            
+            path.append(neighbor)
+            costs.append(cost)
+            neighbors.append(iter(graph.graph[neighbor]))
+            on_path.add(neighbor)
+            if stats is not None:
+                stats.expansions += 1
+                stats.peak_nodes = max(stats.peak_nodes or 0, len(path))
+        
+        if next_bound == INF:
+            return None, None
+        bound = next_bound
+
+
+class _TreeNode:
+    """Node of the SMA* search tree."""
+    __slots__ = ("state", "cost", "f_score", "depth", "parent", "children",
+                 "expanded", "forgotten", "key", "entry")
+
+    def __init__(self, state, cost, f_score, depth, parent):
+        self.state = state
+        self.cost = cost
+        self.f_score = f_score
+        self.depth = depth
+        self.parent = parent
+        self.children = []
+        self.expanded = False
+        # Successors dropped from memory, with the f they had backed up
+        self.forgotten = {}
+        # Priority while on the open list, and the id of its live heap entry
+        self.key = INF
+        self.entry = None
+
+
+def sma_star(graph, start, goal, heuristic=None, node_budget=1000, stats=None):
+    """
+    Simplified Memory-bounded A* implementation
+    A* over a search tree that never holds more than node_budget nodes. When
+    memory is full the shallowest of the worst leaves is dropped and its f
+    is remembered by its parent, which goes back on the open list to
+    regenerate it if that branch becomes the most promising again.
+    Optimal when some optimal path has fewer than node_budget nodes,
+    otherwise the best path that fits; (None, None) if no path fits.
+    heuristic(node) must not overestimate. stats is an optional SearchStats.
+    """
+    heuristic = heuristic or (lambda node: 0)
+    sequence = count()
+    # Open nodes: best is lowest f then deepest, worst is highest f then shallowest
+    best_heap, worst_heap = [], []
+    stored = 1
+
+    def open_node(node, key):
+        node.key = key
+        node.entry = next(sequence)
+        heapq.heappush(best_heap, (key, -node.depth, node.entry, node))
+        heapq.heappush(worst_heap, (-key, node.depth, node.entry, node))
+
+    def forget(parent, state, f_score):
+        parent.forgotten[state] = f_score
+        key = min(parent.forgotten.values())
+        if parent.entry is None or parent.key > key:
+            open_node(parent, key)
+
+    def drop_worst_leaf(keep, f_score, depth) -> bool:
+        """Free one node for a new one at (f_score, depth), unless every leaf is better."""
+        skipped = []
+        victim = None
+        while worst_heap:
+            entry = heapq.heappop(worst_heap)
+            node = entry[3]
+            if node.entry != entry[2]:
+                continue
+            if node.children or node.parent is None or node in keep:
+                skipped.append(entry)
+                continue
+            if (node.key, -node.depth) > (f_score, -depth):
+                victim = node
+            else:
+                skipped.append(entry)
+            break
+        for entry in skipped:
+            heapq.heappush(worst_heap, entry)
+        if victim is None:
+            return False
+        victim.entry = None
+        victim.parent.children.remove(victim)
+        forget(victim.parent, victim.state, victim.key)
+        return True
+
+    root = _TreeNode(start, 0, heuristic(start), 0, None)
+    open_node(root, root.f_score)
+    if stats is not None:
+        stats.peak_nodes = max(stats.peak_nodes or 0, stored)
+    
+    while best_heap:
+        key, _, entry, node = heapq.heappop(best_heap)
+        if node.entry != entry:
+            continue
+        if key == INF:
+            break
+        node.entry = None
+        
+        if node.state == goal:
+            path = []
+            current = node
+            while current is not None:
+                path.append(current.state)
+                current = current.parent
+            return list(reversed(path)), node.cost
+        
+        if stats is not None:
+            stats.expansions += 1
+        # Cheapest edge to each successor not already in memory or on the path
+        ancestors = set()
+        current = node
+        while current is not None:
+            ancestors.add(current.state)
+            current = current.parent
+        present = {child.state for child in node.children}
+        successors = {}
+        for neighbor, edge_cost in graph.graph[node.state]:
+            if neighbor not in ancestors and neighbor not in present:
+                successors[neighbor] = min(edge_cost, successors.get(neighbor, INF))
+        # The first expansion generates every successor, later ones only
+        # bring back forgotten successors with the f they had backed up
+        remembered = node.forgotten
+        node.forgotten = {}
+        if node.expanded:
+            successors = {state: cost for state, cost in successors.items() if state in remembered}
+        node.expanded = True
+        # Never free the node being expanded or the children it just got
+        keep = {node}
+        
+        for neighbor, edge_cost in successors.items():
+            cost = node.cost + edge_cost
+            f_score = max(cost + heuristic(neighbor), node.f_score, remembered.get(neighbor, 0))
+            if neighbor != goal and node.depth + 2 >= node_budget:
+                # Too deep for its own successors to ever fit in memory
+                f_score = INF
+            if stored >= node_budget:
+                if not drop_worst_leaf(keep, f_score, node.depth + 1):
+                    forget(node, neighbor, f_score)
+                    continue
+                stored -= 1
+            child = _TreeNode(neighbor, cost, f_score, node.depth + 1, node)
+            node.children.append(child)
+            keep.add(child)
+            stored += 1
+            open_node(child, f_score)
+            if stats is not None:
+                stats.peak_nodes = max(stats.peak_nodes or 0, stored)
+        
+        # A dead end holds memory for nothing: release it, and any ancestor
+        # it leaves without children or forgotten successors
+        while (node.parent is not None and not node.children
+               and not node.forgotten and node.entry is None):
+            node.parent.children.remove(node)
+            stored -= 1
+            node = node.parent
+    
+    return None, None
+
 
 def main():
     # Create and populate the graph
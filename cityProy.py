@@ -1,12 +1,21 @@
-from queue import PriorityQueue
-from typing import Dict, List, Set, Tuple
-import heapq
+from typing import Callable, Dict, List, Set, Tuple
 
-class CityGraph:
+from graphCore import INF, GraphBuilder, traced_path
+from landmarks import select_landmarks
+from searchFrontier import HeapFrontier
+
+class CityGraph(GraphBuilder):
     def __init__(self):
         # Initialize graph and heuristics as dictionaries
         self.graph = {}  # adjacency list with costs
         self.heuristics = {}  # straight-line distances to target
+        # Landmark (ALT) data, see build_landmarks()
+        self.landmark_count = 0
+        self.landmarks: List[str] = []
+        self.landmark_distances = None  # (landmarks, cities) array
+        # Per city id, its distance from every landmark (the array's columns)
+        self._landmark_columns: List[List[float]] = []
+        self.landmark_version = -1
     
     def add_edge(self, city1: str, city2: str, distance: float):
         """Add a bidirectional edge between cities with given distance"""
@@ -18,14 +27,57 @@ class CityGraph:
         # Add bidirectional edges
         self.graph[city1][city2] = distance
         self.graph[city2][city1] = distance
+        self.touch()
     
     def add_heuristic(self, city: str, target: str, distance: float):
         """Add heuristic value (straight-line distance) from city to target"""
         if city not in self.heuristics:
             self.heuristics[city] = {}
         self.heuristics[city][target] = distance
+        self.touch(edges=False)
+
+    def build_landmarks(self, count: int = 4):
+        """
+        Switch on landmark (ALT) heuristics: pick count landmarks far apart and
+        store the distance from each of them to every city, one Dijkstra per
+        landmark (the ones run while picking them). They are rebuilt
+        automatically after the map changes.
+        """
+        graph = self.freeze()
+        landmarks, self.landmark_distances = select_landmarks(graph, count)
+        self.landmark_count = count
+        self.landmarks = [graph.names[city] for city in landmarks]
+        self._landmark_columns = self.landmark_distances.T.tolist()
+        self.landmark_version = self.edges_version
+
+    def heuristic_to(self, target: str) -> Callable[[str], float]:
+        """
+        Heuristic function towards target. With landmarks it is the ALT lower
+        bound (raised to the add_heuristic value where one exists), so any
+        target works without a table. Without landmarks only the table is
+        used and cities missing from it get inf. The ALT bound is worked out
+        per city as the search asks for it, not for every city up front.
+        """
+        if not self.landmark_count:
+            return lambda city: self.heuristics[city].get(target, float('inf'))
+        if self.landmark_version != self.edges_version:
+            self.build_landmarks(self.landmark_count)
+        graph = self.freeze()
+        if target not in graph.index:
+            return lambda city: 0
+        columns, index = self._landmark_columns, graph.index
+        to_target = columns[index[target]]
 
-def astar(graph: CityGraph, start: str, target: str) -> Tuple[List[str], float]:
+        def heuristic(city: str) -> float:
+            # Triangle inequality over the landmarks both cities are reachable from
+            bound = max((abs(at_target - at_city)
+                         for at_target, at_city in zip(to_target, columns[index[city]])
+                         if at_target != INF and at_city != INF), default=0)
+            return max(bound, self.heuristics.get(city, {}).get(target, 0))
+        return heuristic
+
+def astar(graph: CityGraph, start: str, target: str,
+          frontier=HeapFrontier, stats=None) -> Tuple[List[str], float]:
     """
     A* algorithm implementation for finding the shortest path between cities
     
@@ -33,26 +85,32 @@ def astar(graph: CityGraph, start: str, target: str) -> Tuple[List[str], float]:
         graph: CityGraph object containing the map and heuristics
         start: Starting city name
         target: Target city name
+        frontier: Priority queue class (HeapFrontier or IndexedHeap)
+        stats: Optional SearchStats to fill in
     
     Returns:
         Tuple containing:
             - List of cities representing the optimal path
             - Total cost of the path
     """
-    # Priority queue entries are: (f_score, current_cost, city, path)
-    pq = [(0, 0, start, [start])]
+    if stats is not None:
+        stats.start()
+    heuristic = graph.heuristic_to(target)
+    if stats is not None:
+        stats.lap("heuristic")
+    # Priority queue of cities with priority (f_score, current_cost)
+    pq = frontier(stats)
+    pq.push(start, (0, 0))
+    # Predecessor of each city on the best path found so far
+    parent = {start: None}
     visited = set()
     
     while pq:
-        f_score, current_cost, current_city, path = heapq.heappop(pq)
+        current_city, (f_score, current_cost) = pq.pop()
         
         # If we've reached the target, return the path and cost
         if current_city == target:
-            return path, current_cost
-        
-        # Skip if we've already visited this city
-        if current_city in visited:
-            continue
+            return traced_path(parent, target, stats), current_cost
         
         visited.add(current_city)
         
@@ -61,16 +119,18 @@ def astar(graph: CityGraph, start: str, target: str) -> Tuple[List[str], float]:
             if next_city not in visited:
                 # Calculate costs
                 g_score = current_cost + distance  # cost from start to next_city
-                h_score = graph.heuristics[next_city].get(target, float('inf'))  # heuristic to target
+                h_score = heuristic(next_city)  # heuristic to target
                 f_score = g_score + h_score  # total estimated cost
                 
-                # Create new path including this city
-                new_path = path + [next_city]
-                
-                # Add to priority queue
-                heapq.heappush(pq, (f_score, g_score, next_city, new_path))
+                # Add to priority queue, remembering where we came from
+                if pq.push(next_city, (f_score, g_score)):
+                    parent[next_city] = current_city
+        if stats is not None:
+            stats.expanded(len(pq))
     
     # If no path is found, return None
+    if stats is not None:
+        stats.lap("search")
     return None, None
 
 def main():
@@ -0,0 +1,260 @@
+from typing import Dict, List, Set, Tuple
+import hashlib
+import heapq
+import json
+
+import numpy as np
+
+from graphCore import INF, NO_PARENT, CompactGraph, reconstruct_path
+
+
+def graph_fingerprint(graph: CompactGraph) -> str:
+    """Hash of the compact arrays, used to check a saved hierarchy still fits a graph."""
+    digest = hashlib.sha1()
+    digest.update("\n".join(map(repr, graph.names)).encode())
+    for array in (graph.offsets, graph.targets, graph.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over an undirected CompactGraph (roads added with
+    add_road). Nodes are contracted one by one in order of importance; a
+    shortcut replaces u - v - w whenever no witness path u -> w avoiding v is
+    as cheap. A query is then a bidirectional Dijkstra that only follows
+    edges towards more important nodes, which settles a few hundred nodes
+    even on large road networks.
+    """
+
+    def __init__(self, names: List, rank: np.ndarray, up_offsets: np.ndarray,
+                 up_targets: np.ndarray, up_weights: np.ndarray, up_middle: np.ndarray,
+                 fingerprint: str = ""):
+        self.names = names
+        self.index: Dict = {name: i for i, name in enumerate(names)}
+        self.rank = rank
+        # Upward graph in CSR form: edges to higher-ranked nodes, with the
+        # contracted middle node of every shortcut (NO_PARENT for real roads)
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.up_middle = up_middle
+        self.fingerprint = fingerprint
+        self.integer_costs = up_weights.dtype.kind in "iu"
+
+    @classmethod
+    def build(cls, graph: CompactGraph, witness_limit: int = 60) -> "ContractionHierarchy":
+        """
+        Contract every node of graph. witness_limit caps the nodes settled by
+        each witness search; a smaller limit builds faster but adds more
+        (harmless) shortcuts.
+        """
+        n = graph.num_nodes
+        # Working adjacency {neighbor: (cost, middle)}, parallel roads keep the cheapest
+        adjacency: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(n)]
+        for u in range(n):
+            targets, weights = graph.neighbors(u)
+            for v, cost in zip(targets, weights):
+                if u != v and cost < adjacency[u].get(v, (INF,))[0]:
+                    adjacency[u][v] = (cost, NO_PARENT)
+                    adjacency[v][u] = (cost, NO_PARENT)
+
+        contracted = [False] * n
+        deleted_neighbors = [0] * n
+        rank = np.zeros(n, dtype=np.int32)
+
+        def shortcuts_for(node: int) -> List[Tuple[int, int, float]]:
+            neighbors = [(u, cost) for u, (cost, _) in adjacency[node].items() if not contracted[u]]
+            shortcuts = []
+            for i, (u, cost_u) in enumerate(neighbors):
+                later = neighbors[i + 1:]
+                if not later:
+                    break
+                limit = cost_u + max(cost for _, cost in later)
+                witness = cls._witness_search(adjacency, contracted, u, node, limit, witness_limit,
+                                              {w for w, _ in later})
+                for w, cost_w in later:
+                    via = cost_u + cost_w
+                    if witness.get(w, INF) > via:
+                        shortcuts.append((u, w, via))
+            return shortcuts
+
+        def importance(node: int) -> int:
+            live = sum(1 for u in adjacency[node] if not contracted[u])
+            return len(shortcuts_for(node)) - live + deleted_neighbors[node]
+
+        order = [(importance(node), node) for node in range(n)]
+        heapq.heapify(order)
+        next_rank = 0
+        while order:
+            _, node = heapq.heappop(order)
+            # Lazy update: re-rate the node and put it back if it got worse
+            current = importance(node)
+            if order and current > order[0][0]:
+                heapq.heappush(order, (current, node))
+                continue
+
+            for u, w, via in shortcuts_for(node):
+                if via < adjacency[u].get(w, (INF,))[0]:
+                    adjacency[u][w] = (via, node)
+                    adjacency[w][u] = (via, node)
+            contracted[node] = True
+            rank[node] = next_rank
+            next_rank += 1
+            for u in adjacency[node]:
+                deleted_neighbors[u] += 1
+
+        rows, cols, costs, middles = [], [], [], []
+        for u in range(n):
+            for v, (cost, middle) in adjacency[u].items():
+                if rank[u] < rank[v]:
+                    rows.append(u)
+                    cols.append(v)
+                    costs.append(cost)
+                    middles.append(middle)
+        up = CompactGraph.from_edges(list(graph.names), rows, cols, costs)
+        order_by_row = np.argsort(np.asarray(rows, dtype=np.int64), kind="stable")
+        up_middle = np.asarray(middles, dtype=np.int32)[order_by_row]
+        up_weights = up.weights.astype(graph.weights.dtype) if len(costs) else graph.weights[:0]
+        return cls(list(graph.names), rank, up.offsets, up.targets, up_weights, up_middle,
+                   graph_fingerprint(graph))
+
+    @staticmethod
+    def _witness_search(adjacency, contracted, source: int, avoid: int, limit: float,
+                        max_settled: int, targets: Set[int]) -> Dict[int, float]:
+        """
+        Dijkstra from source over uncontracted nodes except avoid, bounded by
+        cost and size, stopping early once every target is settled.
+        """
+        dist = {source: 0}
+        pq = [(0, source)]
+        settled = 0
+        remaining = len(targets)
+        while pq and settled < max_settled and remaining:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            if d > limit:
+                break
+            settled += 1
+            if u in targets:
+                remaining -= 1
+            for v, (cost, _) in adjacency[u].items():
+                if v == avoid or contracted[v]:
+                    continue
+                new_d = d + cost
+                if new_d < dist.get(v, INF):
+                    dist[v] = new_d
+                    heapq.heappush(pq, (new_d, v))
+        return dist
+
+    def query(self, source: int, target: int) -> Tuple[List[int], float]:
+        """
+        Shortest path between two node ids using only upward edges from both ends.
+        Returns: (path of node ids, total_cost), ([], inf) when there is no path
+        """
+        if source == target:
+            return [source], 0
+        offsets, targets, weights = self.up_offsets, self.up_targets, self.up_weights
+        dist = ({source: 0}, {target: 0})
+        parent = ({source: None}, {target: None})
+        queues = ([(0, source)], [(0, target)])
+        best, meeting = INF, None
+        while queues[0] or queues[1]:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    continue
+                d, u = heapq.heappop(queue)
+                if d > dist[side][u]:
+                    continue
+                if d >= best:
+                    # Nothing left on this side can improve the meeting cost
+                    queue.clear()
+                    continue
+                through = d + dist[1 - side].get(u, INF)
+                if through < best:
+                    best, meeting = through, u
+                lo, hi = offsets[u:u + 2].tolist()
+                up_nodes, up_costs = targets[lo:hi].tolist(), weights[lo:hi].tolist()
+                # Stall-on-demand: roads are two-way, so an upward edge u -> v
+                # is also a way into u; if v reaches u cheaper, u is not on a
+                # shortest up-path and need not be expanded
+                if any(dist[side].get(v, INF) + cost < d for v, cost in zip(up_nodes, up_costs)):
+                    continue
+                for v, cost in zip(up_nodes, up_costs):
+                    new_d = d + cost
+                    if new_d < dist[side].get(v, INF):
+                        dist[side][v] = new_d
+                        parent[side][v] = u
+                        heapq.heappush(queue, (new_d, v))
+
+        if meeting is None:
+            return [], INF
+        upward = reconstruct_path(parent[0], meeting)
+        downward = reconstruct_path(parent[1], meeting)
+        nodes = upward + list(reversed(downward[:-1]))
+        path = [nodes[0]]
+        for a, b in zip(nodes, nodes[1:]):
+            path.extend(self._unpack(a, b))
+        return path, best
+
+    def shortest_path(self, start, goal) -> Tuple[List, float]:
+        """
+        Shortest path between two node names.
+        Returns: (path, total_cost), ([], 0) when there is no path
+        """
+        if start not in self.index or goal not in self.index:
+            return [], 0
+        path, total_cost = self.query(self.index[start], self.index[goal])
+        if not path:
+            return [], 0
+        if self.integer_costs:
+            total_cost = int(total_cost)
+        return [self.names[node] for node in path], total_cost
+
+    def _middle(self, a: int, b: int) -> int:
+        """Middle node of the hierarchy edge between a and b (NO_PARENT for a real road)."""
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        lo, hi = self.up_offsets[low:low + 2].tolist()
+        slot = self.up_targets[lo:hi].tolist().index(high)
+        return int(self.up_middle[lo + slot])
+
+    def _unpack(self, a: int, b: int) -> List[int]:
+        """Expand the edge a -> b into the original nodes after a, ending with b."""
+        nodes = []
+        stack = [(a, b)]
+        while stack:
+            u, v = stack.pop()
+            middle = self._middle(u, v)
+            if middle == NO_PARENT:
+                nodes.append(v)
+            else:
+                # Expand u -> middle first, then middle -> v
+                stack.append((middle, v))
+                stack.append((u, middle))
+        return nodes
+
+    def save(self, path: str):
+        """
+        Write the preprocessed hierarchy in .npz format to exactly path
+        (np.savez would add a .npz suffix that load() does not). Node names
+        must be strings or ints; they are stored as JSON so they load back
+        with the same type.
+        """
+        names = [name.item() if isinstance(name, np.generic) else name for name in self.names]
+        if not all(isinstance(name, (str, int)) for name in names):
+            raise ValueError("only hierarchies with str or int node names can be saved")
+        with open(path, "wb") as handle:
+            np.savez(handle, names=np.array(json.dumps(names)), rank=self.rank,
+                     up_offsets=self.up_offsets, up_targets=self.up_targets,
+                     up_weights=self.up_weights, up_middle=self.up_middle,
+                     fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        """Read a hierarchy written by save()."""
+        with np.load(path) as data:
+            return cls(json.loads(str(data["names"])), data["rank"], data["up_offsets"],
+                       data["up_targets"], data["up_weights"], data["up_middle"],
+                       str(data["fingerprint"]))
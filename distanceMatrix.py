@@ -0,0 +1,84 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from graphCore import CompactGraph, dijkstra
+
+# Graph and destination ids attached by each worker process, see _attach_worker()
+_worker_graph: Optional[CompactGraph] = None
+_worker_destinations: Optional[np.ndarray] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+# (shared memory name, shape, dtype) of one array
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, ArraySpec]:
+    """Copy an array into a new shared memory block."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def attach_array(spec: ArraySpec) -> np.ndarray:
+    """Map an array shared with share_array() into this process, without a copy."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    # Keep the mapping alive for the life of the worker; the parent unlinks it
+    _worker_blocks.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _attach_worker(num_nodes: int, offsets: ArraySpec, targets: ArraySpec,
+                   weights: ArraySpec, destinations: np.ndarray):
+    """Pool initializer: map the frozen graph once per worker process, no copy."""
+    global _worker_graph, _worker_destinations
+    _worker_graph = CompactGraph(range(num_nodes), attach_array(offsets), attach_array(targets),
+                                 attach_array(weights))
+    _worker_destinations = destinations
+
+
+def _distance_row(origin: int) -> np.ndarray:
+    dist, _ = dijkstra(_worker_graph, origin)
+    return dist[_worker_destinations]
+
+
+def distance_matrix(graph: CompactGraph, origins: Sequence[Hashable],
+                    destinations: Sequence[Hashable], workers: int = 1) -> np.ndarray:
+    """
+    Cost matrix from every origin to every destination: one one-to-all
+    Dijkstra per origin. With workers > 1 the origins are spread over a
+    process pool; the CSR arrays are placed in shared memory once and each
+    worker maps them at start-up, so tasks only carry an origin id.
+    Returns: (len(origins), len(destinations)) float array, inf where unreachable
+    """
+    matrix = np.full((len(origins), len(destinations)), np.inf)
+    index: Dict[Hashable, int] = graph.index
+    columns = [col for col, name in enumerate(destinations) if name in index]
+    destination_ids = np.array([index[destinations[col]] for col in columns], dtype=np.int64)
+    rows = [row for row, name in enumerate(origins) if name in index]
+    if not rows or not columns:
+        return matrix
+    tasks = [index[origins[row]] for row in rows]
+
+    if workers <= 1:
+        for row, origin in zip(rows, tasks):
+            dist, _ = dijkstra(graph, origin)
+            matrix[row, columns] = dist[destination_ids]
+        return matrix
+
+    shared = [share_array(array) for array in (graph.offsets, graph.targets, graph.weights)]
+    try:
+        specs = [spec for _, spec in shared]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker,
+                                 initargs=(graph.num_nodes, *specs, destination_ids)) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            for row, values in zip(rows, pool.map(_distance_row, tasks, chunksize=chunksize)):
+                matrix[row, columns] = values
+    finally:
+        for block, _ in shared:
+            block.close()
+            block.unlink()
+    return matrix
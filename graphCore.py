@@ -0,0 +1,589 @@
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+import json
+
+import numpy as np
+
+from searchFrontier import HeapFrontier
+
+# Marker used in parent arrays for "no predecessor"
+NO_PARENT = -1
+INF = float('inf')
+
+Heuristic = Union[Callable[[int], float], np.ndarray, None]
+
+# Snapshot files: magic, format version, header length, JSON header, then
+# the CSR arrays, each starting on an ALIGNMENT boundary
+SNAPSHOT_MAGIC = b"CGRAPH\0\0"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ALIGNMENT = 64
+
+
+class CompactGraph:
+    """
+    Frozen graph where node names are interned to ints once and edges are
+    stored in CSR arrays: the out-edges of node u are
+    targets[offsets[u]:offsets[u + 1]] with the matching weights.
+    """
+
+    def __init__(self, names: List[Hashable], offsets: np.ndarray,
+                 targets: np.ndarray, weights: np.ndarray):
+        self.names = names
+        self.index: Dict[Hashable, int] = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_adjacency(cls, adjacency) -> "CompactGraph":
+        """
+        Build the compact form from the adjacency used by the search classes,
+        either {node: {neighbor: cost}} or {node: [(neighbor, cost), ...]}.
+        Neighbor order is preserved.
+        """
+        names: List[Hashable] = []
+        index: Dict[Hashable, int] = {}
+
+        def intern(name):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+            return index[name]
+
+        rows, cols, costs = [], [], []
+        for node, edges in adjacency.items():
+            u = intern(node)
+            items = edges.items() if isinstance(edges, dict) else edges
+            for neighbor, cost in items:
+                rows.append(u)
+                cols.append(intern(neighbor))
+                costs.append(cost)
+        return cls.from_edges(names, rows, cols, costs)
+
+    @classmethod
+    def from_edges(cls, names: List[Hashable], rows: Sequence[int],
+                   cols: Sequence[int], costs: Sequence[float]) -> "CompactGraph":
+        """Build the CSR arrays from parallel (source, target, cost) id sequences."""
+        n = len(names)
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int32)
+        weights = np.asarray(costs)
+        if weights.dtype.kind not in "iuf":
+            weights = weights.astype(np.float64)
+        # A stable sort by source keeps the original neighbor order per node
+        order = np.argsort(rows, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+        return cls(names, offsets, cols[order], weights[order])
+
+    @classmethod
+    def from_edge_file(cls, path: str, delimiter: Optional[str] = None, undirected: bool = True,
+                       chunk_size: int = 1 << 22, header: Optional[bool] = None) -> "CompactGraph":
+        """
+        Stream an edge list with one `source<delimiter>target[<delimiter>cost]`
+        line per edge straight into the CSR arrays, chunk_size bytes of lines
+        at a time. The delimiter defaults to a tab for .tsv files and a comma
+        otherwise. header says whether the first line holds column names;
+        by default it does when its cost is not a number, or when its
+        endpoints are not integers but those of the second line are. Edges
+        without a cost cost 1. Node names are ints when every name in the
+        file is an integer (nodes are then numbered in increasing name order)
+        and the strings in the file otherwise. Costs stay ints when every
+        cost is an integer. undirected adds each edge both ways, like
+        add_road.
+        """
+        if delimiter is None:
+            delimiter = "\t" if path.lower().endswith(".tsv") else ","
+
+        def read(index: Optional[Dict[str, int]]):
+            """
+            (sources, targets, costs) arrays per chunk. Without an index the
+            names are parsed as integers and None is returned at the first one
+            that is not; with one they are interned from the text as written.
+            """
+            chunks: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+            integer_costs = True
+            columns = None
+            line_number = 0
+
+            def intern(names: List[str]) -> np.ndarray:
+                ids = index.setdefault
+                return np.array([ids(name, len(index)) for name in names], dtype=np.int64)
+
+            with open(path, newline="") as handle:
+                while True:
+                    lines = handle.read(chunk_size)
+                    if not lines:
+                        break
+                    # Finish the last line of the chunk
+                    lines += handle.readline()
+                    lines = [line for line in lines.splitlines() if line]
+                    if not lines:
+                        continue
+                    if columns is None:
+                        columns = lines[0].count(delimiter) + 1
+                        if columns not in (2, 3):
+                            raise ValueError(f"{path}:1: expected 2 or 3 columns, got {columns}")
+                        if _has_header(lines, delimiter, columns) if header is None else header:
+                            lines = lines[1:]
+                            line_number += 1
+                    fields = delimiter.join(lines).split(delimiter)
+                    if len(fields) != columns * len(lines):
+                        for offset, line in enumerate(lines, line_number + 1):
+                            if line.count(delimiter) + 1 != columns:
+                                raise ValueError(f"{path}:{offset}: expected {columns} columns")
+                    line_number += len(lines)
+
+                    sources, targets = fields[0::columns], fields[1::columns]
+                    if index is None:
+                        try:
+                            sources = np.array(sources, dtype=np.int64)
+                            targets = np.array(targets, dtype=np.int64)
+                        except ValueError:
+                            return None
+                    else:
+                        sources, targets = intern(sources), intern(targets)
+
+                    if columns == 2:
+                        costs = np.ones(len(lines), dtype=np.int64)
+                    else:
+                        costs = fields[2::columns]
+                        if integer_costs:
+                            try:
+                                costs = np.array(costs, dtype=np.int64)
+                            except ValueError:
+                                integer_costs = False
+                                chunks = [(chunk[0], chunk[1], chunk[2].astype(np.float64))
+                                          for chunk in chunks]
+                        if not integer_costs:
+                            costs = np.array(costs, dtype=np.float64)
+                    chunks.append((sources, targets, costs))
+            return chunks
+
+        index: Optional[Dict[str, int]] = None
+        chunks = read(index)
+        if chunks is None:
+            # Some name is not an integer: read again, taking every name as
+            # written so that "007" and "7" stay different nodes
+            index = {}
+            chunks = read(index)
+
+        if chunks:
+            rows, cols, costs = (np.concatenate(parts) for parts in zip(*chunks))
+        else:
+            rows = cols = costs = np.zeros(0, dtype=np.int64)
+        if index is None:
+            names, ends = np.unique(np.concatenate((rows, cols)), return_inverse=True)
+            names = names.tolist()
+            rows, cols = ends[:len(rows)], ends[len(rows):]
+        else:
+            names = list(index)
+        if undirected:
+            rows, cols = np.concatenate((rows, cols)), np.concatenate((cols, rows))
+            costs = np.concatenate((costs, costs))
+        return cls.from_edges(names, rows, cols, costs)
+
+    def save(self, path: str):
+        """
+        Write a snapshot that load() maps back into memory without parsing.
+        Node names must be strings or ints.
+        """
+        arrays = {"offsets": self.offsets, "targets": self.targets, "weights": self.weights}
+        layout = {}
+        position = 0
+        for name, values in arrays.items():
+            layout[name] = {"dtype": values.dtype.str, "shape": list(values.shape),
+                            "offset": position}
+            position += -(-values.nbytes // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+        names = [name.item() if isinstance(name, np.generic) else name for name in self.names]
+        if not all(isinstance(name, (str, int)) for name in names):
+            raise ValueError("only graphs with str or int node names can be saved")
+        header = json.dumps({"names": names, "arrays": layout}).encode()
+
+        prefix = len(SNAPSHOT_MAGIC) + 8
+        start = -(-(prefix + len(header)) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+        with open(path, "wb") as handle:
+            handle.write(SNAPSHOT_MAGIC)
+            handle.write(np.array([SNAPSHOT_VERSION, len(header)], dtype="<u4").tobytes())
+            handle.write(header.ljust(start - prefix))
+            for name, values in arrays.items():
+                handle.seek(start + layout[name]["offset"])
+                handle.write(np.ascontiguousarray(values).tobytes())
+            handle.truncate(start + position)
+
+    @classmethod
+    def load(cls, path: str) -> "CompactGraph":
+        """
+        Open a snapshot written by save(). The CSR arrays are memory-mapped
+        read-only, so only the node names are read up front.
+        """
+        prefix = len(SNAPSHOT_MAGIC) + 8
+        with open(path, "rb") as handle:
+            head = handle.read(prefix)
+            if head[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a graph snapshot")
+            version, length = np.frombuffer(head[len(SNAPSHOT_MAGIC):], dtype="<u4").tolist()
+            if version != SNAPSHOT_VERSION:
+                raise ValueError(f"{path} has snapshot version {version}, "
+                                 f"expected {SNAPSHOT_VERSION}")
+            header = json.loads(handle.read(length))
+        start = -(-(prefix + length) // SNAPSHOT_ALIGNMENT) * SNAPSHOT_ALIGNMENT
+
+        arrays = {}
+        for name, info in header["arrays"].items():
+            shape = tuple(info["shape"])
+            if np.prod(shape) == 0:
+                # mmap cannot map an empty range
+                arrays[name] = np.zeros(shape, dtype=info["dtype"])
+            else:
+                arrays[name] = np.memmap(path, dtype=info["dtype"], mode="r",
+                                         offset=start + info["offset"], shape=shape)
+        return cls(header["names"], arrays["offsets"], arrays["targets"], arrays["weights"])
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def node_id(self, name: Hashable) -> int:
+        """Return the interned id of a node name."""
+        return self.index[name]
+
+    def neighbors(self, node: int) -> Tuple[List[int], List[float]]:
+        """Return the (targets, weights) of the out-edges of a node as lists."""
+        lo, hi = self.offsets[node], self.offsets[node + 1]
+        return self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist()
+
+    def edge_cost(self, u: int, v: int) -> float:
+        """Return the cost of the edge u -> v, or inf if there is none."""
+        lo, hi = self.offsets[u], self.offsets[u + 1]
+        hits = np.flatnonzero(self.targets[lo:hi] == v)
+        return self.weights[lo + hits[0]].item() if len(hits) else float('inf')
+
+    def as_cost(self, value: float):
+        """Convert a distance back to the weight type (ints stay ints)."""
+        if self.weights.dtype.kind in "iu" and value != float('inf'):
+            return int(value)
+        return value
+
+
+def _is_number(text: str) -> bool:
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_integer(text: str) -> bool:
+    try:
+        int(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _has_header(lines: List[str], delimiter: str, columns: int) -> bool:
+    """Whether the first of an edge file's lines looks like column names."""
+    first = lines[0].split(delimiter)
+    if columns == 3 and not _is_number(first[2]):
+        return True
+    if len(lines) < 2 or all(_is_integer(name) for name in first[:2]):
+        return False
+    return all(_is_integer(name) for name in lines[1].split(delimiter)[:2])
+
+
+class GraphBuilder:
+    """
+    Mixin for the dict-based graph classes. The add_road/add_edge methods keep
+    building the dict adjacency and call touch(); freeze() returns the compact
+    form, rebuilt only when an edge changed since the last call.
+
+    version counts every change (edges and heuristics) and is what caches of
+    query results check; edges_version only counts edge changes and is what
+    structures derived from the roads alone check.
+    """
+
+    # Name of the attribute holding the dict adjacency
+    adjacency_attr = "graph"
+    version = 0
+    edges_version = 0
+    _frozen: Optional[CompactGraph] = None
+    _frozen_version = -1
+
+    def touch(self, edges: bool = True):
+        """Record a change to the graph (edges=False for heuristic-only changes)."""
+        self.version += 1
+        if edges:
+            self.edges_version += 1
+
+    def freeze(self) -> CompactGraph:
+        """Return the compact CSR form of the current graph."""
+        if self._frozen is None or self._frozen_version != self.edges_version:
+            self._frozen = CompactGraph.from_adjacency(getattr(self, self.adjacency_attr))
+            self._frozen_version = self.edges_version
+        return self._frozen
+
+
+def reconstruct_path(parent: Dict, end) -> List:
+    """Rebuild a path from a {node: predecessor} map whose start maps to None."""
+    path = []
+    current = end
+    while current is not None:
+        path.append(current)
+        current = parent[current]
+    return list(reversed(path))
+
+
+def traced_path(parent: Dict, end, stats=None) -> List:
+    """
+    reconstruct_path() for searches handed a SearchStats: the time so far
+    is charged to the "search" phase and the rebuild to "path".
+    """
+    if stats is None:
+        return reconstruct_path(parent, end)
+    stats.lap("search")
+    path = reconstruct_path(parent, end)
+    stats.lap("path")
+    return path
+
+
+def path_from_parents(parent: np.ndarray, end: int) -> List[int]:
+    """Rebuild a path of node ids from a parent array using NO_PARENT as root marker."""
+    path = []
+    current = int(end)
+    while current != NO_PARENT:
+        path.append(current)
+        current = int(parent[current])
+    return list(reversed(path))
+
+
+def _to_arrays(num_nodes: int, dist: Dict[int, float],
+               parent: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Scatter sparse {node: value} search state into dense dist/parent arrays."""
+    dist_array = np.full(num_nodes, np.inf)
+    parent_array = np.full(num_nodes, NO_PARENT, dtype=np.int32)
+    nodes = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+    dist_array[nodes] = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+    parent_array[nodes] = np.fromiter((parent[node] for node in dist), dtype=np.int32,
+                                      count=len(dist))
+    return dist_array, parent_array
+
+
+def _heuristic_lookup(heuristic: Heuristic) -> Callable[[int], float]:
+    if heuristic is None:
+        return lambda node: 0.0
+    if isinstance(heuristic, np.ndarray):
+        return heuristic.item
+    return heuristic
+
+
+def dijkstra(graph: CompactGraph, source: int, target: Optional[int] = None,
+             frontier=HeapFrontier, stats=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dijkstra from source over the compact graph, stopping once target is
+    settled (or exploring everything when target is None).
+    Returns: (dist, parent) arrays indexed by node id
+    """
+    return astar(graph, source, target, None, frontier, stats)
+
+
+def astar(graph: CompactGraph, source: int, target: Optional[int],
+          heuristic: Heuristic, frontier=HeapFrontier, stats=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A* from source to target over the compact graph. The heuristic is a
+    callable or an array indexed by node id; None gives plain Dijkstra.
+    frontier is the priority queue class (HeapFrontier or IndexedHeap).
+    stats is an optional SearchStats; the phases are "search" and
+    "arrays" (building the result arrays).
+    Returns: (dist, parent) arrays indexed by node id
+    """
+    h = _heuristic_lookup(heuristic)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    # Per-query state only touches reached nodes; arrays are built at the end
+    dist = {source: 0}
+    parent = {source: NO_PARENT}
+    closed = set()
+    if stats is not None:
+        stats.start()
+
+    pq = frontier(stats)
+    pq.push(source, (h(source), 0))
+    while pq:
+        current, (_, g) = pq.pop()
+        closed.add(current)
+        if current == target:
+            break
+
+        lo, hi = offsets[current:current + 2].tolist()
+        for neighbor, cost in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            new_g = g + cost
+            if neighbor not in closed and new_g < dist.get(neighbor, INF):
+                dist[neighbor] = new_g
+                parent[neighbor] = current
+                pq.push(neighbor, (new_g + h(neighbor), new_g))
+        if stats is not None:
+            stats.expanded(len(pq))
+
+    if stats is None:
+        return _to_arrays(graph.num_nodes, dist, parent)
+    stats.lap("search")
+    arrays = _to_arrays(graph.num_nodes, dist, parent)
+    stats.lap("arrays")
+    return arrays
+
+
+def shortest_path_tree(graph: CompactGraph, source: int,
+                       targets: Optional[Sequence[int]] = None,
+                       max_cost: Optional[float] = None, frontier=HeapFrontier,
+                       stats=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-to-many Dijkstra from source. It stops as soon as every node in
+    targets is settled, or once the next node costs more than max_cost;
+    with neither it settles every reachable node. Only settled nodes get
+    a distance, so every finite entry is exact.
+    stats is an optional SearchStats; the phases are "search" and "arrays".
+    Returns: (dist, parent) arrays indexed by node id, inf / NO_PARENT
+    where not settled
+    """
+    offsets, targets_array, weights = graph.offsets, graph.targets, graph.weights
+    remaining = None if targets is None else set(targets)
+    dist = {source: 0}
+    parent = {source: NO_PARENT}
+    settled: Dict[int, float] = {}
+    if stats is not None:
+        stats.start()
+
+    pq = frontier(stats)
+    pq.push(source, 0)
+    while pq:
+        current, g = pq.pop()
+        if max_cost is not None and g > max_cost:
+            break
+        settled[current] = g
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+
+        lo, hi = offsets[current:current + 2].tolist()
+        for neighbor, cost in zip(targets_array[lo:hi].tolist(), weights[lo:hi].tolist()):
+            new_g = g + cost
+            if neighbor not in settled and new_g < dist.get(neighbor, INF):
+                dist[neighbor] = new_g
+                parent[neighbor] = current
+                pq.push(neighbor, new_g)
+        if stats is not None:
+            stats.expanded(len(pq))
+
+    if stats is not None:
+        stats.lap("search")
+    arrays = _to_arrays(graph.num_nodes, settled, parent)
+    if stats is not None:
+        stats.lap("arrays")
+    return arrays
+
+
+def bfs(graph: CompactGraph, source: int, target: Optional[int] = None,
+        stats=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Breadth-first search over the compact graph. stats is an optional
+    SearchStats to fill in.
+    Returns: (hops, parent) arrays indexed by node id, hops is -1 when unreached
+    """
+    offsets, targets = graph.offsets, graph.targets
+    hops = np.full(graph.num_nodes, -1, dtype=np.int32)
+    parent = np.full(graph.num_nodes, NO_PARENT, dtype=np.int32)
+    hops[source] = 0
+    queue = [source]
+    head = 0
+    if stats is not None:
+        stats.start()
+    while head < len(queue):
+        current = queue[head]
+        head += 1
+        if current == target:
+            break
+        for neighbor in targets[offsets[current]:offsets[current + 1]].tolist():
+            if hops[neighbor] < 0:
+                hops[neighbor] = hops[current] + 1
+                parent[neighbor] = current
+                queue.append(neighbor)
+        if stats is not None:
+            stats.expanded(len(queue) - head)
+    if stats is not None:
+        stats.lap("search")
+    return hops, parent
+
+
+def shortest_path(graph: CompactGraph, start: Hashable, goal: Hashable,
+                  heuristic: Heuristic = None, frontier=HeapFrontier) -> Tuple[List, float]:
+    """
+    Shortest path between two node names over the compact graph.
+    Returns: (path, total_cost), ([], 0) when there is no path
+    """
+    if start not in graph.index or goal not in graph.index:
+        return [], 0
+    source, target = graph.index[start], graph.index[goal]
+    dist, parent = astar(graph, source, target, heuristic, frontier)
+    if dist[target] == np.inf:
+        return [], 0
+    path = [graph.names[node] for node in path_from_parents(parent, target)]
+    return path, graph.as_cost(dist[target].item())
+
+
+def bidirectional_search(graph: CompactGraph, source: int, target: int,
+                         potential: Heuristic = None, reverse: Optional[CompactGraph] = None,
+                         frontier=HeapFrontier) -> Tuple[List[int], float]:
+    """
+    Bidirectional Dijkstra between two node ids, or bidirectional A* when a
+    forward potential p is given (the reverse search uses -p). For A* pass the
+    average potential p(v) = (h(v, target) - h(v, source)) / 2 of a consistent
+    heuristic h, which keeps both searches consistent.
+    reverse is the graph with every edge flipped; it defaults to graph itself,
+    which is right for the undirected road networks built with add_road.
+
+    The search stops once the two smallest frontier keys add up to at least
+    the best meeting cost mu, at which point no shorter path can exist.
+    Returns: (path of node ids, total_cost), ([], inf) when there is no path
+    """
+    if source == target:
+        return [source], 0
+    p = _heuristic_lookup(potential)
+    graphs = (graph, reverse if reverse is not None else graph)
+    signs = (1, -1)
+    dist = ({source: 0}, {target: 0})
+    parent = ({source: None}, {target: None})
+    queues = (frontier(), frontier())
+    queues[0].push(source, p(source))
+    queues[1].push(target, -p(target))
+
+    best, meeting = INF, None
+    while queues[0] and queues[1]:
+        if queues[0].peek()[1] + queues[1].peek()[1] >= best:
+            break
+        # Grow the smaller frontier
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        side_dist, other_dist = dist[side], dist[1 - side]
+        side_parent, side_queue, sign = parent[side], queues[side], signs[side]
+        current, _ = side_queue.pop()
+        g = side_dist[current]
+        offsets, targets, weights = graphs[side].offsets, graphs[side].targets, graphs[side].weights
+        lo, hi = offsets[current:current + 2].tolist()
+        for neighbor, cost in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            new_g = g + cost
+            if new_g < side_dist.get(neighbor, INF):
+                side_dist[neighbor] = new_g
+                side_parent[neighbor] = current
+                side_queue.push(neighbor, new_g + sign * p(neighbor) if potential is not None else new_g)
+            through = new_g + other_dist.get(neighbor, INF)
+            if through < best:
+                best, meeting = through, neighbor
+
+    if meeting is None:
+        return [], INF
+    forward = reconstruct_path(parent[0], meeting)
+    backward = reconstruct_path(parent[1], meeting)
+    return forward + list(reversed(backward[:-1])), best
@@ -1,7 +1,10 @@
-from typing import Dict, List, Set, Tuple
-import heapq
+from typing import Dict, List, Optional, Set, Tuple
 
-class CityNetwork:
+from graphCore import GraphBuilder, reconstruct_path
+from routeCache import RouteCache
+from searchFrontier import HeapFrontier
+
+class CityNetwork(GraphBuilder):
     def __init__(self):
         # Initialize the graph as an adjacency list
         self.graph: Dict[str, Dict[str, int]] = {}
@@ -17,38 +20,45 @@ class CityNetwork:
         
         self.graph[city1][city2] = cost
         self.graph[city2][city1] = cost
+        self.touch()
 
     def add_heuristic(self, city: str, value: int):
         """Add heuristic value for a city."""
         self.heuristics[city] = value
+        self.touch(edges=False)
 
-    def a_star_search(self, start: str, goal: str) -> Tuple[List[str], int]:
+    def a_star_search(self, start: str, goal: str, frontier=HeapFrontier,
+                      cache: Optional[RouteCache] = None) -> Tuple[List[str], int]:
         """
         Implement A* search algorithm to find the optimal path.
+        frontier is the priority queue class (HeapFrontier or IndexedHeap).
+        cache is an optional RouteCache to answer repeated queries from.
         Returns: (path, total_cost)
         """
-        # Priority queue of (f_score, current_cost, path)
-        pq = [(self.heuristics[start], 0, [start])]
+        if cache is not None:
+            return cache.query(self, start, goal,
+                               lambda: self.a_star_search(start, goal, frontier))
+        # Frontier keyed by city with priority (f_score, current_cost)
+        pq = frontier()
+        pq.push(start, (self.heuristics[start], 0))
+        # Predecessor on the best known path to each city
+        parent = {start: None}
         visited = set()
 
         while pq:
-            _, current_cost, path = heapq.heappop(pq)
-            current = path[-1]
+            current, (_, current_cost) = pq.pop()
 
             if current == goal:
-                return path, current_cost
-
-            if current in visited:
-                continue
+                return reconstruct_path(parent, goal), current_cost
 
             visited.add(current)
 
             for neighbor, cost in self.graph[current].items():
                 if neighbor not in visited:
                     new_cost = current_cost + cost
-                    new_path = path + [neighbor]
                     f_score = new_cost + self.heuristics[neighbor]
-                    heapq.heappush(pq, (f_score, new_cost, new_path))
+                    if pq.push(neighbor, (f_score, new_cost)):
+                        parent[neighbor] = current
 
         return [], 0  # No path found
 
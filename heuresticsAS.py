@@ -1,18 +1,38 @@
-from typing import Dict, List, Set, Tuple
-import heapq
-from math import sqrt
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import csv
+import os
 
-class CityNetwork:
-    def __init__(self):
+import numpy as np
+
+from graphCore import GraphBuilder, bidirectional_search, reconstruct_path
+from incrementalPlanner import LifelongPlanner
+from routeCache import RouteCache
+from searchFrontier import HeapFrontier
+
+POSITIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cityPositions.csv")
+
+def load_positions(path: str) -> Tuple[Dict[str, int], np.ndarray]:
+    """
+    Read a city,x,y CSV file.
+    Returns: ({city: row}, (cities, 2) float array of coordinates)
+    """
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    index = {row["city"]: i for i, row in enumerate(rows)}
+    coordinates = np.array([(float(row["x"]), float(row["y"])) for row in rows]).reshape(-1, 2)
+    return index, coordinates
+
+class CityNetwork(GraphBuilder):
+    def __init__(self, positions_file: str = POSITIONS_FILE, heuristic_capacity: int = 64):
         # Initialize the graph as an adjacency list and city positions
         self.graph: Dict[str, Dict[str, int]] = {}
-        # Store (x, y) coordinates for each city for heuristic calculation
-        self.positions: Dict[str, Tuple[float, float]] = {
-            'A': (0, 0), 'B': (1, 1), 'C': (0, 2),
-            'D': (2, 2), 'E': (2, 0), 'F': (1, 3),
-            'G': (0, 4), 'H': (3, 1), 'I': (2, 4),
-            'J': (1, 5)
-        }
+        # (x, y) coordinates for heuristic calculation, one row per city
+        self.position_index, self.coordinates = load_positions(positions_file)
+        # goal -> heuristic value of every city, in position_index order, for
+        # the heuristic_capacity most recently used goals
+        self.heuristic_capacity = heuristic_capacity
+        self._heuristic_cache: "OrderedDict[str, List[float]]" = OrderedDict()
         
     def add_road(self, city1: str, city2: str, cost: int):
         """Add a bidirectional road between two cities."""
@@ -23,40 +43,64 @@ class CityNetwork:
         
         self.graph[city1][city2] = cost
         self.graph[city2][city1] = cost
+        self.touch()
     
+    def heuristic_to(self, goal: str) -> List[float]:
+        """
+        Heuristic value (estimated cost) from every city to goal, indexed by
+        position_index. Computed in one vectorized pass the first time a goal
+        is asked for and cached for later queries to the same goal; the
+        least recently used goal is dropped past heuristic_capacity goals.
+        """
+        values = self._heuristic_cache.get(goal)
+        if values is not None:
+            self._heuristic_cache.move_to_end(goal)
+        else:
+            offsets = self.coordinates - self.coordinates[self.position_index[goal]]
+            # Euclidean distance divided by 2 to ensure it's admissible
+            # (never overestimates the true cost)
+            values = (np.sqrt((offsets ** 2).sum(axis=1)) / 2).tolist()
+            self._heuristic_cache[goal] = values
+            if len(self._heuristic_cache) > self.heuristic_capacity:
+                self._heuristic_cache.popitem(last=False)
+        return values
+
     def heuristic(self, city: str, goal: str) -> float:
         """
         Calculate the heuristic value (estimated cost) from city to goal.
         Uses Euclidean distance scaled by a factor to make it admissible.
         """
-        x1, y1 = self.positions[city]
-        x2, y2 = self.positions[goal]
-        # Euclidean distance divided by 2 to ensure it's admissible
-        # (never overestimates the true cost)
-        return sqrt((x2 - x1)**2 + (y2 - y1)**2) / 2
+        return self.heuristic_to(goal)[self.position_index[city]]
         
-    def a_star_search(self, start: str, goal: str) -> Tuple[List[str], int]:
+    def a_star_search(self, start: str, goal: str, frontier=HeapFrontier,
+                      cache: Optional[RouteCache] = None) -> Tuple[List[str], int]:
         """
         Implement A* Search to find the optimal path.
+        frontier is the priority queue class (HeapFrontier or IndexedHeap).
+        cache is an optional RouteCache to answer repeated queries from.
         Returns: (path, total_cost)
         """
-        # Priority queue entries are (f_score, g_score, current_city, path)
+        if cache is not None:
+            return cache.query(self, start, goal,
+                               lambda: self.a_star_search(start, goal, frontier))
+        # Frontier keyed by city with priority (f_score, g_score)
         # f_score = g_score + heuristic
         # g_score = cost from start to current_city
-        pq = [(self.heuristic(start, goal), 0, start, [start])]
+        estimate = self.heuristic_to(goal)
+        index = self.position_index
+        pq = frontier()
+        pq.push(start, (estimate[index[start]], 0))
         # Keep track of visited cities and their lowest g_scores
         g_scores = {start: 0}
+        # Predecessor on the best known path to each city
+        parent = {start: None}
         
         while pq:
-            f_score, g_score, current_city, path = heapq.heappop(pq)
+            current_city, (f_score, g_score) = pq.pop()
             
             # If we reached the goal, return the path and cost
             if current_city == goal:
-                return path, g_score
-            
-            # If we've already found a better path to this city, skip
-            if current_city in g_scores and g_scores[current_city] < g_score:
-                continue
+                return reconstruct_path(parent, goal), g_score
                 
             # Explore neighbors
             for neighbor, cost in self.graph[current_city].items():
@@ -64,12 +108,46 @@ class CityNetwork:
                 
                 if neighbor not in g_scores or new_g_score < g_scores[neighbor]:
                     g_scores[neighbor] = new_g_score
-                    new_path = path + [neighbor]
-                    f_score = new_g_score + self.heuristic(neighbor, goal)
-                    heapq.heappush(pq, (f_score, new_g_score, neighbor, new_path))
+                    parent[neighbor] = current_city
+                    f_score = new_g_score + estimate[index[neighbor]]
+                    pq.push(neighbor, (f_score, new_g_score))
         
         return [], 0  # No path found
 
+    def incremental_planner(self, start: str, goal: str) -> LifelongPlanner:
+        """
+        LPA* planner for start -> goal guided by this network's heuristic.
+        Feed road cost changes through its update_road() and call plan()
+        to get the repaired (path, total_cost).
+        """
+        return LifelongPlanner(self, start, goal, lambda city: self.heuristic(city, goal))
+
+    def bidirectional_search(self, start: str, goal: str,
+                             frontier=HeapFrontier) -> Tuple[List[str], int]:
+        """
+        Bidirectional A*: one search from the start towards the goal and one
+        from the goal towards the start, both guided by the average potential
+        (heuristic(city, goal) - heuristic(city, start)) / 2 so their stopping
+        test stays exact.
+        Returns: (path, total_cost)
+        """
+        graph = self.freeze()
+        if start not in graph.index or goal not in graph.index:
+            return [], 0
+        names = graph.names
+        to_goal, to_start = self.heuristic_to(goal), self.heuristic_to(start)
+        rows = [self.position_index[name] for name in names]
+
+        def potential(city: int) -> float:
+            row = rows[city]
+            return (to_goal[row] - to_start[row]) / 2
+
+        path, total_cost = bidirectional_search(graph, graph.index[start], graph.index[goal],
+                                                potential, frontier=frontier)
+        if not path:
+            return [], 0  # No path found
+        return [names[city] for city in path], graph.as_cost(total_cost)
+
 def create_network() -> CityNetwork:
     """Create the network from the example."""
     network = CityNetwork()
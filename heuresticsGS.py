@@ -1,10 +1,17 @@
-from typing import Dict, List, Set, Tuple
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple
 import heapq
 
-class CityNetwork:
+from graphCore import CompactGraph, GraphBuilder
+
+class CityNetwork(GraphBuilder):
     def __init__(self):
         # Initialize the graph as an adjacency list
         self.graph: Dict[str, Dict[str, int]] = {}
+        # Every city's roads as (neighbor, cost), cheapest first, and the
+        # graph version they were sorted for
+        self.sorted_roads: Dict[str, List[Tuple[str, int]]] = {}
+        self._sorted_version = -1
         
     def add_road(self, city1: str, city2: str, cost: int):
         """Add a bidirectional road between two cities."""
@@ -15,15 +22,39 @@ class CityNetwork:
         
         self.graph[city1][city2] = cost
         self.graph[city2][city1] = cost
+        self.touch()
         
-    def greedy_search(self, start: str, goal: str) -> Tuple[List[str], int]:
+    def freeze(self) -> CompactGraph:
+        """
+        Return the compact form of the graph, and sort every city's roads by
+        cost for greedy_search. Both are redone only after a road changed.
+        """
+        graph = super().freeze()
+        if self._sorted_version != self.edges_version:
+            # Stable sort: equal costs keep the order the roads were added in
+            self.sorted_roads = {city: sorted(roads.items(), key=itemgetter(1))
+                                 for city, roads in self.graph.items()}
+            self._sorted_version = self.edges_version
+        return graph
+
+    def greedy_search(self, start: str, goal: str, stats=None,
+                      beam_width: Optional[int] = None) -> Tuple[List[str], int]:
         """
         Implement Greedy Search to find a path based on lowest immediate cost.
+        With beam_width B, keep the B cheapest partial paths at every step
+        instead of a single one, so a dead end only drops that path.
+        stats is an optional SearchStats; every city moved away from counts
+        as an expansion.
         Returns: (path, total_cost)
         """
         # If start or goal not in graph, return empty path
         if start not in self.graph or goal not in self.graph:
             return [], 0
+        self.freeze()
+        if beam_width is not None:
+            return self._beam_search(start, goal, beam_width, stats)
+        if stats is not None:
+            stats.start()
             
         current_city = start
         path = [start]
@@ -31,18 +62,23 @@ class CityNetwork:
         visited = {start}
         
         while current_city != goal:
-            # Find unvisited neighbor with lowest direct cost
-            neighbors = self.graph[current_city].items()
+            # Roads are sorted by cost: the first unvisited neighbor is the cheapest
             best_cost = float('inf')
             best_neighbor = None
             
-            for neighbor, cost in neighbors:
-                if neighbor not in visited and cost < best_cost:
+            for neighbor, cost in self.sorted_roads[current_city]:
+                if neighbor not in visited:
                     best_cost = cost
                     best_neighbor = neighbor
+                    break
+            
+            if stats is not None:
+                stats.expanded(0)
             
             # If no unvisited neighbors, we're stuck
             if best_neighbor is None:
+                if stats is not None:
+                    stats.lap("search")
                 return [], 0
                 
             # Move to the best neighbor
@@ -53,10 +89,66 @@ class CityNetwork:
             
             # If we reached the goal, return the path and cost
             if current_city == goal:
+                if stats is not None:
+                    stats.lap("search")
                 return path, total_cost
                 
+        if stats is not None:
+            stats.lap("search")
         return path, total_cost
 
+    def _beam_search(self, start: str, goal: str, beam_width: int,
+                     stats=None) -> Tuple[List[str], int]:
+        """
+        Beam variant of greedy_search: extend every path in the beam and keep
+        the beam_width cheapest extensions. A city joins at most one beam, so
+        paths never loop and the search ends once the beam runs dry.
+        Returns: (path, total_cost)
+        """
+        if beam_width < 1:
+            raise ValueError("beam_width must be at least 1")
+        if start == goal:
+            return [start], 0
+        if stats is not None:
+            stats.start()
+        beam = [(0, [start])]
+        reached = {start}
+
+        while beam:
+            candidates = []
+            for total_cost, path in beam:
+                # Only the beam_width cheapest roads out of a path can make the beam
+                taken = 0
+                for neighbor, cost in self.sorted_roads[path[-1]]:
+                    if neighbor in reached:
+                        continue
+                    candidates.append((total_cost + cost, path, neighbor))
+                    taken += 1
+                    if taken == beam_width:
+                        break
+                if stats is not None:
+                    stats.expanded(len(beam) + len(candidates))
+
+            # Cheapest extension into each city, then the beam_width cheapest overall
+            best: Dict[str, Tuple[int, List[str], str]] = {}
+            for candidate in candidates:
+                city = candidate[2]
+                if city not in best or candidate[0] < best[city][0]:
+                    best[city] = candidate
+            chosen = heapq.nsmallest(beam_width, best.values(), key=itemgetter(0))
+            beam = []
+            for total_cost, path, city in chosen:
+                if city == goal:
+                    if stats is not None:
+                        stats.lap("search")
+                    return path + [city], total_cost
+                reached.add(city)
+                beam.append((total_cost, path + [city]))
+
+        if stats is not None:
+            stats.lap("search")
+        return [], 0
+
 def create_network() -> CityNetwork:
     """Create the network from the example."""
     network = CityNetwork()
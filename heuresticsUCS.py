@@ -1,10 +1,21 @@
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 import heapq
 
-class CityNetwork:
+import numpy as np
+
+from contractionHierarchy import ContractionHierarchy, graph_fingerprint
+from distanceMatrix import distance_matrix
+from graphCore import (INF, NO_PARENT, GraphBuilder, bidirectional_search, dijkstra,
+                       shortest_path_tree, traced_path)
+from searchFrontier import HeapFrontier
+
+class CityNetwork(GraphBuilder):
     def __init__(self):
         # Initialize the graph as an adjacency list
         self.graph: Dict[str, Dict[str, int]] = {}
+        # Optional contraction hierarchy and the graph version it was built for
+        self.hierarchy: Optional[ContractionHierarchy] = None
+        self.hierarchy_version = -1
 
     def add_road(self, city1: str, city2: str, cost: int):
         """Add a bidirectional road between two cities."""
@@ -15,27 +26,32 @@ class CityNetwork:
         
         self.graph[city1][city2] = cost
         self.graph[city2][city1] = cost
+        self.touch()
 
-    def uniform_cost_search(self, start: str, goal: str) -> Tuple[List[str], int]:
+    def uniform_cost_search(self, start: str, goal: str, frontier=HeapFrontier,
+                            stats=None) -> Tuple[List[str], int]:
         """
         Implement Uniform Cost Search to find the lowest-cost path.
+        frontier is the priority queue class (HeapFrontier or IndexedHeap).
+        stats is an optional SearchStats to fill in.
         Returns: (path, total_cost)
         """
-        # Priority queue entries are (cumulative_cost, current_city, path)
-        pq = [(0, start, [start])]
+        if stats is not None:
+            stats.start()
+        # Frontier keyed by city with the cumulative cost as priority
+        pq = frontier(stats)
+        pq.push(start, 0)
         # Keep track of visited cities and their lowest costs
         visited = {}
+        # Predecessor of each city on the cheapest path found so far
+        parent = {start: None}
 
         while pq:
-            current_cost, current_city, path = heapq.heappop(pq)
+            current_city, current_cost = pq.pop()
             
             # If we reached the goal, return the path and cost
             if current_city == goal:
-                return path, current_cost
-            
-            # If we've already found a better path to this city, skip
-            if current_city in visited and visited[current_city] < current_cost:
-                continue
+                return traced_path(parent, goal, stats), current_cost
                 
             # Mark this city as visited with its cost
             visited[current_city] = current_cost
@@ -44,11 +60,197 @@ class CityNetwork:
             for neighbor, cost in self.graph[current_city].items():
                 if neighbor not in visited or visited[neighbor] > current_cost + cost:
                     new_cost = current_cost + cost
-                    new_path = path + [neighbor]
-                    heapq.heappush(pq, (new_cost, neighbor, new_path))
+                    if pq.push(neighbor, new_cost):
+                        parent[neighbor] = current_city
+            if stats is not None:
+                stats.expanded(len(pq))
 
+        if stats is not None:
+            stats.lap("search")
         return [], 0  # No path found
 
+    def bidirectional_search(self, start: str, goal: str,
+                             frontier=HeapFrontier) -> Tuple[List[str], int]:
+        """
+        Bidirectional Dijkstra: grow one search from the start and one from the
+        goal (roads are two-way, so the reverse graph is the graph itself) and
+        stop once no cheaper meeting point can be left.
+        Returns: (path, total_cost)
+        """
+        graph = self.freeze()
+        if start not in graph.index or goal not in graph.index:
+            return [], 0
+        path, total_cost = bidirectional_search(graph, graph.index[start], graph.index[goal],
+                                                frontier=frontier)
+        if not path:
+            return [], 0  # No path found
+        return [graph.names[city] for city in path], graph.as_cost(total_cost)
+
+    def shortest_path_tree(self, source: str, targets: Optional[List[str]] = None,
+                           max_cost: Optional[float] = None,
+                           frontier=HeapFrontier) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One Dijkstra from source for many destinations: it stops once every
+        city in targets is settled, or at the max_cost radius (isochrones).
+        Array positions are the node ids of self.freeze(): city names are
+        freeze().names and freeze().index maps a city to its id.
+        Returns: (dist, parent) arrays, inf / NO_PARENT for cities not settled
+        """
+        graph = self.freeze()
+        if source not in graph.index:
+            raise KeyError(f"unknown city {source!r}")
+        target_ids = None
+        if targets is not None:
+            # Unknown cities can never be settled; they would only stop the early exit
+            target_ids = [graph.index[city] for city in targets if city in graph.index]
+        return shortest_path_tree(graph, graph.index[source], target_ids, max_cost, frontier)
+
+    def k_shortest_paths(self, start: str, goal: str, k: int,
+                         frontier=HeapFrontier) -> List[Tuple[List[str], int]]:
+        """
+        Yen's algorithm: the k cheapest loopless routes from start to goal.
+        One Dijkstra from the goal gives the shortest-path tree every city
+        shares towards it. That tree is the first route, the exact distance
+        to the goal is the A* heuristic of every spur search, and a spur
+        whose tree route avoids the removed roads is answered without any
+        search. Spur results are cached by (spur city, blocked cities,
+        removed roads), so prefixes shared with earlier routes are not
+        searched again.
+        Returns: up to k (path, total_cost) tuples, cheapest first
+        """
+        if k <= 0 or start not in self.graph or goal not in self.graph:
+            return []
+        graph = self.freeze()
+        dist, parent = dijkstra(graph, graph.index[goal], frontier=frontier)
+        names = graph.names
+        to_goal = {names[city]: cost for city, cost in enumerate(dist.tolist())}
+        next_hop = {names[city]: names[hop] if hop != NO_PARENT else None
+                    for city, hop in enumerate(parent.tolist())}
+        if to_goal[start] == INF:
+            return []
+
+        def tree_route(city: str) -> List[str]:
+            route = [city]
+            while city != goal:
+                city = next_hop[city]
+                route.append(city)
+            return route
+
+        spur_cache: Dict[Tuple, Tuple[List[str], int]] = {}
+        route = tree_route(start)
+        routes = [(route, self._route_cost(route))]
+        candidates: List[Tuple[int, Tuple[str, ...]]] = []
+        seen = {tuple(route)}
+        while len(routes) < k:
+            last = routes[-1][0]
+            for i in range(len(last) - 1):
+                spur, root = last[i], last[:i + 1]
+                removed = frozenset(path[i + 1] for path, _ in routes
+                                    if len(path) > i + 1 and path[:i + 1] == root)
+                blocked = frozenset(root[:-1])
+                key = (spur, blocked, removed)
+                if key not in spur_cache:
+                    spur_cache[key] = self._spur_search(spur, goal, blocked, removed,
+                                                        to_goal, tree_route, frontier)
+                spur_route, spur_cost = spur_cache[key]
+                if not spur_route:
+                    continue
+                candidate = tuple(root[:-1] + spur_route)
+                if candidate not in seen:
+                    seen.add(candidate)
+                    heapq.heappush(candidates,
+                                   (self._route_cost(root) + spur_cost, candidate))
+            if not candidates:
+                break
+            total_cost, route = heapq.heappop(candidates)
+            routes.append((list(route), total_cost))
+        return routes
+
+    def _route_cost(self, route: List[str]) -> int:
+        return sum(self.graph[city][next_city] for city, next_city in zip(route, route[1:]))
+
+    def _spur_search(self, spur: str, goal: str, blocked: FrozenSet[str],
+                     removed: FrozenSet[str], to_goal: Dict[str, float], tree_route,
+                     frontier) -> Tuple[List[str], int]:
+        """
+        Cheapest spur -> goal route that avoids the blocked cities and the
+        removed roads out of spur, by A* guided by the exact unrestricted
+        distance to the goal.
+        Returns: (path, total_cost), ([], 0) when there is none
+        """
+        if to_goal[spur] == INF:
+            return [], 0
+        route = tree_route(spur)
+        if route[1] not in removed and blocked.isdisjoint(route):
+            # The unrestricted shortest route is still allowed
+            return route, self._route_cost(route)
+
+        pq = frontier()
+        pq.push(spur, (to_goal[spur], 0))
+        closed = set()
+        parent = {spur: None}
+        while pq:
+            city, (_, g) = pq.pop()
+            if city == goal:
+                return traced_path(parent, goal), g
+            closed.add(city)
+            for neighbor, cost in self.graph[city].items():
+                if neighbor in closed or neighbor in blocked or to_goal[neighbor] == INF:
+                    continue
+                if city == spur and neighbor in removed:
+                    continue
+                if pq.push(neighbor, (g + cost + to_goal[neighbor], g + cost)):
+                    parent[neighbor] = city
+        return [], 0
+
+    def distance_matrix(self, origins: List[str], destinations: List[str],
+                        workers: int = 1) -> np.ndarray:
+        """
+        Lowest travel cost from every origin to every destination, one
+        Dijkstra per origin spread over `workers` processes.
+        Returns: (len(origins), len(destinations)) array, inf where unreachable
+        """
+        return distance_matrix(self.freeze(), origins, destinations, workers)
+
+    def preprocess(self) -> ContractionHierarchy:
+        """Build a contraction hierarchy for fast repeated queries on this graph."""
+        self.hierarchy = ContractionHierarchy.build(self.freeze())
+        self.hierarchy_version = self.edges_version
+        return self.hierarchy
+
+    def save_hierarchy(self, path: str):
+        """Save the preprocessed hierarchy to a .npz file."""
+        if self.hierarchy is None:
+            raise ValueError("call preprocess() before save_hierarchy()")
+        self.hierarchy.save(path)
+
+    def load_hierarchy(self, path: str) -> bool:
+        """
+        Load a hierarchy saved with save_hierarchy(). It is only used if it was
+        built from exactly this graph, every city name mapping back to the
+        same node; returns whether it was accepted.
+        """
+        hierarchy = ContractionHierarchy.load(path)
+        graph = self.freeze()
+        if hierarchy.fingerprint != graph_fingerprint(graph):
+            return False
+        if any(graph.index.get(name) != node for node, name in enumerate(hierarchy.names)):
+            return False
+        self.hierarchy = hierarchy
+        self.hierarchy_version = self.edges_version
+        return True
+
+    def hierarchy_search(self, start: str, goal: str) -> Tuple[List[str], int]:
+        """
+        Answer a query from the contraction hierarchy. Falls back to
+        uniform_cost_search when there is no hierarchy or a road changed
+        after preprocessing.
+        Returns: (path, total_cost)
+        """
+        if self.hierarchy is None or self.hierarchy_version != self.edges_version:
+            return self.uniform_cost_search(start, goal)
+        return self.hierarchy.shortest_path(start, goal)
+
 def create_network() -> CityNetwork:
     """Create the network from the example."""
     network = CityNetwork()
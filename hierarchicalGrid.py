@@ -0,0 +1,231 @@
+from itertools import chain
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from graphCore import INF, reconstruct_path
+from searchFrontier import HeapFrontier
+from treasureHunt import TreasureHunt
+
+Cell = Tuple[int, int]
+Cluster = Tuple[int, int]
+# Open border runs at least this long get a transition at each end instead of one in the middle
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalGrid:
+    """
+    HPA* on top of a TreasureHunt map. The map is cut into square clusters;
+    every open stretch of the border between two clusters gets one or two
+    transitions (a pair of facing cells), and the cells of all transitions
+    of a cluster are linked by their in-cluster BFS distances. A query adds
+    start and goal to that small abstract graph, runs A* on it and then
+    refines each abstract edge with a BFS inside one cluster.
+
+    Paths are near-optimal: they may only be longer than the true shortest
+    path because routes have to cross cluster borders at transitions.
+    set_cell() rebuilds just the cluster holding the cell, plus a neighbor
+    whose shared border changed.
+    """
+
+    def __init__(self, hunt: TreasureHunt, cluster_size: int = 32):
+        self.hunt = hunt
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-hunt.rows // cluster_size)
+        self.cluster_cols = -(-hunt.cols // cluster_size)
+        # (cluster, right or lower neighbor) -> [(cell in cluster, cell in neighbor)]
+        self.transitions: Dict[Tuple[Cluster, Cluster], List[Tuple[Cell, Cell]]] = {}
+        # Abstract graph: transition cell -> {transition cell: steps}
+        self.graph: Dict[Cell, Dict[Cell, int]] = {}
+
+        clusters = [(cx, cy) for cx in range(self.cluster_rows) for cy in range(self.cluster_cols)]
+        for cluster in clusters:
+            for border in self._borders(cluster):
+                self.transitions[border] = self._find_transitions(*border)
+        self._rebuild(clusters)
+
+    def cluster_of(self, cell: Cell) -> Cluster:
+        return cell[0] // self.cluster_size, cell[1] // self.cluster_size
+
+    def _bounds(self, cluster: Cluster) -> Tuple[int, int, int, int]:
+        """Cell rows [x0, x1) and columns [y0, y1) of a cluster."""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return x0, min(x0 + size, self.hunt.rows), y0, min(y0 + size, self.hunt.cols)
+
+    def _borders(self, cluster: Cluster) -> List[Tuple[Cluster, Cluster]]:
+        """Keys into self.transitions of the (up to four) borders of a cluster."""
+        cx, cy = cluster
+        borders = []
+        if cx > 0:
+            borders.append(((cx - 1, cy), cluster))
+        if cy > 0:
+            borders.append(((cx, cy - 1), cluster))
+        if cx + 1 < self.cluster_rows:
+            borders.append((cluster, (cx + 1, cy)))
+        if cy + 1 < self.cluster_cols:
+            borders.append((cluster, (cx, cy + 1)))
+        return borders
+
+    def _find_transitions(self, cluster: Cluster, neighbor: Cluster) -> List[Tuple[Cell, Cell]]:
+        """Transitions across the border between cluster and its lower or right neighbor."""
+        x0, x1, y0, y1 = self._bounds(cluster)
+        blocked = self.hunt.blocked
+        if neighbor[0] > cluster[0]:
+            # Horizontal border: last row of cluster against first row of neighbor
+            inside = [(x1 - 1, y) for y in range(y0, y1)]
+            outside = [(x1, y) for y in range(y0, y1)]
+            open_cells = ~blocked[x1 - 1, y0:y1] & ~blocked[x1, y0:y1]
+        else:
+            inside = [(x, y1 - 1) for x in range(x0, x1)]
+            outside = [(x, y1) for x in range(x0, x1)]
+            open_cells = ~blocked[x0:x1, y1 - 1] & ~blocked[x0:x1, y1]
+
+        # Maximal runs of open cells along the border, as [first, last) pairs
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], open_cells.astype(np.int8), [0]))))
+        transitions = []
+        for first, last in zip(edges[::2].tolist(), edges[1::2].tolist()):
+            if last - first < WIDE_ENTRANCE:
+                picks = [(first + last - 1) // 2]
+            else:
+                picks = [first, last - 1]
+            transitions.extend((inside[i], outside[i]) for i in picks)
+        return transitions
+
+    def _entrances(self, cluster: Cluster) -> List[Cell]:
+        """Transition cells lying in a cluster, without repeats, in a fixed order."""
+        cells = []
+        for border in self._borders(cluster):
+            side = 0 if border[0] == cluster else 1
+            cells.extend(pair[side] for pair in self.transitions[border])
+        return list(dict.fromkeys(cells))
+
+    def _rebuild(self, clusters: List[Cluster]):
+        """Recreate the abstract nodes and edges of the given clusters."""
+        rebuilt = set(clusters)
+        for cell in [cell for cell in self.graph if self.cluster_of(cell) in rebuilt]:
+            for neighbor in self.graph.pop(cell):
+                if neighbor in self.graph:
+                    self.graph[neighbor].pop(cell, None)
+
+        entrances = {cluster: self._entrances(cluster) for cluster in clusters}
+        for cluster in clusters:
+            for cell in entrances[cluster]:
+                self.graph.setdefault(cell, {})
+            # Crossing edges towards every neighbor, rebuilt or not
+            for border in self._borders(cluster):
+                for cell, other in self.transitions[border]:
+                    self.graph.setdefault(cell, {})[other] = 1
+                    self.graph.setdefault(other, {})[cell] = 1
+
+        # In-cluster edges: flood the k-th entrance of every cluster at once,
+        # over the block of clusters involved, never stepping across a border
+        low_x = min(cx for cx, _ in clusters)
+        low_y = min(cy for _, cy in clusters)
+        high_x = max(cx for cx, _ in clusters)
+        high_y = max(cy for _, cy in clusters)
+        x0, _, y0, _ = self._bounds((low_x, low_y))
+        _, x1, _, y1 = self._bounds((high_x, high_y))
+        block = TreasureHunt(self.hunt.blocked[x0:x1, y0:y1])
+        rows = np.arange(x0, x1)[:, None] // self.cluster_size
+        cols = np.arange(y0, y1)[None, :] // self.cluster_size
+        regions = rows * self.cluster_cols + cols
+
+        for k in range(max(len(cells) for cells in entrances.values())):
+            seeded = [cluster for cluster in clusters if len(entrances[cluster]) > k]
+            sources = [entrances[cluster][k] for cluster in seeded]
+            distance, _ = block.distance_field([(x - x0, y - y0) for x, y in sources], regions)
+            for cluster, source in zip(seeded, sources):
+                for cell in entrances[cluster][k + 1:]:
+                    steps = int(distance[cell[0] - x0, cell[1] - y0])
+                    if steps >= 0:
+                        self.graph[source][cell] = steps
+                        self.graph[cell][source] = steps
+
+    def set_cell(self, x: int, y: int, obstacle: bool):
+        """Place or clear an obstacle and update the abstraction around it."""
+        self.hunt.set_cell(x, y, obstacle)
+        cluster = self.cluster_of((x, y))
+        affected = [cluster]
+        for border in self._borders(cluster):
+            transitions = self._find_transitions(*border)
+            if transitions != self.transitions[border]:
+                self.transitions[border] = transitions
+                affected.append(border[1] if border[0] == cluster else border[0])
+        self._rebuild(affected)
+
+    def _local_distances(self, cell: Cell) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """BFS distances from cell to every cell of its cluster, and the cluster's corner."""
+        x0, x1, y0, y1 = self._bounds(self.cluster_of(cell))
+        distance, _ = TreasureHunt(self.hunt.blocked[x0:x1, y0:y1]).distance_field(
+            [(cell[0] - x0, cell[1] - y0)])
+        return distance, (x0, y0)
+
+    def _local_path(self, a: Cell, b: Cell) -> List[Cell]:
+        """Cells after a up to b along a shortest path inside their shared cluster."""
+        x0, x1, y0, y1 = self._bounds(self.cluster_of(a))
+        local = TreasureHunt(self.hunt.blocked[x0:x1, y0:y1])
+        path = local.find_treasure_astar(a[0] - x0, a[1] - y0, b[0] - x0, b[1] - y0)
+        return [(x + x0, y + y0) for x, y in path[1:]]
+
+    def find_path(self, start_x: int, start_y: int, goal_x: int, goal_y: int,
+                  frontier=HeapFrontier) -> Optional[List[Tuple[int, int]]]:
+        """
+        Search the abstract graph with start and goal linked in, then refine
+        it into a path of adjacent cells like TreasureHunt's searches.
+        frontier is the priority queue class (HeapFrontier or IndexedHeap).
+        """
+        if not self.hunt.is_valid_move(start_x, start_y):
+            return None
+        if not self.hunt.is_valid_move(goal_x, goal_y):
+            return None
+        start, goal = (start_x, start_y), (goal_x, goal_y)
+        if start == goal:
+            return [start]
+
+        # Temporary edges tying start and goal to the entrances of their clusters
+        extra: Dict[Cell, Dict[Cell, int]] = {start: {}}
+        for cell, links in ((start, extra[start]), (goal, None)):
+            distance, (x0, y0) = self._local_distances(cell)
+            targets = self._entrances(self.cluster_of(cell))
+            if cell == start and self.cluster_of(goal) == self.cluster_of(start):
+                targets.append(goal)
+            for target in targets:
+                steps = int(distance[target[0] - x0, target[1] - y0])
+                if steps < 0 or target == cell:
+                    continue
+                if links is not None:
+                    links[target] = steps
+                else:
+                    extra.setdefault(target, {})[goal] = steps
+
+        def estimate(cell: Cell) -> int:
+            return abs(goal_x - cell[0]) + abs(goal_y - cell[1])
+
+        pq = frontier()
+        pq.push(start, (estimate(start), estimate(start)))
+        g_scores = {start: 0}
+        parent = {start: None}
+        while pq:
+            current, _ = pq.pop()
+            if current == goal:
+                break
+            for neighbor, steps in chain(self.graph.get(current, {}).items(),
+                                         extra.get(current, {}).items()):
+                new_g = g_scores[current] + steps
+                if new_g < g_scores.get(neighbor, INF):
+                    g_scores[neighbor] = new_g
+                    parent[neighbor] = current
+                    h = estimate(neighbor)
+                    pq.push(neighbor, (new_g + h, h))
+        if goal not in parent:
+            return None
+
+        abstract = reconstruct_path(parent, goal)
+        path = [start]
+        for a, b in zip(abstract, abstract[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)
+            else:
+                path.extend(self._local_path(a, b))
+        return path
@@ -0,0 +1,85 @@
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from graphCore import INF
+from searchFrontier import IndexedHeap
+
+
+class LifelongPlanner:
+    """
+    Lifelong Planning A* (LPA*) bound to one (start, goal) pair of a road
+    network with the dict-of-dict `graph` adjacency and add_road() of
+    CityNetwork.
+
+    The planner keeps its g / rhs values between calls. When a road cost
+    changes through update_road(), only the cities whose cost-to-come became
+    inconsistent are put back on the queue, so the next plan() repairs the
+    part of the search the change affects instead of starting over.
+    Road changes made directly on the network are not seen by the planner.
+    """
+
+    def __init__(self, network, start: Hashable, goal: Hashable,
+                 heuristic: Optional[Callable[[Hashable], float]] = None):
+        self.network = network
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic or (lambda city: 0)
+        self.g: Dict[Hashable, float] = {}
+        self.rhs: Dict[Hashable, float] = {start: 0}
+        self.queue = IndexedHeap()
+        self.queue.push(start, self._key(start))
+        # Cities expanded by the last plan() call
+        self.expansions = 0
+
+    def _key(self, city: Hashable) -> Tuple[float, float]:
+        best = min(self.g.get(city, INF), self.rhs.get(city, INF))
+        return best + self.heuristic(city), best
+
+    def _update_city(self, city: Hashable):
+        graph = self.network.graph
+        if city != self.start:
+            self.rhs[city] = min((self.g.get(neighbor, INF) + cost
+                                  for neighbor, cost in graph.get(city, {}).items()), default=INF)
+        self.queue.remove(city)
+        if self.g.get(city, INF) != self.rhs.get(city, INF):
+            self.queue.push(city, self._key(city))
+
+    def update_road(self, city1: Hashable, city2: Hashable, cost: float):
+        """Add a road or change its cost, and mark both ends for repair."""
+        self.network.add_road(city1, city2, cost)
+        self._update_city(city1)
+        self._update_city(city2)
+
+    def plan(self) -> Tuple[List[Hashable], float]:
+        """
+        Bring the search up to date with all road changes so far.
+        Returns: (path, total_cost), ([], 0) when the goal is unreachable
+        """
+        self.expansions = 0
+        graph = self.network.graph
+        while self.queue and (self.queue.peek()[1] < self._key(self.goal)
+                              or self.rhs.get(self.goal, INF) != self.g.get(self.goal, INF)):
+            city, _ = self.queue.pop()
+            self.expansions += 1
+            if self.g.get(city, INF) > self.rhs.get(city, INF):
+                # Overconsistent: the new cost-to-come is settled
+                self.g[city] = self.rhs[city]
+            else:
+                # Underconsistent: a route got worse, re-derive it and its neighbors
+                self.g[city] = INF
+                self._update_city(city)
+            for neighbor in graph.get(city, {}):
+                self._update_city(neighbor)
+
+        total_cost = self.g.get(self.goal, INF)
+        if total_cost == INF:
+            return [], 0
+        return self._extract_path(), total_cost
+
+    def _extract_path(self) -> List[Hashable]:
+        """Walk back from the goal along the neighbor that realises each g value."""
+        graph = self.network.graph
+        path = [self.goal]
+        while path[-1] != self.start:
+            roads = graph[path[-1]]
+            path.append(min(roads, key=lambda neighbor: self.g.get(neighbor, INF) + roads[neighbor]))
+        return list(reversed(path))
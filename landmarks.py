@@ -0,0 +1,34 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from graphCore import CompactGraph, dijkstra
+
+
+def select_landmarks(graph: CompactGraph, count: int,
+                     first: int = 0) -> Tuple[List[int], np.ndarray]:
+    """
+    Pick landmarks by farthest-point selection: start from the node farthest
+    from `first`, then repeatedly add the node farthest from all landmarks
+    chosen so far. Unreachable nodes count as farthest, so every connected
+    component gets a landmark when count allows.
+    Returns: (landmarks, their (landmarks, nodes) distance array, inf where
+    unreachable)
+    """
+    count = min(count, graph.num_nodes)
+    if count <= 0:
+        return [], np.zeros((0, graph.num_nodes))
+    dist, _ = dijkstra(graph, first)
+    closest = np.where(np.isinf(dist), np.finfo(np.float64).max, dist)
+    landmarks: List[int] = []
+    rows: List[np.ndarray] = []
+    for _ in range(count):
+        landmark = int(np.argmax(closest))
+        if landmark in landmarks:
+            break
+        landmarks.append(landmark)
+        dist, _ = dijkstra(graph, landmark)
+        rows.append(dist)
+        closest = np.minimum(closest, np.where(np.isinf(dist), np.finfo(np.float64).max, dist))
+        closest[landmarks] = -1
+    return landmarks, np.array(rows).reshape(len(rows), graph.num_nodes)
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+
+class RouteCache:
+    """
+    Memoization layer for route queries on one graph.
+
+    For every start city it keeps a shortest-path tree {city: (parent, cost)}
+    grown from the routes found so far. Any prefix of a shortest path is
+    itself a shortest path, so once start -> goal has been answered every
+    city on that route is answered from the tree as well. Trees are evicted
+    least recently used first once there are more than `capacity` of them,
+    and the whole cache is dropped when the graph version changes (every
+    add_road, add_edge or add_heuristic bumps it).
+
+    Prefix answers assume the wrapped search returns shortest paths, i.e.
+    that its heuristic is admissible.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        # start -> (tree {city: (parent, cost)}, {goal: result} of failed queries)
+        self._entries: "OrderedDict[Hashable, Tuple[Dict, Dict]]" = OrderedDict()
+        self._graph_key: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every cached route (the hit/miss counters are kept)."""
+        self._entries.clear()
+
+    def query(self, graph, start: Hashable, goal: Hashable,
+              search: Callable[[], Tuple]) -> Tuple:
+        """
+        Answer start -> goal from the cache, or run search() and remember its
+        result. graph must have the version counter and the dict-of-dict
+        `graph` adjacency of the search classes.
+        Returns: whatever search() returns, (path, total_cost)
+        """
+        graph_key = (id(graph), graph.version)
+        if graph_key != self._graph_key:
+            self.clear()
+            self._graph_key = graph_key
+
+        entry = self._entries.get(start)
+        if entry is not None:
+            self._entries.move_to_end(start)
+            tree, failed = entry
+            if goal in tree:
+                self.hits += 1
+                return self._route(tree, goal)
+            if goal in failed:
+                self.hits += 1
+                return failed[goal]
+
+        self.misses += 1
+        result = search()
+        self._store(graph, start, goal, result)
+        return result
+
+    def _store(self, graph, start: Hashable, goal: Hashable, result: Tuple):
+        if start not in self._entries:
+            self._entries[start] = ({}, {})
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        tree, failed = self._entries[start]
+        path = result[0]
+        if not path:
+            failed[goal] = result
+            return
+        cost = 0
+        previous = None
+        for city in path:
+            if previous is not None:
+                cost += graph.graph[previous][city]
+            # Keep the first route found to a city; any other is equally short
+            tree.setdefault(city, (previous, cost))
+            previous = city
+
+    @staticmethod
+    def _route(tree: Dict, goal: Hashable) -> Tuple:
+        path = []
+        city = goal
+        while city is not None:
+            path.append(city)
+            city = tree[city][0]
+        return list(reversed(path)), tree[goal][1]
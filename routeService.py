@@ -0,0 +1,429 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from contractionHierarchy import ContractionHierarchy
+from distanceMatrix import ArraySpec, attach_array, share_array
+from graphCore import INF, CompactGraph, GraphBuilder, astar, path_from_parents
+
+ALGORITHMS = ("astar", "ucs")
+# Array attributes a ContractionHierarchy is rebuilt from, in constructor order
+HIERARCHY_ARRAYS = ("rank", "up_offsets", "up_targets", "up_weights", "up_middle")
+
+# Graph, coordinates and hierarchy attached by each worker process, see _attach_worker()
+_worker_graph: Optional[CompactGraph] = None
+_worker_coordinates: Optional[np.ndarray] = None
+_worker_hierarchy: Optional[ContractionHierarchy] = None
+
+# (algorithm, source id, target id) -> (path of node ids, total cost)
+Task = Tuple[str, int, int]
+Answer = Tuple[List[int], float]
+
+
+def _attach_worker(num_nodes: int, graph: List[ArraySpec], coordinates: Optional[ArraySpec],
+                   hierarchy: Optional[List[ArraySpec]]):
+    """Pool initializer: map the frozen graph once per worker process, no copy."""
+    global _worker_graph, _worker_coordinates, _worker_hierarchy
+    _worker_graph = CompactGraph(range(num_nodes), *map(attach_array, graph))
+    _worker_coordinates = attach_array(coordinates) if coordinates is not None else None
+    if hierarchy is not None:
+        _worker_hierarchy = ContractionHierarchy(list(range(num_nodes)),
+                                                 *map(attach_array, hierarchy))
+
+
+def solve_batch(graph: CompactGraph, coordinates: Optional[np.ndarray],
+                hierarchy: Optional[ContractionHierarchy], tasks: List[Task]) -> List[Answer]:
+    """
+    Answer a batch of queries over node ids. A* uses the straight-line
+    distance between coordinates as its heuristic (so coordinates must be
+    scaled to never overestimate a road cost); without coordinates it is
+    Dijkstra stopped at the target. "ucs" queries go to the contraction
+    hierarchy when there is one, which gives the same costs much faster.
+    """
+    answers = []
+    # x, y of node u at 2u, 2u + 1; memoryview indexing gives plain floats
+    flat = None
+    if coordinates is not None:
+        flat = memoryview(np.ascontiguousarray(coordinates, dtype=np.float64)).cast("B").cast("d")
+    for algorithm, source, target in tasks:
+        if algorithm == "ucs" and hierarchy is not None:
+            answers.append(hierarchy.query(source, target))
+            continue
+        heuristic = None
+        if algorithm == "astar" and flat is not None:
+            heuristic = _straight_line(flat, target)
+        dist, parent = astar(graph, source, target, heuristic)
+        if dist[target] == INF:
+            answers.append(([], INF))
+        else:
+            answers.append((path_from_parents(parent, target), dist[target].item()))
+    return answers
+
+
+def _straight_line(flat: memoryview, target: int) -> Callable[[int], float]:
+    """A* heuristic: the distance to target, computed only for the nodes A* reaches."""
+    target_x, target_y = flat[2 * target], flat[2 * target + 1]
+    return lambda node: math.hypot(flat[2 * node] - target_x, flat[2 * node + 1] - target_y)
+
+
+def _solve_in_worker(tasks: List[Task]) -> List[Answer]:
+    return solve_batch(_worker_graph, _worker_coordinates, _worker_hierarchy, tasks)
+
+
+class RouteService:
+    """
+    Answers (start, goal) route queries on one frozen graph. Queries that
+    arrive within batch_delay seconds of each other (up to batch_size) are
+    grouped, repeated ones answered once, and the batch is split into one
+    chunk per worker process. workers=0 answers in the event loop's process,
+    which is only sensible for small graphs and tests.
+
+    coordinates is an optional (nodes, 2) array in graph node order whose
+    straight-line distances never exceed the road costs; it turns "astar"
+    queries into A* instead of Dijkstra. hierarchy is an optional
+    ContractionHierarchy built from graph, used for "ucs" queries.
+    """
+
+    def __init__(self, graph: CompactGraph, coordinates: Optional[np.ndarray] = None,
+                 hierarchy: Optional[ContractionHierarchy] = None,
+                 workers: Optional[int] = None, batch_size: int = 256,
+                 batch_delay: float = 0.001):
+        self.graph = graph
+        if coordinates is not None:
+            coordinates = np.ascontiguousarray(coordinates, dtype=np.float64)
+        self.coordinates = coordinates
+        self.hierarchy = hierarchy
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.batches = 0
+        self.queries = 0
+        self._pending: List[Tuple[Task, asyncio.Future]] = []
+        self._flush: Optional[asyncio.TimerHandle] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._shared = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.workers > 0:
+            graph_specs = [self._share(array)
+                           for array in (graph.offsets, graph.targets, graph.weights)]
+            coordinate_spec = None
+            if coordinates is not None:
+                coordinate_spec = self._share(coordinates)
+            hierarchy_specs = None
+            if hierarchy is not None:
+                hierarchy_specs = [self._share(getattr(hierarchy, name)) for name in HIERARCHY_ARRAYS]
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_attach_worker,
+                initargs=(graph.num_nodes, graph_specs, coordinate_spec, hierarchy_specs))
+            # Fork the workers now, before any client socket is open: a worker
+            # forked later inherits those sockets and keeps them from closing
+            for _ in self._pool.map(int, range(self.workers)):
+                pass
+
+    def _share(self, array: np.ndarray) -> ArraySpec:
+        block, spec = share_array(array)
+        self._shared.append(block)
+        return spec
+
+    @classmethod
+    def from_network(cls, network: GraphBuilder, **options) -> "RouteService":
+        """
+        Serve a CityNetwork (or any graph class with freeze()). Networks with
+        city positions, like heuresticsAS.CityNetwork, get its heuristic:
+        half the straight-line distance. A heuresticsUCS.CityNetwork
+        hierarchy is used when it is up to date with the roads.
+        """
+        graph = network.freeze()
+        coordinates = None
+        positions = getattr(network, "position_index", None)
+        if positions is not None and all(name in positions for name in graph.names):
+            rows = [positions[name] for name in graph.names]
+            coordinates = network.coordinates[rows] / 2
+        hierarchy = getattr(network, "hierarchy", None)
+        if hierarchy is not None and network.hierarchy_version != network.edges_version:
+            hierarchy = None
+        return cls(graph, coordinates, hierarchy, **options)
+
+    def close(self):
+        """Stop the worker processes and free the shared memory."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for block in self._shared:
+            block.close()
+            block.unlink()
+        self._shared = []
+
+    async def wait_connections(self):
+        """Wait until every client connection has been answered and closed."""
+        while self._connections:
+            await asyncio.gather(*self._connections)
+
+    async def route(self, start: Hashable, goal: Hashable,
+                    algorithm: str = "astar") -> Tuple[List, float]:
+        """
+        Queue one query for the next batch.
+        Returns: (path, total_cost), ([], 0) when there is no path
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}")
+        index = self.graph.index
+        if start not in index or goal not in index:
+            return [], 0
+        loop = asyncio.get_running_loop()
+        answer = loop.create_future()
+        self._pending.append(((algorithm, index[start], index[goal]), answer))
+        if len(self._pending) >= self.batch_size:
+            self._dispatch()
+        elif self._flush is None:
+            self._flush = loop.call_later(self.batch_delay, self._dispatch)
+        path, total_cost = await answer
+        if not path:
+            return [], 0
+        return [self.graph.names[node] for node in path], self.graph.as_cost(total_cost)
+
+    def _dispatch(self):
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.queries += len(pending)
+        waiting: Dict[Task, List[asyncio.Future]] = {}
+        for task, answer in pending:
+            waiting.setdefault(task, []).append(answer)
+        tasks = list(waiting)
+        if self._pool is None:
+            self._deliver(waiting, tasks,
+                          solve_batch(self.graph, self.coordinates, self.hierarchy, tasks))
+            return
+        loop = asyncio.get_running_loop()
+        size = -(-len(tasks) // self.workers)
+        for first in range(0, len(tasks), size):
+            chunk = tasks[first:first + size]
+            job = loop.run_in_executor(self._pool, _solve_in_worker, chunk)
+            job.add_done_callback(lambda done, chunk=chunk: self._deliver(waiting, chunk, done))
+
+    @staticmethod
+    def _deliver(waiting: Dict[Task, List[asyncio.Future]], tasks: List[Task], answers):
+        if isinstance(answers, asyncio.Future):
+            if answers.exception() is not None:
+                for task in tasks:
+                    for answer in waiting[task]:
+                        if not answer.done():
+                            answer.set_exception(answers.exception())
+                return
+            answers = answers.result()
+        for task, result in zip(tasks, answers):
+            for answer in waiting[task]:
+                if not answer.done():
+                    answer.set_result(result)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        One connection: answer every request line, as soon as it is ready.
+        Request:  {"id": 1, "start": "A", "goal": "J", "algorithm": "astar"}
+        Response: {"id": 1, "path": ["A", ...], "cost": 7}, path [] when
+                  unreachable, or {"id": 1, "error": "..."}
+        """
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        running = set()
+
+        async def answer(line: bytes):
+            request = {}
+            try:
+                request = json.loads(line)
+                path, total_cost = await self.route(request["start"], request["goal"],
+                                                    request.get("algorithm", "astar"))
+                reply = {"id": request.get("id"), "path": path, "cost": total_cost}
+            except (ValueError, KeyError, TypeError) as error:
+                reply = {"id": request.get("id") if isinstance(request, dict) else None,
+                         "error": str(error)}
+            writer.write(json.dumps(reply).encode() + b"\n")
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                job = asyncio.ensure_future(answer(line))
+                running.add(job)
+                job.add_done_callback(running.discard)
+            if running:
+                await asyncio.gather(*running)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self._connections.discard(connection)
+
+    async def start(self, socket_path: Optional[str] = None, host: str = "127.0.0.1",
+                    port: int = 0) -> asyncio.AbstractServer:
+        """Listen on a Unix socket when socket_path is given, else on host:port."""
+        if socket_path is not None:
+            return await asyncio.start_unix_server(self._handle, path=socket_path)
+        return await asyncio.start_server(self._handle, host, port)
+
+
+async def _open(socket_path: Optional[str], host: str, port: int):
+    if socket_path is not None:
+        return await asyncio.open_unix_connection(socket_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def load_test(pairs: List[Tuple[Hashable, Hashable]], socket_path: Optional[str] = None,
+                    host: str = "127.0.0.1", port: int = 0, connections: int = 8,
+                    in_flight: int = 64, algorithm: str = "astar") -> Dict[str, float]:
+    """
+    Send every (start, goal) pair to a running service over `connections`
+    connections, each keeping up to `in_flight` requests outstanding.
+    Returns: queries/sec, p50/p99 latency in ms, and the error count
+    """
+    latencies: List[float] = []
+    errors = 0
+
+    async def client(share: List[Tuple[Hashable, Hashable]]):
+        nonlocal errors
+        reader, writer = await _open(socket_path, host, port)
+        sent: Dict[int, float] = {}
+        slots = asyncio.Semaphore(in_flight)
+
+        async def receive():
+            nonlocal errors
+            for _ in share:
+                reply = json.loads(await reader.readline())
+                latencies.append(time.perf_counter() - sent.pop(reply["id"]))
+                errors += "error" in reply
+                slots.release()
+
+        receiving = asyncio.ensure_future(receive())
+        for number, (start, goal) in enumerate(share):
+            await slots.acquire()
+            sent[number] = time.perf_counter()
+            request = {"id": number, "start": start, "goal": goal, "algorithm": algorithm}
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+        await receiving
+        writer.close()
+        await writer.wait_closed()
+
+    began = time.perf_counter()
+    await asyncio.gather(*(client(pairs[i::connections]) for i in range(connections)))
+    elapsed = time.perf_counter() - began
+    p50, p99 = np.percentile(latencies, [50, 99]).tolist() if latencies else (0.0, 0.0)
+    return {"queries": len(latencies), "seconds": elapsed,
+            "queries_per_second": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": p50 * 1000, "p99_ms": p99 * 1000, "errors": errors}
+
+
+def build_street_grid(side: int, seed: int = 0):
+    """heuresticsAS.CityNetwork street grid with block lengths of at least the spacing."""
+    from heuresticsAS import CityNetwork
+
+    rng = random.Random(seed)
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as positions:
+        positions.write("city,x,y\n")
+        for x in range(side):
+            for y in range(side):
+                # Doubled because the network halves straight-line distances
+                positions.write(f"J{x}_{y},{20 * x},{20 * y}\n")
+    try:
+        network = CityNetwork(positions_file=positions.name)
+    finally:
+        os.unlink(positions.name)
+    for x in range(side):
+        for y in range(side):
+            if x + 1 < side:
+                network.add_road(f"J{x}_{y}", f"J{x + 1}_{y}", rng.randint(10, 20))
+            if y + 1 < side:
+                network.add_road(f"J{x}_{y}", f"J{x}_{y + 1}", rng.randint(10, 20))
+    return network
+
+
+def random_pairs(names: List[Hashable], count: int, seed: int = 0) -> List[Tuple[Hashable, Hashable]]:
+    rng = random.Random(seed)
+    return [(rng.choice(names), rng.choice(names)) for _ in range(count)]
+
+
+def _build_service(side: int, workers: Optional[int], hierarchy: bool) -> RouteService:
+    network = build_street_grid(side)
+    service = RouteService.from_network(network, workers=workers)
+    if hierarchy:
+        service.close()
+        service = RouteService(service.graph, service.coordinates,
+                               ContractionHierarchy.build(service.graph), workers=workers)
+    return service
+
+
+async def _demo(side: int, queries: int, workers: Optional[int], hierarchy: bool,
+                algorithm: str):
+    service = _build_service(side, workers, hierarchy)
+    socket_path = os.path.join(tempfile.mkdtemp(), "routes.sock")
+    server = await service.start(socket_path)
+    try:
+        pairs = random_pairs(list(service.graph.names), queries)
+        report = await load_test(pairs, socket_path, algorithm=algorithm)
+        await service.wait_connections()
+    finally:
+        server.close()
+        await server.wait_closed()
+        service.close()
+        os.unlink(socket_path)
+    print(f"{side * side} junctions, {service.workers} workers, {algorithm}, "
+          f"{service.queries / max(service.batches, 1):.1f} queries per batch")
+    print(json.dumps(report, indent=2))
+
+
+async def _serve(socket_path: Optional[str], host: str, port: int, side: int,
+                 workers: Optional[int], hierarchy: bool):
+    service = _build_service(side, workers, hierarchy)
+    server = await service.start(socket_path, host, port)
+    where = socket_path or ":".join(map(str, server.sockets[0].getsockname()[:2]))
+    print(f"serving {service.graph.num_nodes} junctions on {where}", flush=True)
+    try:
+        await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route query service")
+    parser.add_argument("mode", nargs="?", choices=("demo", "serve", "load"), default="demo")
+    parser.add_argument("--socket", help="Unix socket path (default: TCP on --host/--port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8642)
+    parser.add_argument("--side", type=int, default=60, help="street grid is side x side")
+    parser.add_argument("--workers", type=int, default=None, help="default: one per CPU")
+    parser.add_argument("--hierarchy", action="store_true",
+                        help="preprocess a contraction hierarchy for ucs queries")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="astar")
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(_serve(args.socket, args.host, args.port, args.side, args.workers,
+                           args.hierarchy))
+    elif args.mode == "load":
+        names = [f"J{x}_{y}" for x in range(args.side) for y in range(args.side)]
+        report = asyncio.run(load_test(random_pairs(names, args.queries), args.socket,
+                                       args.host, args.port, algorithm=args.algorithm))
+        print(json.dumps(report, indent=2))
+    else:
+        asyncio.run(_demo(args.side, args.queries, args.workers, args.hierarchy, args.algorithm))
+
+
+if __name__ == "__main__":
+    main()
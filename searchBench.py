@@ -0,0 +1,287 @@
+"""
+Benchmarks for the search implementations.
+Run: python searchBench.py
+"""
+import heapq
+import random
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from heuresticsUCS import CityNetwork
+from hierarchicalGrid import HierarchicalGrid
+from searchFrontier import HeapFrontier, IndexedHeap
+from treasureHunt import TreasureHunt
+
+
+def build_comb_network(depth: int) -> CityNetwork:
+    """
+    A highway of `depth` segments with an expensive side road at every exit.
+    The side roads are pushed on the frontier but never expanded before the
+    goal, so a search that copies the path per push keeps `depth` paths of
+    growing length alive at once.
+    """
+    network = CityNetwork()
+    for i in range(depth):
+        network.add_road(f"S{i}", f"S{i + 1}", 1)
+        network.add_road(f"S{i}", f"T{i}", depth + 10)
+    return network
+
+
+def path_copy_ucs(network: CityNetwork, start: str, goal: str) -> Tuple[List[str], int]:
+    """Reference UCS that stores a full path copy in every frontier entry."""
+    pq = [(0, start, [start])]
+    visited: Dict[str, int] = {}
+    while pq:
+        current_cost, current_city, path = heapq.heappop(pq)
+        if current_city == goal:
+            return path, current_cost
+        if current_city in visited and visited[current_city] < current_cost:
+            continue
+        visited[current_city] = current_cost
+        for neighbor, cost in network.graph[current_city].items():
+            if neighbor not in visited or visited[neighbor] > current_cost + cost:
+                heapq.heappush(pq, (current_cost + cost, neighbor, path + [neighbor]))
+    return [], 0
+
+
+def timed(search: Callable[[], object]) -> float:
+    """Run a search once and return milliseconds, without allocation tracing."""
+    began = time.perf_counter()
+    search()
+    return (time.perf_counter() - began) * 1000
+
+
+def measure(search: Callable[[], object]) -> Tuple[float, float]:
+    """Run a search once and return (milliseconds, peak KiB allocated)."""
+    tracemalloc.start()
+    began = time.perf_counter()
+    search()
+    elapsed = (time.perf_counter() - began) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def bench_path_memory(depths=(500, 1000, 2000, 4000)):
+    """Compare per-push path copies against parent pointers on deep graphs."""
+    print("\nPath storage: path copy per push vs parent pointers (UCS on comb graph)")
+    print("-" * 72)
+    print(f"{'depth':>7} {'copy ms':>10} {'copy KiB':>10} {'parent ms':>10} {'parent KiB':>11}")
+    for depth in depths:
+        network = build_comb_network(depth)
+        goal = f"S{depth}"
+        copy_ms, copy_kib = measure(lambda: path_copy_ucs(network, "S0", goal))
+        parent_ms, parent_kib = measure(lambda: network.uniform_cost_search("S0", goal))
+        print(f"{depth:>7} {copy_ms:>10.1f} {copy_kib:>10.0f} {parent_ms:>10.1f} {parent_kib:>11.0f}")
+
+
+def build_dense_network(cities: int, degree: int, seed: int = 0) -> CityNetwork:
+    """Random network where every city has roughly `degree` roads."""
+    rng = random.Random(seed)
+    network = CityNetwork()
+    for i in range(cities):
+        for _ in range(degree // 2):
+            network.add_road(f"C{i}", f"C{rng.randrange(cities)}", rng.randint(1, 100))
+    return network
+
+
+def bench_frontiers(sizes=((2000, 20), (2000, 80), (5000, 80))):
+    """Compare the lazy-deletion heap against the indexed heap on dense graphs."""
+    print("\nFrontier: lazy-deletion heapq vs indexed heap with decrease-key (UCS)")
+    print("-" * 72)
+    print(f"{'cities':>7} {'degree':>7} {'lazy ms':>9} {'lazy KiB':>9} {'indexed ms':>11} {'indexed KiB':>12}")
+    for cities, degree in sizes:
+        network = build_dense_network(cities, degree)
+        goal = f"C{cities - 1}"
+        lazy_ms, lazy_kib = measure(lambda: network.uniform_cost_search("C0", goal, HeapFrontier))
+        indexed_ms, indexed_kib = measure(lambda: network.uniform_cost_search("C0", goal, IndexedHeap))
+        print(f"{cities:>7} {degree:>7} {lazy_ms:>9.1f} {lazy_kib:>9.0f} {indexed_ms:>11.1f} {indexed_kib:>12.0f}")
+
+
+def build_grid_network(side: int, seed: int = 0) -> CityNetwork:
+    """Square street grid of side x side junctions with random block lengths."""
+    rng = random.Random(seed)
+    network = CityNetwork()
+    for x in range(side):
+        for y in range(side):
+            if x + 1 < side:
+                network.add_road(f"{x},{y}", f"{x + 1},{y}", rng.randint(1, 10))
+            if y + 1 < side:
+                network.add_road(f"{x},{y}", f"{x},{y + 1}", rng.randint(1, 10))
+    return network
+
+
+class CountingFrontier(HeapFrontier):
+    """HeapFrontier that counts pops, i.e. settled nodes."""
+    pops = 0
+
+    def pop(self):
+        CountingFrontier.pops += 1
+        return super().pop()
+
+
+def count_pops(search: Callable[[], object]) -> int:
+    """Run a search that uses CountingFrontier and return how many nodes it settled."""
+    CountingFrontier.pops = 0
+    search()
+    return CountingFrontier.pops
+
+
+def bench_bidirectional(sides=(50, 100, 200), queries=20):
+    """Compare one-sided UCS with bidirectional Dijkstra on street grids."""
+    print("\nPoint-to-point: UCS vs bidirectional Dijkstra (street grid)")
+    print("-" * 72)
+    print(f"{'junctions':>10} {'ucs settled':>12} {'ucs ms':>8} {'bidir settled':>14} {'bidir ms':>9}")
+    for side in sides:
+        network = build_grid_network(side)
+        network.freeze()
+        rng = random.Random(side)
+        pairs = [(f"{rng.randrange(side)},{rng.randrange(side)}",
+                  f"{rng.randrange(side)},{rng.randrange(side)}") for _ in range(queries)]
+        ucs_ms = timed(lambda: [network.uniform_cost_search(s, t) for s, t in pairs])
+        bidi_ms = timed(lambda: [network.bidirectional_search(s, t) for s, t in pairs])
+        ucs_settled = count_pops(lambda: [network.uniform_cost_search(s, t, CountingFrontier)
+                                          for s, t in pairs])
+        bidi_settled = count_pops(lambda: [network.bidirectional_search(s, t, CountingFrontier)
+                                           for s, t in pairs])
+        print(f"{side * side:>10} {ucs_settled / queries:>12.0f} {ucs_ms / queries:>8.2f}"
+              f" {bidi_settled / queries:>14.0f} {bidi_ms / queries:>9.2f}")
+
+
+def build_cave_grid(side: int, density: float = 0.2, seed: int = 0) -> np.ndarray:
+    """side x side map with random obstacles (1) and an open start and end corner."""
+    rng = np.random.default_rng(seed)
+    grid = (rng.random((side, side)) < density).astype(np.int8)
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+def build_corridor_grid(side: int) -> np.ndarray:
+    """side x side serpentine maze: one-cell corridors joined at alternate ends."""
+    grid = np.zeros((side, side), dtype=np.int8)
+    grid[1::2] = 1
+    grid[1::4, -1] = 0
+    grid[3::4, 0] = 0
+    grid[-1] = 0
+    return grid
+
+
+def list_grid_bfs(grid: List[List[int]], start: Tuple[int, int],
+                  treasure: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+    """Reference BFS over a list-of-lists map with tuple sets and dicts."""
+    rows, cols = len(grid), len(grid[0])
+    queue = deque([start])
+    parent = {start: None}
+    while queue:
+        current = queue.popleft()
+        if current == treasure:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parent[current]
+            return list(reversed(path))
+        x, y = current
+        for dx, dy in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+            cell = (x + dx, y + dy)
+            if (0 <= cell[0] < rows and 0 <= cell[1] < cols and grid[cell[0]][cell[1]] != 1
+                    and cell not in parent):
+                queue.append(cell)
+                parent[cell] = current
+    return None
+
+
+def bench_grid_bfs(sides=(256, 512, 1024)):
+    """
+    Compare the list-of-lists BFS with TreasureHunt's array flood fill, on
+    open caves (wide frontiers) and serpentine mazes (frontiers of a cell
+    or two).
+    """
+    print("\nGrid BFS: list of lists vs NumPy flood fill (corner to corner)")
+    print("-" * 72)
+    print(f"{'map':>8} {'cells':>10} {'list ms':>10} {'list KiB':>10} {'numpy ms':>10}"
+          f" {'numpy KiB':>10}")
+    for kind, build in (("cave", build_cave_grid), ("corridor", build_corridor_grid)):
+        for side in sides:
+            cells = build(side)
+            grid = cells.tolist()
+            hunt = TreasureHunt(cells)
+            goal = (side - 1, side - 1)
+            list_ms = timed(lambda: list_grid_bfs(grid, (0, 0), goal))
+            numpy_ms = timed(lambda: hunt.find_treasure_bfs(0, 0, *goal))
+            _, list_kib = measure(lambda: list_grid_bfs(grid, (0, 0), goal))
+            _, numpy_kib = measure(lambda: hunt.find_treasure_bfs(0, 0, *goal))
+            assert list_grid_bfs(grid, (0, 0), goal) == hunt.find_treasure_bfs(0, 0, *goal)
+            print(f"{kind:>8} {side * side:>10} {list_ms:>10.1f} {list_kib:>10.0f}"
+                  f" {numpy_ms:>10.1f} {numpy_kib:>10.0f}")
+
+
+def build_room_grid(side: int, blocks: int, seed: int = 0) -> np.ndarray:
+    """Mostly open side x side map with `blocks` random rectangular obstacles."""
+    rng = np.random.default_rng(seed)
+    grid = np.zeros((side, side), dtype=np.int8)
+    for _ in range(blocks):
+        x, y = rng.integers(0, side, 2)
+        height, width = rng.integers(2, max(3, side // 16), 2)
+        grid[x:x + height, y:y + width] = 1
+    grid[0, 0] = grid[-1, -1] = 0
+    return grid
+
+
+def bench_grid_jps(sizes=((256, 40), (1024, 150), (2048, 400))):
+    """Compare BFS, Manhattan A* and Jump Point Search on open maps."""
+    print("\nOpen grid: BFS vs A* vs JPS (corner to corner)")
+    print("-" * 72)
+    print(f"{'cells':>10} {'bfs ms':>8} {'A* pops':>9} {'A* ms':>8} {'jps pops':>9}"
+          f" {'jps ms':>7} {'tables ms':>10}")
+    for side, blocks in sizes:
+        hunt = TreasureHunt(build_room_grid(side, blocks))
+        goal = (side - 1, side - 1)
+        bfs_ms = timed(lambda: hunt.find_treasure_bfs(0, 0, *goal))
+        tables_ms = timed(hunt._jump_data)
+        astar_ms = timed(lambda: hunt.find_treasure_astar(0, 0, *goal))
+        jps_ms = timed(lambda: hunt.find_treasure_jps(0, 0, *goal))
+        astar_pops = count_pops(lambda: hunt.find_treasure_astar(0, 0, *goal, CountingFrontier))
+        jps_pops = count_pops(lambda: hunt.find_treasure_jps(0, 0, *goal, CountingFrontier))
+        print(f"{side * side:>10} {bfs_ms:>8.0f} {astar_pops:>9} {astar_ms:>8.0f} {jps_pops:>9}"
+              f" {jps_ms:>7.0f} {tables_ms:>10.0f}")
+
+
+def bench_hierarchical(sizes=((512, 80), (2048, 400)), cluster_size=32, queries=10, updates=20):
+    """HPA* build, query and single-cell update times against BFS on open maps."""
+    print(f"\nHPA* ({cluster_size}x{cluster_size} clusters) vs BFS, random free-cell pairs")
+    print("-" * 72)
+    print(f"{'cells':>10} {'build ms':>9} {'hpa ms':>8} {'bfs ms':>8} {'length':>7} {'update ms':>10}")
+    for side, blocks in sizes:
+        hunt = TreasureHunt(build_room_grid(side, blocks))
+        began = time.perf_counter()
+        hierarchy = HierarchicalGrid(hunt, cluster_size)
+        build_ms = (time.perf_counter() - began) * 1000
+        rng = random.Random(side)
+        free = np.argwhere(~hunt.blocked).tolist()
+        pairs = [(rng.choice(free), rng.choice(free)) for _ in range(queries)]
+        hpa_ms = timed(lambda: [hierarchy.find_path(*s, *t) for s, t in pairs])
+        bfs_ms = timed(lambda: [hunt.find_treasure_bfs(*s, *t) for s, t in pairs])
+        # Path length relative to the shortest path, over reachable pairs
+        ratios = [len(hierarchy.find_path(*s, *t)) / len(path) for s, t in pairs
+                  for path in [hunt.find_treasure_bfs(*s, *t)] if path]
+        cells = [(rng.randrange(side), rng.randrange(side)) for _ in range(updates)]
+        update_ms = timed(lambda: [hierarchy.set_cell(x, y, not hunt.blocked[x, y]) for x, y in cells])
+        print(f"{side * side:>10} {build_ms:>9.0f} {hpa_ms / queries:>8.1f} {bfs_ms / queries:>8.1f}"
+              f" {sum(ratios) / max(len(ratios), 1):>7.3f} {update_ms / updates:>10.1f}")
+
+
+def main():
+    bench_path_memory()
+    bench_frontiers()
+    bench_bidirectional()
+    bench_grid_bfs()
+    bench_grid_jps()
+    bench_hierarchical()
+
+
+if __name__ == "__main__":
+    main()
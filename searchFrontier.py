@@ -0,0 +1,167 @@
+from typing import Dict, Hashable, List, Tuple
+import heapq
+
+
+class HeapFrontier:
+    """
+    heapq frontier with lazy deletion: an improved priority pushes a new
+    entry and the old one is skipped when it surfaces.
+    push() inserts a key or lowers its priority; pop() returns the key with
+    the lowest (priority, key). Pushes that change something are counted
+    in the generated, and skipped entries in the stale_skips, of an
+    optional SearchStats.
+    """
+
+    def __init__(self, stats=None):
+        self._heap: List[Tuple] = []
+        self._best: Dict[Hashable, object] = {}
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._best
+
+    def push(self, key: Hashable, priority) -> bool:
+        """Insert key or lower its priority. Returns False if nothing changed."""
+        if key in self._best and self._best[key] <= priority:
+            return False
+        self._best[key] = priority
+        heapq.heappush(self._heap, (priority, key))
+        if self.stats is not None:
+            self.stats.generate()
+        return True
+
+    def pop(self) -> Tuple[Hashable, object]:
+        """Remove and return (key, priority) with the lowest priority."""
+        while self._heap:
+            priority, key = heapq.heappop(self._heap)
+            if self._best.get(key) == priority:
+                del self._best[key]
+                return key, priority
+            if self.stats is not None:
+                self.stats.stale_skips += 1
+        raise IndexError("pop from empty frontier")
+
+    def peek(self) -> Tuple[Hashable, object]:
+        """Return (key, priority) with the lowest priority without removing it."""
+        while self._heap:
+            priority, key = self._heap[0]
+            if self._best.get(key) == priority:
+                return key, priority
+            heapq.heappop(self._heap)
+            if self.stats is not None:
+                self.stats.stale_skips += 1
+        raise IndexError("peek at empty frontier")
+
+    def priority(self, key: Hashable):
+        return self._best[key]
+
+
+class IndexedHeap:
+    """
+    Binary heap with a key -> slot index, so every key has exactly one entry
+    and decrease-key happens in place. Keys are the interned node ids of the
+    compact graph (or city names for the dict-based searches).
+    Same interface and pop order as HeapFrontier; it never holds stale
+    entries, so an optional SearchStats only gets its generated count.
+    """
+
+    def __init__(self, stats=None):
+        self._heap: List[Tuple] = []  # (priority, key) entries
+        self._pos: Dict[Hashable, int] = {}
+        self.stats = stats
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._pos
+
+    def push(self, key: Hashable, priority) -> bool:
+        """Insert key or lower its priority. Returns False if nothing changed."""
+        slot = self._pos.get(key)
+        if slot is None:
+            self._heap.append((priority, key))
+            self._pos[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+        elif self._heap[slot][0] <= priority:
+            return False
+        else:
+            self._heap[slot] = (priority, key)
+            self._sift_up(slot)
+        if self.stats is not None:
+            self.stats.generate()
+        return True
+
+    def update(self, key: Hashable, priority):
+        """Insert key or set its priority, whether it goes up or down."""
+        slot = self._pos.get(key)
+        if slot is None:
+            self.push(key, priority)
+            return
+        self._heap[slot] = (priority, key)
+        self._sift_up(slot)
+        self._sift_down(self._pos[key])
+
+    def remove(self, key: Hashable):
+        """Remove key if present."""
+        slot = self._pos.pop(key, None)
+        if slot is None:
+            return
+        last = self._heap.pop()
+        if slot < len(self._heap):
+            self._heap[slot] = last
+            self._pos[last[1]] = slot
+            self._sift_up(slot)
+            self._sift_down(self._pos[last[1]])
+
+    def pop(self) -> Tuple[Hashable, object]:
+        """Remove and return (key, priority) with the lowest priority."""
+        if not self._heap:
+            raise IndexError("pop from empty frontier")
+        priority, key = self._heap[0]
+        self.remove(key)
+        return key, priority
+
+    def peek(self) -> Tuple[Hashable, object]:
+        """Return (key, priority) with the lowest priority without removing it."""
+        if not self._heap:
+            raise IndexError("peek at empty frontier")
+        priority, key = self._heap[0]
+        return key, priority
+
+    def priority(self, key: Hashable):
+        return self._heap[self._pos[key]][0]
+
+    def _sift_up(self, slot: int):
+        heap, pos = self._heap, self._pos
+        entry = heap[slot]
+        while slot > 0:
+            up = (slot - 1) >> 1
+            if heap[up] <= entry:
+                break
+            heap[slot] = heap[up]
+            pos[heap[slot][1]] = slot
+            slot = up
+        heap[slot] = entry
+        pos[entry[1]] = slot
+
+    def _sift_down(self, slot: int):
+        heap, pos = self._heap, self._pos
+        size = len(heap)
+        entry = heap[slot]
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[slot] = heap[child]
+            pos[heap[slot][1]] = slot
+            slot = child
+        heap[slot] = entry
+        pos[entry[1]] = slot
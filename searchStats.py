@@ -0,0 +1,57 @@
+from typing import Dict, Optional
+import time
+
+
+class SearchStats:
+    """
+    Counters a search fills in when it is handed one through its `stats`
+    argument; searches called without one skip the bookkeeping. One object
+    can be passed to several searches to add their counts up. Counters a
+    search does not measure stay None and are left out of as_dict().
+
+    expansions: nodes whose successors were generated
+    generated: entries pushed onto a HeapFrontier or IndexedHeap frontier,
+        the start included (searches with their own queue leave it None)
+    peak_nodes: most search nodes held in memory at the same time (only the
+        memory-bounded searches, IDA* and SMA*, measure it)
+    peak_frontier: largest frontier (open list or queue) seen
+    stale_skips: frontier entries popped and dropped because the node had
+        been settled or reached more cheaply since they were pushed
+    timings: seconds spent per phase, added up by lap()
+    """
+
+    def __init__(self):
+        self.expansions = 0
+        self.generated: Optional[int] = None
+        self.peak_nodes: Optional[int] = None
+        self.peak_frontier = 0
+        self.stale_skips = 0
+        self.timings: Dict[str, float] = {}
+        self._lap_start = time.perf_counter()
+
+    def start(self):
+        """Start timing the first phase of a search."""
+        self._lap_start = time.perf_counter()
+
+    def lap(self, phase: str):
+        """Charge the time since start() or the previous lap() to phase."""
+        now = time.perf_counter()
+        self.timings[phase] = self.timings.get(phase, 0.0) + now - self._lap_start
+        self._lap_start = now
+
+    def expanded(self, frontier_size: int, count: int = 1):
+        """Count count expansions, with the frontier size after them."""
+        self.expansions += count
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+
+    def generate(self, count: int = 1):
+        """Count count entries pushed onto a frontier."""
+        self.generated = (self.generated or 0) + count
+
+    def as_dict(self) -> Dict[str, float]:
+        """Flat export: the measured counters plus one `<phase>_seconds` entry per phase."""
+        stats = {name: value for name, value in vars(self).items()
+                 if not name.startswith("_") and name != "timings" and value is not None}
+        stats.update((f"{phase}_seconds", seconds) for phase, seconds in self.timings.items())
+        return stats
@@ -0,0 +1,450 @@
+"""
+Reproducible benchmark suite: every search implementation in the repo runs
+the same queries on synthetic grids, random geometric road graphs and
+scale-free graphs, and the results are written as JSON.
+Run: python searchSuite.py --edges 1000 10000 100000 --output results.json
+     python searchSuite.py --baseline results.json   (exit code 1 on regressions)
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+import Act3_Searches
+import CityProy2
+import SearchsProy
+import cityProy
+import heurestics
+import heuresticsAS
+import heuresticsGS
+import heuresticsUCS
+from graphCore import CompactGraph, bfs
+from treasureHunt import TreasureHunt
+
+# (start node, goal node) ids
+Query = Tuple[int, int]
+# set_goal(goal) prepares goal-specific heuristics, query(start, goal) runs one search
+Runner = Tuple[Callable[[int], None], Callable[[int, int], object]]
+
+
+class Workload:
+    """
+    One synthetic road graph: string node names, undirected roads as an
+    (edges, 2) array of node ids with integer costs no smaller than the
+    straight-line distance between their ends, node coordinates, and the
+    benchmark queries. Grid workloads also keep the obstacle mask; node i
+    is then the cell cells[i] of that mask, in row-major order.
+    """
+
+    def __init__(self, kind: str, names: List[str], roads: np.ndarray, costs: np.ndarray,
+                 coordinates: np.ndarray, blocked: Optional[np.ndarray] = None,
+                 cells: Optional[np.ndarray] = None):
+        self.kind = kind
+        self.names = names
+        self.roads = roads
+        self.costs = costs
+        self.coordinates = coordinates
+        self.blocked = blocked
+        self.cells = cells
+        self.queries: List[Query] = []
+
+    @property
+    def num_edges(self) -> int:
+        """Directed edges, i.e. both directions of every road."""
+        return 2 * len(self.roads)
+
+    def compact(self) -> CompactGraph:
+        rows = np.concatenate((self.roads[:, 0], self.roads[:, 1]))
+        cols = np.concatenate((self.roads[:, 1], self.roads[:, 0]))
+        return CompactGraph.from_edges(self.names, rows, cols, np.concatenate((self.costs, self.costs)))
+
+    def heuristic(self, goal: int) -> List[float]:
+        """Straight-line distance from every node to goal, a lower bound on the road cost."""
+        return np.hypot(*(self.coordinates - self.coordinates[goal]).T).tolist()
+
+    def road_list(self) -> List[Tuple[str, str, int]]:
+        names = self.names
+        return [(names[u], names[v], cost) for (u, v), cost
+                in zip(self.roads.tolist(), self.costs.tolist())]
+
+
+def grid_workload(edges: int, seed: int = 0, density: float = 0.2) -> Workload:
+    """Square map with random obstacles; roads of cost 1 join 4-adjacent free cells."""
+    rng = np.random.default_rng(seed)
+    side = max(2, int(np.ceil(np.sqrt(edges / (4 * (1 - density) ** 2)))))
+    blocked = rng.random((side, side)) < density
+    free = ~blocked
+    cells = np.flatnonzero(free)
+    node = np.full(side * side, -1, dtype=np.int64)
+    node[cells] = np.arange(len(cells))
+    node = node.reshape(side, side)
+    across = free[:, :-1] & free[:, 1:]
+    down = free[:-1, :] & free[1:, :]
+    roads = np.concatenate((
+        np.stack((node[:, :-1][across], node[:, 1:][across]), axis=1),
+        np.stack((node[:-1, :][down], node[1:, :][down]), axis=1)))
+    x, y = np.divmod(cells, side)
+    names = [f"{a},{b}" for a, b in zip(x.tolist(), y.tolist())]
+    return Workload("grid", names, roads, np.ones(len(roads), dtype=np.int64),
+                    np.stack((x, y), axis=1).astype(np.float64), blocked, cells)
+
+
+def geometric_workload(edges: int, seed: int = 0, degree: int = 6) -> Workload:
+    """
+    Random geometric graph: points spread over a square with a mean spacing
+    of 10, and a road between every two points closer than the radius that
+    gives `degree` roads per point on average. Road costs are the distances
+    rounded up.
+    """
+    rng = np.random.default_rng(seed)
+    n = max(16, edges // degree)
+    size = 10 * np.sqrt(n)
+    radius = 10 * np.sqrt(degree / np.pi)
+    points = rng.random((n, 2)) * size
+
+    # Bucket the points into radius-sized cells; neighbors are in the same
+    # cell or one of the 8 around it, and each cell pair is visited once
+    bins = int(np.ceil(size / radius))
+    bx, by = np.minimum((points // radius).astype(np.int64).T, bins - 1)
+    key = bx * bins + by
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    pairs = []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        nx, ny = bx + dx, by + dy
+        inside = (nx < bins) & (ny >= 0) & (ny < bins)
+        sources = np.flatnonzero(inside)
+        target_key = nx[inside] * bins + ny[inside]
+        lo = np.searchsorted(sorted_key, target_key, "left")
+        counts = np.searchsorted(sorted_key, target_key, "right") - lo
+        first = np.repeat(sources, counts)
+        # Position of every candidate inside its cell's run of sorted points
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = order[np.repeat(lo, counts) + within]
+        keep = first < second if (dx, dy) == (0, 0) else np.ones(len(first), dtype=bool)
+        pairs.append(np.stack((first[keep], second[keep]), axis=1))
+    roads = np.concatenate(pairs)
+    lengths = np.hypot(*(points[roads[:, 0]] - points[roads[:, 1]]).T)
+    close = lengths <= radius
+    roads, lengths = roads[close], lengths[close]
+    costs = np.maximum(1, np.ceil(lengths)).astype(np.int64)
+    return Workload("geometric", [f"P{i}" for i in range(n)], roads, costs, points)
+
+
+def scale_free_workload(edges: int, seed: int = 0, links: int = 3) -> Workload:
+    """
+    Barabasi-Albert graph: every new node links to `links` existing nodes
+    picked with probability proportional to their degree. There is no
+    geometry, so all coordinates are 0 and the heuristics are 0 too.
+    """
+    rng = random.Random(seed)
+    n = max(links + 2, edges // (2 * links))
+    roads = []
+    # Every node appears here once per road end, so a uniform pick is degree-weighted
+    ends: List[int] = []
+    targets = list(range(links))
+    for source in range(links, n):
+        roads.extend((source, target) for target in targets)
+        ends.extend(targets)
+        ends.extend([source] * links)
+        chosen = set()
+        while len(chosen) < links:
+            chosen.add(rng.choice(ends))
+        targets = list(chosen)
+    costs = np.array([rng.randint(1, 100) for _ in roads], dtype=np.int64)
+    return Workload("scale_free", [f"V{i}" for i in range(n)], np.array(roads, dtype=np.int64),
+                    costs, np.zeros((n, 2)))
+
+
+GENERATORS: Dict[str, Callable[..., Workload]] = {
+    "grid": grid_workload,
+    "geometric": geometric_workload,
+    "scale_free": scale_free_workload,
+}
+
+
+def pick_queries(workload: Workload, goals: int, starts: int, seed: int = 0) -> List[Query]:
+    """
+    goals x starts queries between nodes of the largest component found
+    from a few random roots, grouped by goal so the goal-specific
+    heuristic tables are built once per goal.
+    """
+    rng = np.random.default_rng(seed)
+    graph = workload.compact()
+    reached = np.zeros(0, dtype=np.int64)
+    for root in rng.integers(0, graph.num_nodes, 5).tolist():
+        hops, _ = bfs(graph, root)
+        component = np.flatnonzero(hops >= 0)
+        if len(component) > len(reached):
+            reached = component
+        if len(reached) * 2 > graph.num_nodes:
+            break
+    queries = []
+    for goal in rng.choice(reached, goals).tolist():
+        queries.extend((start, goal) for start in rng.choice(reached, starts).tolist())
+    return queries
+
+
+def _fixed_goal(query: Callable[[int, int], object]) -> Runner:
+    return (lambda goal: None), query
+
+
+def act3_astar(workload: Workload, scratch: str) -> Runner:
+    graph = Act3_Searches.Graph()
+    for city1, city2, cost in workload.road_list():
+        graph.add_edge(city1, city2, cost)
+        graph.add_edge(city2, city1, cost)
+    names = workload.names
+
+    def set_goal(goal: int):
+        graph.heuristics.update(zip(names, workload.heuristic(goal)))
+        graph.touch(edges=False)
+    return set_goal, lambda start, goal: graph.a_star(names[start], names[goal])
+
+
+def heurestics_astar(workload: Workload, scratch: str) -> Runner:
+    network = heurestics.CityNetwork()
+    for road in workload.road_list():
+        network.add_road(*road)
+    names = workload.names
+
+    def set_goal(goal: int):
+        network.heuristics.update(zip(names, workload.heuristic(goal)))
+        network.touch(edges=False)
+    return set_goal, lambda start, goal: network.a_star_search(names[start], names[goal])
+
+
+def heuresticsAS_astar(workload: Workload, scratch: str) -> Runner:
+    # The heuristic comes from a positions file; coordinates are doubled
+    # because CityNetwork halves the straight-line distance
+    positions = os.path.join(scratch, "positions.csv")
+    with open(positions, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["city", "x", "y"])
+        writer.writerows([name, 2 * x, 2 * y]
+                         for name, (x, y) in zip(workload.names, workload.coordinates.tolist()))
+    network = heuresticsAS.CityNetwork(positions_file=positions)
+    for road in workload.road_list():
+        network.add_road(*road)
+    names = workload.names
+    return _fixed_goal(lambda start, goal: network.a_star_search(names[start], names[goal]))
+
+
+def heuresticsUCS_ucs(workload: Workload, scratch: str) -> Runner:
+    network = heuresticsUCS.CityNetwork()
+    for road in workload.road_list():
+        network.add_road(*road)
+    names = workload.names
+    return _fixed_goal(lambda start, goal: network.uniform_cost_search(names[start], names[goal]))
+
+
+def heuresticsGS_greedy(beam_width: Optional[int] = None) -> Callable[[Workload, str], Runner]:
+    def prepare(workload: Workload, scratch: str) -> Runner:
+        network = heuresticsGS.CityNetwork()
+        for road in workload.road_list():
+            network.add_road(*road)
+        network.freeze()
+        names = workload.names
+        return _fixed_goal(lambda start, goal: network.greedy_search(
+            names[start], names[goal], beam_width=beam_width))
+    return prepare
+
+
+def cityproy2_astar(workload: Workload, scratch: str) -> Runner:
+    graph = CityProy2.Graph()
+    for road in workload.road_list():
+        graph.add_edge(*road)
+    names = workload.names
+
+    def set_goal(goal: int):
+        graph.heuristic.update(zip(names, workload.heuristic(goal)))
+        graph.touch(edges=False)
+    return set_goal, lambda start, goal: CityProy2.astar(graph, names[start], names[goal])
+
+
+def cityproy_astar(workload: Workload, scratch: str) -> Runner:
+    graph = cityProy.CityGraph()
+    for road in workload.road_list():
+        graph.add_edge(*road)
+    names = workload.names
+
+    def set_goal(goal: int):
+        target = names[goal]
+        for city, distance in zip(names, workload.heuristic(goal)):
+            graph.heuristics.setdefault(city, {})[target] = distance
+        graph.touch(edges=False)
+    return set_goal, lambda start, goal: cityProy.astar(graph, names[start], names[goal])
+
+
+def searchsproy(search: Callable) -> Callable[[Workload, str], Runner]:
+    def prepare(workload: Workload, scratch: str) -> Runner:
+        graph = SearchsProy.Graph()
+        for city1, city2, cost in workload.road_list():
+            graph.add_edge(city1, city2, cost)
+            graph.add_edge(city2, city1, cost)
+        names = workload.names
+        return _fixed_goal(lambda start, goal: search(graph, names[start], names[goal]))
+    return prepare
+
+
+def treasure_hunt(method: str) -> Callable[[Workload, str], Runner]:
+    def prepare(workload: Workload, scratch: str) -> Runner:
+        hunt = TreasureHunt(workload.blocked)
+        search = getattr(hunt, method)
+        cell = [divmod(c, hunt.cols) for c in workload.cells.tolist()]
+        return _fixed_goal(lambda start, goal: search(*cell[start], *cell[goal]))
+    return prepare
+
+
+# name -> (builder, generators it runs on, None for all)
+SEARCHES: Dict[str, Tuple[Callable[[Workload, str], Runner], Optional[Tuple[str, ...]]]] = {
+    "Act3_Searches.Graph.a_star": (act3_astar, None),
+    "heurestics.CityNetwork.a_star_search": (heurestics_astar, None),
+    "heuresticsAS.CityNetwork.a_star_search": (heuresticsAS_astar, None),
+    "heuresticsUCS.CityNetwork.uniform_cost_search": (heuresticsUCS_ucs, None),
+    "heuresticsGS.CityNetwork.greedy_search": (heuresticsGS_greedy(), None),
+    "heuresticsGS.CityNetwork.greedy_search[beam=8]": (heuresticsGS_greedy(8), None),
+    "CityProy2.astar": (cityproy2_astar, None),
+    "cityProy.astar": (cityproy_astar, None),
+    "SearchsProy.bfs": (searchsproy(SearchsProy.bfs), None),
+    "SearchsProy.dfs": (searchsproy(SearchsProy.dfs), None),
+    "SearchsProy.ucs": (searchsproy(SearchsProy.ucs), None),
+    "TreasureHunt.find_treasure_bfs": (treasure_hunt("find_treasure_bfs"), ("grid",)),
+    "TreasureHunt.find_treasure_dfs": (treasure_hunt("find_treasure_dfs"), ("grid",)),
+    "TreasureHunt.find_treasure_astar": (treasure_hunt("find_treasure_astar"), ("grid",)),
+    "TreasureHunt.find_treasure_jps": (treasure_hunt("find_treasure_jps"), ("grid",)),
+}
+
+
+def run_search(name: str, workload: Workload, memory_samples: int = 3) -> Dict[str, object]:
+    """Build one implementation's graph, time every query and sample peak memory."""
+    prepare, _ = SEARCHES[name]
+    with tempfile.TemporaryDirectory() as scratch:
+        began = time.perf_counter()
+        set_goal, query = prepare(workload, scratch)
+        build_seconds = time.perf_counter() - began
+
+        latencies = []
+        found = 0
+        goal = None
+        for start, query_goal in workload.queries:
+            if query_goal != goal:
+                goal = query_goal
+                set_goal(goal)
+            began = time.perf_counter()
+            result = query(start, goal)
+            latencies.append(time.perf_counter() - began)
+            path = result[0] if isinstance(result, tuple) else result
+            found += bool(path)
+
+        # Traced separately: tracemalloc slows every allocation down
+        peak = 0
+        for start, query_goal in workload.queries[:memory_samples]:
+            set_goal(query_goal)
+            tracemalloc.start()
+            query(start, query_goal)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    latencies = np.array(latencies)
+    p50, p99 = np.percentile(latencies, [50, 99]).tolist() if len(latencies) else (0.0, 0.0)
+    return {
+        "search": name,
+        "generator": workload.kind,
+        "nodes": len(workload.names),
+        "edges": workload.num_edges,
+        "queries": len(latencies),
+        "found": found,
+        "build_seconds": build_seconds,
+        "queries_per_second": len(latencies) / latencies.sum() if latencies.sum() else 0.0,
+        "p50_ms": p50 * 1000,
+        "p99_ms": p99 * 1000,
+        "peak_memory_kib": peak / 1024,
+    }
+
+
+def run_suite(sizes: List[int], generators: List[str], searches: List[str],
+              goals: int = 5, starts: int = 10, seed: int = 0,
+              log: Callable[[str], None] = lambda line: None) -> Dict[str, object]:
+    results = []
+    for kind in generators:
+        for edges in sizes:
+            workload = GENERATORS[kind](edges, seed)
+            workload.queries = pick_queries(workload, goals, starts, seed)
+            for name in searches:
+                runs_on = SEARCHES[name][1]
+                if runs_on is not None and kind not in runs_on:
+                    continue
+                result = run_search(name, workload)
+                results.append(result)
+                log(f"{kind:>10} {workload.num_edges:>10} {name:<46} "
+                    f"{result['p50_ms']:>9.3f} ms p50 {result['p99_ms']:>9.3f} ms p99")
+                gc.collect()
+    return {
+        "environment": {"python": platform.python_version(), "numpy": np.__version__,
+                        "machine": platform.machine()},
+        "settings": {"sizes": sizes, "generators": generators, "goals": goals,
+                     "starts": starts, "seed": seed},
+        "results": results,
+    }
+
+
+def regressions(report: Dict, baseline: Dict, tolerance: float = 0.25) -> List[str]:
+    """Runs whose p50 or p99 latency grew more than tolerance over the matching baseline run."""
+    before = {(r["search"], r["generator"], r["edges"]): r for r in baseline["results"]}
+    found = []
+    for result in report["results"]:
+        old = before.get((result["search"], result["generator"], result["edges"]))
+        if old is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if result[metric] > old[metric] * (1 + tolerance):
+                found.append(f"{result['search']} on {result['generator']} ({result['edges']} edges): "
+                             f"{metric} {old[metric]:.3f} -> {result[metric]:.3f}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--edges", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="target directed edge counts (1e7 needs several GiB per search)")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--searches", nargs="+", default=list(SEARCHES), choices=list(SEARCHES))
+    parser.add_argument("--goals", type=int, default=5)
+    parser.add_argument("--starts", type=int, default=10, help="queries per goal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write (default: stdout)")
+    parser.add_argument("--baseline", help="earlier JSON report to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    report = run_suite(args.edges, args.generators, args.searches, args.goals, args.starts,
+                       args.seed, log=lambda line: print(line, file=sys.stderr))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            slower = regressions(report, json.load(file), args.tolerance)
+        for line in slower:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import random
+import sys
+
+import pytest
+
+# The modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(params=range(30))
+def rng(request) -> random.Random:
+    """Seeded random.Random; a test that asks for it runs once per seed."""
+    return random.Random(request.param)
+
+
+@pytest.fixture
+def random_roads(rng):
+    """
+    Road generator shared by the graph tests: random_roads() returns
+    (city1, city2, cost) tuples over the cities N0, N1, ..., to be added
+    with add_road or add_edge. min_cost=0 allows free roads.
+    """
+    def roads(max_cities: int = 40, max_roads: int = 100, min_cost: int = 1, max_cost: int = 20):
+        names = [f"N{i}" for i in range(rng.randint(2, max_cities))]
+        return [(*rng.sample(names, 2), rng.randint(min_cost, max_cost))
+                for _ in range(rng.randint(1, max_roads))]
+    return roads
+
+
+@pytest.fixture
+def random_grid(rng):
+    """
+    Map generator shared by the grid tests: random_grid() returns
+    (grid, start, goal), grid being a list of rows with 1 for obstacles.
+    """
+    def grid(max_side: int = 14, max_density: float = 0.6):
+        rows, cols = rng.randint(1, max_side), rng.randint(1, max_side)
+        density = rng.random() * max_density
+        cells = [[1 if rng.random() < density else 0 for _ in range(cols)] for _ in range(rows)]
+        start = (rng.randrange(rows), rng.randrange(cols))
+        goal = (rng.randrange(rows), rng.randrange(cols))
+        return cells, start, goal
+    return grid
@@ -0,0 +1,42 @@
+import CityProy2
+from graphCore import dijkstra
+
+
+def build(rng, roads):
+    """
+    Graph with a consistent heuristic towards a random goal: the exact
+    distance, scaled down by a random factor.
+    Returns: (graph, start, goal, optimal cost from start, inf if unreachable)
+    """
+    graph = CityProy2.Graph()
+    for road in roads:
+        graph.add_edge(*road)
+    compact = graph.freeze()
+    start, goal = rng.choice(compact.names), rng.choice(compact.names)
+    to_goal, _ = dijkstra(compact, compact.index[goal])
+    scale = rng.choice([0, 0.5, 0.9, 1])
+    for city in graph.graph:
+        # Cities cut off from the goal get h = 0, which stays consistent
+        distance = float(to_goal[compact.index[city]])
+        graph.add_heuristic(city, distance * scale if distance != float("inf") else 0)
+    return graph, start, goal, float(to_goal[compact.index[start]])
+
+
+def test_without_deadline_the_route_is_optimal(rng, random_roads):
+    graph, start, goal, optimal = build(rng, random_roads(max_cities=120, max_roads=240))
+    path, cost, bound = CityProy2.anytime_astar(graph, start, goal)
+    if optimal == float("inf"):
+        assert (path, cost, bound) == (None, None, None)
+        return
+    assert cost == optimal and bound == 1.0
+    assert path[0] == start and path[-1] == goal
+    assert sum(graph.graph[a][b] for a, b in zip(path, path[1:])) == cost
+
+
+def test_deadline_route_is_within_its_bound(rng, random_roads):
+    graph, start, goal, optimal = build(rng, random_roads(max_cities=120, max_roads=240))
+    path, cost, bound = CityProy2.anytime_astar(graph, start, goal, time_budget=0.0002, weight=5)
+    if path is not None:
+        assert path[0] == start and path[-1] == goal
+        assert sum(graph.graph[a][b] for a, b in zip(path, path[1:])) == cost
+        assert cost <= bound * optimal + 1e-9
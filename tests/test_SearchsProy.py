@@ -0,0 +1,58 @@
+from SearchsProy import Graph, bfs, ida_star, level_bfs, sma_star, ucs
+from graphCore import bfs as compact_bfs
+from searchStats import SearchStats
+
+
+def build(roads) -> Graph:
+    """Directed graph: every road only leads from its first city to its second."""
+    graph = Graph()
+    for road in roads:
+        graph.add_edge(*road)
+    return graph
+
+
+def path_cost(graph: Graph, path):
+    return sum(min(cost for neighbor, cost in graph.graph[a] if neighbor == b)
+               for a, b in zip(path, path[1:]))
+
+
+def test_ida_star_and_sma_star_match_ucs(rng, random_roads):
+    graph = build(random_roads(max_cities=25, max_roads=80, max_cost=9))
+    cities = list(graph.graph)
+    for _ in range(3):
+        start, goal = rng.choice(cities), rng.choice(cities)
+        expected = ucs(graph, start, goal)[1]
+        for path, cost in (ida_star(graph, start, goal),
+                           sma_star(graph, start, goal, node_budget=10 ** 6)):
+            assert cost == expected
+            if path is not None:
+                assert path[0] == start and path[-1] == goal
+                assert path_cost(graph, path) == cost
+
+
+def test_sma_star_stays_within_budget(rng, random_roads):
+    graph = build(random_roads(max_cities=25, max_roads=80, max_cost=9))
+    cities = list(graph.graph)
+    start, goal = rng.choice(cities), rng.choice(cities)
+    budget = rng.randint(2, 30)
+    stats = SearchStats()
+    path, cost = sma_star(graph, start, goal, node_budget=budget, stats=stats)
+    assert stats.peak_nodes <= budget
+    if ucs(graph, start, goal)[0] is None:
+        assert path is None
+    if path is not None:
+        assert len(path) <= budget
+        assert path_cost(graph, path) == cost
+
+
+def test_level_bfs_matches_bfs(rng, random_roads):
+    graph = build(random_roads(max_cities=25, max_roads=80, max_cost=9))
+    cities = list(graph.graph)
+    for _ in range(3):
+        start, goal = rng.choice(cities), rng.choice(cities + ["missing"])
+        assert level_bfs(graph, start, goal) == bfs(graph, start, goal)
+    compact = graph.freeze()
+    if start in compact.index:
+        _, _, levels = level_bfs(compact, start, None, levels=True)
+        hops, _ = compact_bfs(compact, compact.index[start])
+        assert (levels == hops).all()
@@ -0,0 +1,52 @@
+import numpy as np
+
+import cityProy
+from heuresticsUCS import CityNetwork
+from landmarks import select_landmarks
+
+
+def build(roads):
+    graph, network = cityProy.CityGraph(), CityNetwork()
+    for road in roads:
+        graph.add_edge(*road)
+        network.add_road(*road)
+    return graph, network
+
+
+def test_alt_astar_is_exact_and_admissible(rng, random_roads):
+    graph, network = build(random_roads())
+    graph.build_landmarks(rng.randint(1, 6))
+    cities = list(graph.graph)
+    for _ in range(5):
+        start, target = rng.choice(cities), rng.choice(cities)
+        path, cost = cityProy.astar(graph, start, target)
+        assert (cost if path else 0) == network.uniform_cost_search(start, target)[1]
+    target = rng.choice(cities)
+    heuristic = graph.heuristic_to(target)
+    for city in cities:
+        path, cost = network.uniform_cost_search(city, target)
+        if path:
+            assert heuristic(city) <= cost
+
+
+def test_lazy_bound_is_the_triangle_inequality(rng, random_roads):
+    graph, _ = build(random_roads())
+    compact = graph.freeze()
+    _, distances = select_landmarks(compact, rng.randint(1, 6))
+    graph.build_landmarks(len(distances))
+    target = rng.choice(compact.names)
+    heuristic = graph.heuristic_to(target)
+    to_target = distances[:, compact.index[target]]
+    for city in compact.names:
+        at_city = distances[:, compact.index[city]]
+        known = np.isfinite(to_target) & np.isfinite(at_city)
+        bound = max(np.abs(to_target[known] - at_city[known]), default=0)
+        assert heuristic(city) == bound
+
+
+def test_landmarks_follow_map_changes():
+    graph, _ = build([("A", "B", 5), ("B", "C", 5)])
+    graph.build_landmarks(2)
+    assert cityProy.astar(graph, "A", "C")[1] == 10
+    graph.add_edge("A", "C", 3)
+    assert cityProy.astar(graph, "A", "C") == (["A", "C"], 3)
@@ -0,0 +1,68 @@
+import pytest
+
+from contractionHierarchy import ContractionHierarchy
+from heuresticsUCS import CityNetwork
+
+
+def build(roads) -> CityNetwork:
+    network = CityNetwork()
+    for road in roads:
+        network.add_road(*road)
+    return network
+
+
+def test_hierarchy_matches_uniform_cost_search(rng, random_roads):
+    network = build(random_roads())
+    network.preprocess()
+    cities = list(network.graph)
+    for _ in range(10):
+        start, goal = rng.choice(cities), rng.choice(cities)
+        path, total_cost = network.hierarchy_search(start, goal)
+        assert total_cost == network.uniform_cost_search(start, goal)[1]
+        if path:
+            assert path[0] == start and path[-1] == goal
+            assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == total_cost
+
+
+def test_hierarchy_round_trips_through_a_path_without_suffix(tmp_path):
+    roads = [("A", "B", 4), ("B", "C", 1), ("A", "C", 7), ("C", "D", 2)]
+    network = build(roads)
+    network.preprocess()
+    path = str(tmp_path / "hierarchy")
+    network.save_hierarchy(path)
+
+    other = build(roads)
+    assert other.load_hierarchy(path)
+    assert other.hierarchy_search("A", "D") == (["A", "B", "C", "D"], 7)
+
+
+def test_int_names_keep_their_type(tmp_path):
+    roads = [(1, 2, 3), (2, 3, 1), (3, 4, 4), (1, 4, 9)]
+    network = build(roads)
+    network.preprocess()
+    path = str(tmp_path / "hierarchy.npz")
+    network.save_hierarchy(path)
+    assert ContractionHierarchy.load(path).names == network.freeze().names
+
+    other = build(roads)
+    assert other.load_hierarchy(path)
+    assert other.hierarchy_search(1, 4) == ([1, 2, 3, 4], 8)
+    # Same roads under string names is a different graph
+    assert not build([(str(a), str(b), cost) for a, b, cost in roads]).load_hierarchy(path)
+
+
+def test_unsupported_names_are_not_saved(tmp_path):
+    network = build([((0, 0), (0, 1), 1)])
+    network.preprocess()
+    with pytest.raises(ValueError):
+        network.save_hierarchy(str(tmp_path / "hierarchy.npz"))
+
+
+def test_stale_hierarchy_falls_back_and_is_rejected(tmp_path):
+    network = build([("A", "B", 4), ("B", "C", 1)])
+    network.preprocess()
+    path = str(tmp_path / "hierarchy.npz")
+    network.save_hierarchy(path)
+    network.add_road("A", "C", 1)
+    assert network.hierarchy_search("A", "C") == (["A", "C"], 1)
+    assert not network.load_hierarchy(path)
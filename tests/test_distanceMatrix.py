@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+import pytest
+
+from heuresticsUCS import CityNetwork
+
+
+def shared_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")} \
+        if os.path.isdir("/dev/shm") else set()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_matrix_matches_uniform_cost_search(rng, random_roads, workers):
+    network = CityNetwork()
+    for road in random_roads(max_cities=20, max_roads=30):
+        network.add_road(*road)
+    # A separate island, so some pairs are unreachable
+    network.add_road("X", "Y", 4)
+    cities = list(network.graph)
+    origins = rng.sample(cities, min(5, len(cities))) + ["X", "missing"]
+    destinations = rng.sample(cities, min(6, len(cities))) + ["Y", "missing"]
+    before = shared_blocks()
+
+    matrix = network.distance_matrix(origins, destinations, workers=workers)
+    assert matrix.shape == (len(origins), len(destinations))
+    for row, origin in enumerate(origins):
+        for col, destination in enumerate(destinations):
+            if "missing" in (origin, destination):
+                assert matrix[row, col] == np.inf
+                continue
+            path, cost = network.uniform_cost_search(origin, destination)
+            assert matrix[row, col] == (cost if path else np.inf)
+    assert shared_blocks() == before
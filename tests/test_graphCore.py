@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from graphCore import (INF, CompactGraph, bidirectional_search, dijkstra, path_from_parents,
+                       shortest_path_tree)
+from heuresticsUCS import CityNetwork
+from searchFrontier import HeapFrontier, IndexedHeap
+
+
+def random_digraph(rng):
+    """Directed graph over ids, with its reversed copy."""
+    nodes = rng.randint(1, 30)
+    # One edge per (u, v) pair, so edge_cost() is the cost of the step
+    edges = {(rng.randrange(nodes), rng.randrange(nodes)): rng.randint(0, 9)
+             for _ in range(rng.randint(0, 90))}
+    rows, cols, costs = [u for u, _ in edges], [v for _, v in edges], list(edges.values())
+    names = list(range(nodes))
+    return (CompactGraph.from_edges(names, rows, cols, costs),
+            CompactGraph.from_edges(names, cols, rows, costs))
+
+
+@pytest.mark.parametrize("frontier", [HeapFrontier, IndexedHeap])
+def test_bidirectional_search_matches_dijkstra(rng, frontier):
+    graph, reverse = random_digraph(rng)
+    for _ in range(5):
+        source, target = rng.randrange(graph.num_nodes), rng.randrange(graph.num_nodes)
+        expected = dijkstra(graph, source)[0][target]
+        path, cost = bidirectional_search(graph, source, target, reverse=reverse,
+                                          frontier=frontier)
+        assert cost == expected
+        if expected == INF:
+            assert path == []
+        else:
+            assert path[0] == source and path[-1] == target
+            assert sum(graph.edge_cost(u, v) for u, v in zip(path, path[1:])) == cost
+
+
+def test_bidirectional_search_edge_cases():
+    graph = CompactGraph.from_edges(["a", "b", "c"], [0, 1], [1, 0], [0, 0])
+    assert bidirectional_search(graph, 2, 2) == ([2], 0)
+    assert bidirectional_search(graph, 0, 2) == ([], INF)
+    assert bidirectional_search(graph, 0, 1) == ([0, 1], 0)
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_edge_file_keeps_names_as_written(tmp_path):
+    path = write(tmp_path, "edges.csv", "7,8,1\n" + "8,7,1\n" * 3 + "007,X,2\nX,Y,3\n")
+    graph = CompactGraph.from_edge_file(path, chunk_size=8)
+    assert sorted(graph.names) == sorted(["7", "8", "007", "X", "Y"])
+
+
+def test_edge_file_headers(tmp_path):
+    graph = CompactGraph.from_edge_file(write(tmp_path, "a.csv", "source,target\n1,2\n2,3\n"))
+    assert graph.names == [1, 2, 3] and graph.num_edges == 4
+    graph = CompactGraph.from_edge_file(write(tmp_path, "b.csv", "src,dst,cost\n1,2,3.5\n"))
+    assert graph.names == [1, 2] and graph.weights.tolist() == [3.5, 3.5]
+    path = write(tmp_path, "c.csv", "source,target\na,b\n")
+    assert CompactGraph.from_edge_file(path, header=True).names == ["a", "b"]
+    assert CompactGraph.from_edge_file(write(tmp_path, "d.csv", "1,2\n3,4\n")).names == [1, 2, 3, 4]
+
+
+def test_edge_file_matches_add_road(rng, random_roads, tmp_path):
+    roads = random_roads()
+    network = CityNetwork()
+    for road in roads:
+        network.add_road(*road)
+    # Both directions of every road, with the cost add_road kept
+    lines = [f"{a}\t{b}\t{cost}\n" for a, neighbors in network.graph.items()
+             for b, cost in neighbors.items()]
+    path = write(tmp_path, "roads.tsv", "".join(lines))
+    graph = CompactGraph.from_edge_file(path, undirected=False,
+                                        chunk_size=rng.choice([16, 1 << 22]))
+    frozen = network.freeze()
+    for city in frozen.names:
+        expected = dijkstra(frozen, frozen.index[city])[0]
+        found = dijkstra(graph, graph.index[city])[0]
+        assert [found[graph.index[name]] for name in frozen.names] == expected.tolist()
+
+
+def test_snapshot_round_trip(tmp_path):
+    graph = CompactGraph.from_edge_file(write(tmp_path, "e.csv", "a,b,1\nb,c,2.5\n"))
+    graph.save(str(tmp_path / "graph.snap"))
+    loaded = CompactGraph.load(str(tmp_path / "graph.snap"))
+    assert loaded.names == graph.names
+    for name in ("offsets", "targets", "weights"):
+        assert np.array_equal(getattr(loaded, name), getattr(graph, name))
+
+
+def test_shortest_path_tree_stops_early_but_exactly(rng, random_roads):
+    network = CityNetwork()
+    for road in random_roads(max_cities=30, max_roads=45, max_cost=9):
+        network.add_road(*road)
+    graph = network.freeze()
+    source = rng.choice(graph.names)
+    full, _ = dijkstra(graph, graph.index[source])
+
+    targets = rng.sample(graph.names, min(3, len(graph.names)))
+    dist, parent = network.shortest_path_tree(source, targets=targets + ["missing"])
+    settled = np.isfinite(dist)
+    assert (dist[settled] == full[settled]).all()
+    for city in targets:
+        node = graph.index[city]
+        assert dist[node] == full[node]
+        if np.isfinite(dist[node]):
+            path = [graph.names[i] for i in path_from_parents(parent, node)]
+            assert path[0] == source and path[-1] == city
+            assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == dist[node]
+
+    radius = rng.randint(0, 20)
+    dist, _ = shortest_path_tree(graph, graph.index[source], max_cost=radius)
+    assert ((full <= radius) == np.isfinite(dist)).all()
+    with pytest.raises(KeyError):
+        network.shortest_path_tree("missing")
@@ -0,0 +1,66 @@
+import math
+
+import heuresticsAS
+import heuresticsUCS
+
+
+def write_positions(tmp_path, positions) -> str:
+    path = tmp_path / "positions.csv"
+    path.write_text("city,x,y\n" + "".join(f"{city},{x},{y}\n" for city, (x, y) in positions.items()))
+    return str(path)
+
+
+def positioned_network(rng, tmp_path, roads):
+    """
+    heuresticsAS network with random city positions, each road at least
+    as long as the heuristic says, plus the same roads in a UCS network.
+    """
+    cities = {city for city1, city2, _ in roads for city in (city1, city2)}
+    positions = {city: (rng.randint(0, 20), rng.randint(0, 20)) for city in sorted(cities)}
+    network = heuresticsAS.CityNetwork(write_positions(tmp_path, positions))
+    reference = heuresticsUCS.CityNetwork()
+    for city1, city2, cost in roads:
+        cost = max(cost, math.ceil(2 * network.heuristic(city1, city2)))
+        network.add_road(city1, city2, cost)
+        reference.add_road(city1, city2, cost)
+    return network, reference
+
+
+def test_bidirectional_astar_matches_ucs(rng, random_roads, tmp_path):
+    network, reference = positioned_network(rng, tmp_path, random_roads(min_cost=0))
+    cities = list(network.graph)
+    for _ in range(10):
+        start, goal = rng.choice(cities), rng.choice(cities)
+        path, cost = network.bidirectional_search(start, goal)
+        assert cost == reference.uniform_cost_search(start, goal)[1]
+        if path:
+            assert path[0] == start and path[-1] == goal
+            assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == cost
+
+
+def test_bidirectional_astar_edge_cases(tmp_path):
+    example = heuresticsAS.create_network()
+    positions = {city: tuple(example.coordinates[row])
+                 for city, row in example.position_index.items()}
+    network = heuresticsAS.CityNetwork(write_positions(tmp_path, {**positions, "X": (9, 9),
+                                                                  "Y": (9, 9)}))
+    for city, roads in example.graph.items():
+        for neighbor, cost in roads.items():
+            network.add_road(city, neighbor, cost)
+    assert network.bidirectional_search("A", "J")[1] == network.a_star_search("A", "J")[1]
+    assert network.bidirectional_search("D", "D") == (["D"], 0)
+    network.add_road("X", "Y", 0)
+    assert network.bidirectional_search("A", "X") == ([], 0)
+    assert network.bidirectional_search("X", "Y") == (["X", "Y"], 0)
+
+
+def test_heuristic_vectors_are_cached_per_goal():
+    network = heuresticsAS.CityNetwork(heuristic_capacity=2)
+    cities = list(network.position_index)[:4]
+    assert network.heuristic_to(cities[0]) is network.heuristic_to(cities[0])
+    for city in cities:
+        network.heuristic_to(city)
+    network.heuristic_to(cities[2])
+    assert list(network._heuristic_cache) == [cities[3], cities[2]]
+    (x1, y1), (x2, y2) = (network.coordinates[network.position_index[city]] for city in cities[:2])
+    assert network.heuristic(cities[0], cities[1]) == math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2) / 2
@@ -0,0 +1,64 @@
+import pytest
+
+from heuresticsGS import CityNetwork, create_network
+from heuresticsUCS import CityNetwork as UCSNetwork
+
+
+def build(roads) -> CityNetwork:
+    network = CityNetwork()
+    for road in roads:
+        network.add_road(*road)
+    return network
+
+
+def scanning_greedy(network: CityNetwork, start: str, goal: str):
+    """The greedy search before the roads were pre-sorted, as the reference."""
+    current, path, total_cost, visited = start, [start], 0, {start}
+    while current != goal:
+        best_cost, best = float("inf"), None
+        for neighbor, cost in network.graph[current].items():
+            if neighbor not in visited and cost < best_cost:
+                best_cost, best = cost, neighbor
+        if best is None:
+            return [], 0
+        current = best
+        path.append(current)
+        total_cost += best_cost
+        visited.add(current)
+    return path, total_cost
+
+
+def test_greedy_matches_the_scanning_search(rng, random_roads):
+    network = build(random_roads(max_cost=5))
+    cities = list(network.graph)
+    for _ in range(5):
+        start, goal = rng.choice(cities), rng.choice(cities)
+        expected = scanning_greedy(network, start, goal)
+        assert network.greedy_search(start, goal) == expected
+        assert network.greedy_search(start, goal, beam_width=1) == expected
+        # Sorted roads follow later changes
+        network.add_road(*random_roads(max_cost=5)[0])
+
+
+def test_wide_beams_find_every_reachable_goal(rng, random_roads):
+    roads = random_roads(max_cities=20, max_roads=30)
+    network, reference = build(roads), UCSNetwork()
+    for road in roads:
+        reference.add_road(*road)
+    cities = list(network.graph)
+    for _ in range(5):
+        start, goal = rng.choice(cities), rng.choice(cities)
+        path, cost = network.greedy_search(start, goal, beam_width=len(cities))
+        shortest, shortest_cost = reference.uniform_cost_search(start, goal)
+        assert bool(path) == bool(shortest)
+        if path:
+            assert path[0] == start and path[-1] == goal and len(set(path)) == len(path)
+            assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == cost >= shortest_cost
+
+
+def test_beam_search_edge_cases():
+    network = create_network()
+    assert network.greedy_search("A", "A", beam_width=3) == (["A"], 0)
+    assert network.greedy_search("A", "missing", beam_width=3) == ([], 0)
+    with pytest.raises(ValueError):
+        network.greedy_search("A", "J", beam_width=0)
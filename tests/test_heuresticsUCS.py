@@ -0,0 +1,83 @@
+import pytest
+
+from heuresticsUCS import CityNetwork, create_network
+from searchFrontier import HeapFrontier, IndexedHeap
+
+
+def build(roads) -> CityNetwork:
+    network = CityNetwork()
+    for road in roads:
+        network.add_road(*road)
+    return network
+
+
+def route_cost(network: CityNetwork, path) -> int:
+    return sum(network.graph[a][b] for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("frontier", [HeapFrontier, IndexedHeap])
+def test_bidirectional_search_matches_ucs(rng, random_roads, frontier):
+    # Free roads included, where ties between meeting points are most likely
+    network = build(random_roads(min_cost=0))
+    cities = list(network.graph)
+    for _ in range(10):
+        start, goal = rng.choice(cities), rng.choice(cities)
+        path, cost = network.bidirectional_search(start, goal, frontier)
+        assert cost == network.uniform_cost_search(start, goal)[1]
+        if path:
+            assert path[0] == start and path[-1] == goal
+            assert route_cost(network, path) == cost
+
+
+def test_bidirectional_search_edge_cases():
+    network = create_network()
+    assert network.bidirectional_search("A", "J") == network.uniform_cost_search("A", "J")
+    assert network.bidirectional_search("C", "C") == (["C"], 0)
+    network.add_road("X", "Y", 0)
+    assert network.bidirectional_search("A", "X") == ([], 0)
+    assert network.bidirectional_search("X", "Y") == (["X", "Y"], 0)
+    assert network.bidirectional_search("A", "missing") == ([], 0)
+
+
+def all_simple_costs(network: CityNetwork, start: str, goal: str):
+    """Costs of every loopless route, by brute force."""
+    costs = []
+
+    def extend(path, cost):
+        if path[-1] == goal:
+            costs.append(cost)
+            return
+        for neighbor, road in network.graph[path[-1]].items():
+            if neighbor not in path:
+                path.append(neighbor)
+                extend(path, cost + road)
+                path.pop()
+
+    extend([start], 0)
+    return sorted(costs)
+
+
+def test_k_shortest_paths_on_the_example():
+    routes = create_network().k_shortest_paths("A", "J", 3)
+    assert routes[0] == (["A", "C", "G", "J"], 10)
+    assert [cost for _, cost in routes] == [10, 12, 12]
+
+
+def test_k_shortest_paths_match_brute_force(rng, random_roads):
+    network = build(random_roads(max_cities=9, max_roads=14, max_cost=9))
+    start, goal = rng.sample(list(network.graph), 2)
+    k = rng.randint(1, 12)
+    routes = network.k_shortest_paths(start, goal, k)
+
+    assert [cost for _, cost in routes] == all_simple_costs(network, start, goal)[:k]
+    assert len({tuple(path) for path, _ in routes}) == len(routes)
+    for path, cost in routes:
+        assert path[0] == start and path[-1] == goal and len(set(path)) == len(path)
+        assert route_cost(network, path) == cost
+
+
+def test_k_shortest_paths_without_a_route():
+    network = build([("a", "b", 1), ("c", "d", 1)])
+    assert network.k_shortest_paths("a", "d", 3) == []
+    assert network.k_shortest_paths("a", "missing", 3) == []
+    assert network.k_shortest_paths("a", "b", 0) == []
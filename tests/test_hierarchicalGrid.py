@@ -0,0 +1,35 @@
+from hierarchicalGrid import HierarchicalGrid
+from treasureHunt import TreasureHunt
+
+
+def test_paths_are_valid_and_updates_match_a_rebuild(rng, random_grid):
+    grid, _, _ = random_grid(max_side=30, max_density=0.4)
+    hunt = TreasureHunt(grid)
+    rows, cols = hunt.rows, hunt.cols
+    size = rng.randint(2, 10)
+    hierarchy = HierarchicalGrid(hunt, size)
+    for _ in range(4):
+        free = [(x, y) for x in range(rows) for y in range(cols) if not hunt.blocked[x, y]]
+        for _ in range(4):
+            if not free:
+                break
+            start, goal = rng.choice(free), rng.choice(free)
+            shortest = hunt.find_treasure_bfs(*start, *goal)
+            path = hierarchy.find_path(*start, *goal)
+            assert (path is None) == (shortest is None)
+            if path is not None:
+                assert path[0] == start and path[-1] == goal
+                for (x1, y1), (x2, y2) in zip(path, path[1:]):
+                    assert abs(x1 - x2) + abs(y1 - y2) == 1 and not hunt.blocked[x2, y2]
+        x, y = rng.randrange(rows), rng.randrange(cols)
+        hierarchy.set_cell(x, y, not hunt.blocked[x, y])
+        rebuilt = HierarchicalGrid(TreasureHunt(hunt.blocked.copy()), size)
+        assert rebuilt.graph == hierarchy.graph and rebuilt.transitions == hierarchy.transitions
+
+
+def test_set_cell_leaves_the_callers_grid_alone():
+    grid = [[0, 0, 0], [0, 0, 0]]
+    hunt = TreasureHunt(grid)
+    HierarchicalGrid(hunt, 2).set_cell(0, 1, True)
+    assert grid == [[0, 0, 0], [0, 0, 0]] and hunt.blocked[0, 1]
+    assert hunt.find_treasure_bfs(0, 0, 0, 2) == [(0, 0), (1, 0), (1, 1), (1, 2), (0, 2)]
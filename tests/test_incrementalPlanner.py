@@ -0,0 +1,31 @@
+from heuresticsAS import create_network
+from heuresticsUCS import CityNetwork
+from incrementalPlanner import LifelongPlanner
+
+
+def test_repairs_match_a_fresh_search(rng, random_roads):
+    network = CityNetwork()
+    roads = random_roads(max_cities=30, max_roads=80)
+    for road in roads:
+        network.add_road(*road)
+    cities = list(network.graph)
+    start, goal = rng.choice(cities), rng.choice(cities)
+    planner = LifelongPlanner(network, start, goal)
+    for _ in range(10):
+        path, cost = planner.plan()
+        assert cost == network.uniform_cost_search(start, goal)[1]
+        if path:
+            assert path[0] == start and path[-1] == goal
+            assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == cost
+        # Raise or lower an existing road, or add a new one
+        city1, city2, _ = rng.choice(roads) if rng.random() < 0.7 else random_roads()[0]
+        planner.update_road(city1, city2, rng.randint(1, 40))
+
+
+def test_planner_with_the_network_heuristic():
+    network = create_network()
+    planner = network.incremental_planner("A", "J")
+    assert planner.plan() == network.a_star_search("A", "J")
+    planner.update_road("C", "G", 40)
+    assert planner.plan()[1] == network.a_star_search("A", "J")[1]
+    assert 0 < planner.expansions
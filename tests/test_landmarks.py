@@ -0,0 +1,27 @@
+import numpy as np
+
+from graphCore import CompactGraph, dijkstra
+from heuresticsUCS import CityNetwork
+from landmarks import select_landmarks
+
+
+def test_rows_are_the_landmark_distances(rng, random_roads):
+    network = CityNetwork()
+    for road in random_roads():
+        network.add_road(*road)
+    graph = network.freeze()
+    landmarks, distances = select_landmarks(graph, rng.randint(1, 6))
+    assert len(set(landmarks)) == len(landmarks) == len(distances)
+    for landmark, row in zip(landmarks, distances):
+        assert np.array_equal(row, dijkstra(graph, landmark)[0])
+
+
+def test_every_component_gets_a_landmark():
+    # Two components: a-b-c and d-e
+    graph = CompactGraph.from_adjacency({"a": {"b": 1}, "b": {"a": 1, "c": 5}, "c": {"b": 5},
+                                         "d": {"e": 2}, "e": {"d": 2}})
+    landmarks, distances = select_landmarks(graph, 2)
+    components = [{0, 1, 2}, {3, 4}]
+    assert [sum(node in nodes for node in landmarks) for nodes in components] == [1, 1]
+    assert select_landmarks(graph, 10)[1].shape == (5, 5)
+    assert select_landmarks(graph, 0)[1].shape == (0, 5)
@@ -0,0 +1,87 @@
+import pytest
+
+import CityProy2
+import heuresticsAS
+from routeCache import RouteCache
+
+
+def example_graph() -> CityProy2.Graph:
+    graph = CityProy2.Graph()
+    for road in [("A", "B", 4), ("A", "C", 2), ("B", "D", 3), ("C", "D", 1), ("D", "E", 5)]:
+        graph.add_edge(*road)
+    for city, distance in {"A": 7, "B": 5, "C": 4, "D": 3, "E": 0}.items():
+        graph.add_heuristic(city, distance)
+    return graph
+
+
+def test_hits_misses_and_prefix_answers():
+    network, cache = heuresticsAS.create_network(), RouteCache()
+    route = network.a_star_search("A", "J", cache=cache)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert network.a_star_search("A", "J", cache=cache) == route
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Every city on the A -> J route is answered from the same tree
+    path, _ = route
+    for length, city in enumerate(path[1:], start=2):
+        assert network.a_star_search("A", city, cache=cache) == network.a_star_search("A", city)
+        assert network.a_star_search("A", city, cache=cache)[0] == path[:length]
+    assert cache.misses == 1 and len(cache) == 1
+
+
+def test_failed_queries_are_remembered():
+    graph, cache = example_graph(), RouteCache()
+    graph.add_edge("X", "Y", 1)
+    graph.add_heuristic("X", 0)
+    graph.add_heuristic("Y", 0)
+    assert CityProy2.astar(graph, "A", "X", cache=cache) == (None, None)
+    assert CityProy2.astar(graph, "A", "X", cache=cache) == (None, None)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("change", [
+    lambda graph: graph.add_edge("B", "E", 1),
+    lambda graph: graph.add_heuristic("B", 1),
+])
+def test_graph_changes_invalidate(change):
+    graph, cache = example_graph(), RouteCache()
+    CityProy2.astar(graph, "A", "E", cache=cache)
+    change(graph)
+    assert CityProy2.astar(graph, "A", "E", cache=cache) == CityProy2.astar(graph, "A", "E")
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_add_road_invalidates():
+    network, cache = heuresticsAS.create_network(), RouteCache()
+    network.a_star_search("A", "J", cache=cache)
+    network.add_road("A", "J", 1)
+    assert network.a_star_search("A", "J", cache=cache) == (["A", "J"], 1)
+    assert cache.misses == 2
+
+
+def test_least_recently_used_start_is_evicted():
+    graph, cache = example_graph(), RouteCache(capacity=2)
+    for start in ("A", "B", "A", "C"):
+        CityProy2.astar(graph, start, "E", cache=cache)
+    assert len(cache) == 2
+    CityProy2.astar(graph, "A", "E", cache=cache)
+    CityProy2.astar(graph, "B", "E", cache=cache)
+    assert (cache.hits, cache.misses) == (2, 4)
+    with pytest.raises(ValueError):
+        RouteCache(capacity=0)
+
+
+def test_cached_answers_match_fresh_searches(rng, random_roads):
+    graph, cache = CityProy2.Graph(), RouteCache(capacity=rng.randint(1, 4))
+    roads = random_roads(max_cities=15, max_roads=30)
+    for road in roads:
+        graph.add_edge(*road)
+    for city in graph.graph:
+        graph.add_heuristic(city, 0)
+    cities = list(graph.graph)
+    for _ in range(30):
+        if rng.random() < 0.1:
+            city1, city2, _ = rng.choice(roads)
+            graph.add_edge(city1, city2, rng.randint(1, 20))
+        start, goal = rng.choice(cities), rng.choice(cities)
+        assert CityProy2.astar(graph, start, goal, cache=cache)[1] == \
+            CityProy2.astar(graph, start, goal)[1]
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from contractionHierarchy import ContractionHierarchy
+from heuresticsUCS import CityNetwork
+from routeService import RouteService, build_street_grid, load_test
+
+
+def shared_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")} \
+        if os.path.isdir("/dev/shm") else set()
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_routes_match_uniform_cost_search(rng, random_roads, workers):
+    network = CityNetwork()
+    for road in random_roads(max_cities=20, max_roads=30):
+        network.add_road(*road)
+    # A separate island, so some pairs are unreachable
+    network.add_road("X", "Y", 4)
+    cities = list(network.graph)
+    pairs = [(rng.choice(cities), rng.choice(cities)) for _ in range(20)]
+    pairs += [("X", cities[0]), ("X", "Y"), ("missing", "X")]
+    before = shared_blocks()
+    service = RouteService.from_network(network, workers=workers)
+
+    async def ask():
+        return await asyncio.gather(*(service.route(start, goal, algorithm)
+                                      for start, goal in pairs for algorithm in ("astar", "ucs")))
+    try:
+        answers = asyncio.run(ask())
+    finally:
+        service.close()
+    assert shared_blocks() == before
+    for (path, cost), (start, goal) in zip(answers, [pair for pair in pairs for _ in range(2)]):
+        expected_path, expected_cost = network.uniform_cost_search(start, goal) \
+            if start in network.graph else ([], 0)
+        assert cost == expected_cost and bool(path) == bool(expected_path)
+        if path:
+            assert path[0] == start and path[-1] == goal
+            assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == cost
+
+
+def test_socket_round_trip(tmp_path):
+    network = build_street_grid(6)
+    graph = network.freeze()
+    before = shared_blocks()
+    plain = RouteService.from_network(network, workers=1)
+    service = RouteService(plain.graph, plain.coordinates, ContractionHierarchy.build(graph),
+                           workers=1)
+    plain.close()
+    socket_path = str(tmp_path / "routes.sock")
+
+    async def run():
+        server = await service.start(socket_path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(socket_path)
+            writer.write(b'{"id": 1, "start": "J0_0", "goal": "J5_5", "algorithm": "ucs"}\n'
+                         b'{"id": 2, "start": "J0_0", "goal": "J5_5", "algorithm": "dfs"}\n'
+                         b'not json\n')
+            writer.write_eof()
+            replies = [json.loads(line) async for line in reader]
+            writer.close()
+            report = await load_test([("J0_0", "J5_5"), ("J1_2", "J4_0")] * 10, socket_path,
+                                     connections=2, in_flight=4)
+            await service.wait_connections()
+            return replies, report
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    try:
+        replies, report = asyncio.run(run())
+    finally:
+        service.close()
+    assert shared_blocks() == before
+    replies = sorted(replies, key=lambda reply: reply["id"] or 0)
+    cost = network.a_star_search("J0_0", "J5_5")[1]
+    assert "error" in replies[0] and replies[0]["id"] is None
+    assert replies[1] == {"id": 1, "path": replies[1]["path"], "cost": cost}
+    path = replies[1]["path"]
+    assert path[0] == "J0_0" and path[-1] == "J5_5"
+    assert sum(network.graph[a][b] for a, b in zip(path, path[1:])) == cost
+    assert "error" in replies[2] and replies[2]["id"] == 2
+    assert report["queries"] == 20 and report["errors"] == 0
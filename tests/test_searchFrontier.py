@@ -0,0 +1,80 @@
+import pytest
+
+from searchFrontier import HeapFrontier, IndexedHeap
+
+FRONTIERS = [HeapFrontier, IndexedHeap]
+
+
+@pytest.mark.parametrize("frontier", FRONTIERS)
+def test_pop_order_is_priority_then_key(frontier):
+    pq = frontier()
+    for key, priority in [("c", 2), ("a", 2), ("b", 1), ("d", 0)]:
+        assert pq.push(key, priority)
+    assert len(pq) == 4 and "a" in pq
+    assert pq.peek() == ("d", 0)
+    assert [pq.pop() for _ in range(4)] == [("d", 0), ("b", 1), ("a", 2), ("c", 2)]
+    assert len(pq) == 0 and "a" not in pq
+
+
+@pytest.mark.parametrize("frontier", FRONTIERS)
+def test_push_only_lowers_a_priority(frontier):
+    pq = frontier()
+    pq.push("a", 5)
+    pq.push("b", 3)
+    assert not pq.push("a", 7)
+    assert not pq.push("a", 5)
+    assert pq.push("a", 1)
+    assert len(pq) == 2 and pq.priority("a") == 1
+    assert pq.pop() == ("a", 1)
+    assert pq.pop() == ("b", 3)
+
+
+@pytest.mark.parametrize("frontier", FRONTIERS)
+def test_empty_frontier_raises(frontier):
+    pq = frontier()
+    with pytest.raises(IndexError):
+        pq.pop()
+    with pytest.raises(IndexError):
+        pq.peek()
+    pq.push("a", 1)
+    pq.push("a", 0)
+    pq.pop()
+    # The superseded entry of "a" must not come back
+    with pytest.raises(IndexError):
+        pq.pop()
+
+
+def test_indexed_heap_update_and_remove():
+    pq = IndexedHeap()
+    for key, priority in [("a", 1), ("b", 2), ("c", 3), ("d", 4)]:
+        pq.push(key, priority)
+    pq.update("a", 10)
+    pq.update("d", 0)
+    pq.update("e", 2.5)
+    pq.remove("b")
+    pq.remove("missing")
+    assert "b" not in pq and len(pq) == 4
+    assert [pq.pop() for _ in range(4)] == [("d", 0), ("e", 2.5), ("c", 3), ("a", 10)]
+
+
+@pytest.mark.parametrize("frontier", FRONTIERS)
+def test_random_operations_match_a_sorted_model(frontier, rng):
+    pq, model = frontier(), {}
+    for _ in range(300):
+        if model and rng.random() < 0.3:
+            best = min((priority, key) for key, priority in model.items())
+            assert pq.pop() == (best[1], best[0])
+            del model[best[1]]
+            continue
+        key, priority = rng.randrange(40), rng.randint(0, 50)
+        changed = key not in model or priority < model[key]
+        assert pq.push(key, priority) == changed
+        if changed:
+            model[key] = priority
+        if frontier is IndexedHeap and model and rng.random() < 0.1:
+            key = rng.choice(list(model))
+            pq.remove(key)
+            del model[key]
+        assert len(pq) == len(model)
+    assert sorted((priority, key) for key, priority in model.items()) == \
+        [(priority, key) for key, priority in (pq.pop() for _ in range(len(model)))]
@@ -0,0 +1,53 @@
+import pytest
+
+import SearchsProy
+from heuresticsUCS import CityNetwork
+from searchFrontier import HeapFrontier, IndexedHeap
+from searchStats import SearchStats
+
+
+def small_network() -> CityNetwork:
+    """A-C is cheaper through B, so C is pushed twice and its first entry goes stale."""
+    network = CityNetwork()
+    for road in [("A", "B", 1), ("A", "C", 4), ("B", "C", 1), ("C", "D", 1), ("D", "E", 5)]:
+        network.add_road(*road)
+    return network
+
+
+@pytest.mark.parametrize("frontier, stale_skips", [(HeapFrontier, 1), (IndexedHeap, 0)])
+def test_counts_on_a_small_graph(frontier, stale_skips):
+    stats = SearchStats()
+    path, cost = small_network().uniform_cost_search("A", "E", frontier, stats)
+    assert (path, cost) == (["A", "B", "C", "D", "E"], 8)
+    # A, B, C and D are expanded; pushes: A, B, C, C again from B, D, E
+    assert stats.expansions == 4
+    assert stats.generated == 6
+    assert stats.peak_frontier == 2
+    assert stats.stale_skips == stale_skips
+    exported = stats.as_dict()
+    assert "peak_nodes" not in exported
+    assert set(exported) >= {"expansions", "generated", "peak_frontier", "stale_skips",
+                             "search_seconds", "path_seconds"}
+
+
+def test_counts_add_up_across_searches():
+    network, stats = small_network(), SearchStats()
+    network.uniform_cost_search("A", "E", stats=stats)
+    network.uniform_cost_search("A", "E", stats=stats)
+    assert (stats.expansions, stats.generated) == (8, 12)
+
+
+@pytest.mark.parametrize("search, expansions, peak_nodes", [
+    # Passes with bounds 0, 1, 2 and 3; the deepest path held is A, B, C
+    (SearchsProy.ida_star, 9, 3),
+    # Tree nodes, not cities: C is stored once under A and once under B
+    (SearchsProy.sma_star, 3, 5),
+])
+def test_memory_bounded_searches_report_peak_nodes(search, expansions, peak_nodes):
+    graph = SearchsProy.Graph()
+    for road in [("A", "B", 1), ("A", "C", 4), ("B", "C", 1), ("C", "D", 1)]:
+        graph.add_edge(*road)
+    stats = SearchStats()
+    assert search(graph, "A", "D", stats=stats) == (["A", "B", "C", "D"], 3)
+    assert (stats.expansions, stats.peak_nodes) == (expansions, peak_nodes)
+    assert "generated" not in stats.as_dict()
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+
+import searchSuite
+
+
+@pytest.mark.parametrize("kind", list(searchSuite.GENERATORS))
+def test_every_search_runs_on_a_small_workload(kind):
+    report = searchSuite.run_suite([300], [kind], list(searchSuite.SEARCHES), goals=2, starts=3)
+    json.dumps(report)
+    assert all(result["queries"] == 6 for result in report["results"])
+    # Greedy and beam search give up at dead ends; every other search is complete
+    found = {result["search"]: result["found"] for result in report["results"]
+             if not result["search"].startswith("heuresticsGS.")}
+    assert set(found.values()) == {found["heuresticsUCS.CityNetwork.uniform_cost_search"]}
+
+
+def test_workloads_are_reproducible():
+    for make in searchSuite.GENERATORS.values():
+        first, second = make(500, seed=3), make(500, seed=3)
+        assert first.names == second.names
+        assert (first.roads == second.roads).all() and (first.costs == second.costs).all()
+
+
+def test_regressions_compare_matching_runs():
+    run = {"search": "s", "generator": "grid", "edges": 10, "p50_ms": 1.0, "p99_ms": 2.0}
+    baseline = {"results": [run]}
+    assert searchSuite.regressions({"results": [dict(run, p50_ms=1.2)]}, baseline) == []
+    slower = searchSuite.regressions({"results": [dict(run, p99_ms=3.0)]}, baseline)
+    assert len(slower) == 1 and "p99_ms" in slower[0]
+    assert searchSuite.regressions({"results": [dict(run, edges=20, p50_ms=9.0)]}, baseline) == []
@@ -0,0 +1,146 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from searchBench import build_cave_grid, build_corridor_grid, list_grid_bfs
+from treasureHunt import TreasureHunt, load_grid, save_packed_grid
+
+
+def test_bfs_matches_a_queue_bfs(random_grid):
+    for _ in range(5):
+        grid, start, goal = random_grid()
+        hunt = TreasureHunt(grid)
+        path = hunt.find_treasure_bfs(*start, *goal)
+        if hunt.is_valid_move(*start) and hunt.is_valid_move(*goal):
+            assert path == list_grid_bfs(grid, start, goal)
+        else:
+            assert path is None
+
+
+@pytest.mark.parametrize("build", [build_cave_grid, build_corridor_grid])
+@pytest.mark.parametrize("vector_frontier", [0, 4, TreasureHunt.VECTOR_FRONTIER])
+def test_bfs_modes_match_queue_order(monkeypatch, build, vector_frontier):
+    # 0: NumPy for every frontier, 4: both kinds mixed, default: mostly cell by cell
+    monkeypatch.setattr(TreasureHunt, "VECTOR_FRONTIER", vector_frontier)
+    cells = build(41)
+    goal = (40, 40)
+    assert TreasureHunt(cells).find_treasure_bfs(0, 0, *goal) == \
+        list_grid_bfs(cells.tolist(), (0, 0), goal)
+
+
+def test_marker_cells_are_free():
+    hunt = TreasureHunt([[0, 1, "T"], [0, 0, 0]])
+    assert hunt.find_treasure_bfs(0, 0, 0, 2) == [(0, 0), (1, 0), (1, 1), (1, 2), (0, 2)]
+    assert hunt.find_treasure_bfs(0, 0, 0, 1) is None
+
+
+def recursive_dfs(grid, start, goal):
+    """The recursive DFS find_treasure_dfs replaced, as the reference order."""
+    rows, cols = len(grid), len(grid[0])
+    visited, path = set(), []
+
+    def dfs(x, y):
+        if not (0 <= x < rows and 0 <= y < cols) or grid[x][y] == 1 or (x, y) in visited:
+            return False
+        visited.add((x, y))
+        path.append((x, y))
+        if (x, y) == goal:
+            return True
+        for dx, dy in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
+            if dfs(x + dx, y + dy):
+                return True
+        path.pop()
+        return False
+
+    return path if dfs(*start) else None
+
+
+def test_dfs_matches_the_recursive_order(random_grid):
+    for _ in range(5):
+        grid, start, goal = random_grid()
+        assert TreasureHunt(grid).find_treasure_dfs(*start, *goal) == recursive_dfs(grid, start, goal)
+
+
+def test_dfs_follows_corridors_past_the_recursion_limit():
+    side = 201
+    path = TreasureHunt(build_corridor_grid(side)).find_treasure_dfs(0, 0, side - 1, side - 1)
+    assert len(path) > 10000
+    assert path[0] == (0, 0) and path[-1] == (side - 1, side - 1)
+
+
+def assert_valid_path(grid, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1 and grid[x2][y2] != 1
+
+
+@pytest.mark.parametrize("search", ["find_treasure_astar", "find_treasure_jps"])
+def test_astar_and_jps_find_shortest_paths(random_grid, search):
+    for _ in range(5):
+        grid, start, goal = random_grid()
+        hunt = TreasureHunt(grid)
+        shortest = hunt.find_treasure_bfs(*start, *goal)
+        path = getattr(hunt, search)(*start, *goal)
+        if shortest is None:
+            assert path is None
+        else:
+            assert len(path) == len(shortest)
+            assert_valid_path(grid, path, start, goal)
+
+
+@pytest.mark.parametrize("vector_frontier", [0, TreasureHunt.VECTOR_FRONTIER])
+@pytest.mark.parametrize("with_regions", [False, True])
+def test_distance_field_matches_a_queue(monkeypatch, rng, random_grid, vector_frontier,
+                                        with_regions):
+    monkeypatch.setattr(TreasureHunt, "VECTOR_FRONTIER", vector_frontier)
+    grid, _, _ = random_grid()
+    hunt = TreasureHunt(grid)
+    free = [(x, y) for x in range(hunt.rows) for y in range(hunt.cols) if grid[x][y] != 1]
+    if not free:
+        return
+    sources = [rng.choice(free) for _ in range(rng.randint(1, 4))]
+    regions = None
+    if with_regions:
+        # Vertical bands of random width
+        width = rng.randint(1, 5)
+        regions = np.tile(np.arange(hunt.cols) // width, (hunt.rows, 1))
+    distance, label = hunt.distance_field(sources, regions)
+
+    expected = np.full((hunt.rows, hunt.cols), -1)
+    owner = np.full((hunt.rows, hunt.cols), -1)
+    queue = deque()
+    for index, source in enumerate(sources):
+        if expected[source] < 0:
+            expected[source], owner[source] = 0, index
+            queue.append(source)
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in hunt.directions:
+            cell = (x + dx, y + dy)
+            if (hunt.is_valid_move(*cell) and expected[cell] < 0
+                    and (regions is None or regions[cell] == regions[x, y])):
+                expected[cell], owner[cell] = expected[x, y] + 1, owner[x, y]
+                queue.append(cell)
+    assert distance.dtype == label.dtype == np.int32
+    assert (distance == expected).all() and (label == owner).all()
+
+
+def test_distance_field_rejects_blocked_sources():
+    with pytest.raises(ValueError):
+        TreasureHunt([[0, 1]]).distance_field([(0, 1)])
+
+
+def test_grid_files_load_back(tmp_path):
+    cells = build_cave_grid(37)
+    np.save(tmp_path / "cave.npy", cells)
+    mapped = load_grid(str(tmp_path / "cave.npy"))
+    assert isinstance(mapped, np.memmap) and (mapped == cells).all()
+
+    save_packed_grid(str(tmp_path / "cave.bits"), cells)
+    unpacked = load_grid(str(tmp_path / "cave.bits"), shape=cells.shape)
+    assert unpacked.dtype == bool and (unpacked == (cells == 1)).all()
+    assert TreasureHunt(unpacked).find_treasure_bfs(0, 0, 36, 36) == \
+        TreasureHunt(cells).find_treasure_bfs(0, 0, 36, 36)
+    with pytest.raises(ValueError):
+        load_grid(str(tmp_path / "cave.bits"))
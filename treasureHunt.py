@@ -1,68 +1,454 @@
-from collections import deque
-from typing import List, Tuple, Set, Optional
+from typing import List, Tuple, Set, Optional, Union
+
+import numpy as np
+
+from graphCore import INF, NO_PARENT, path_from_parents
+from searchFrontier import HeapFrontier
+
+def obstacle_mask(grid: Union[List[List[int]], np.ndarray]) -> np.ndarray:
+    """Bool array that is True on every obstacle (cell value 1) of grid."""
+    cells = np.asarray(grid)
+    if cells.dtype == bool:
+        return cells
+    if cells.dtype.kind in "iuf":
+        return cells == 1
+    # Mixed cells such as 'T' markers: compare one by one
+    return np.array([[cell == 1 for cell in row] for row in grid], dtype=bool)
+
+def load_grid(path: str, shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Memory-map a map file instead of parsing it. A .npy file holds a 2-D
+    array (bool, or ints with 1 for obstacles) and is mapped read-only as
+    is. Any other file is read as packed bits, one bit per cell with 1 for
+    obstacles, each row padded to whole bytes (see save_packed_grid), and
+    needs shape=(rows, cols). Packed files are only mapped while they are
+    read: the result is an ordinary bool array, one byte per cell (8 times
+    the file size), since TreasureHunt keeps its obstacle mask in memory
+    as a bool array anyway. Use .npy for maps that must stay on disk.
+    """
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    if shape is None:
+        raise ValueError("shape=(rows, cols) is required for packed-bit grids")
+    rows, cols = shape
+    packed = np.memmap(path, dtype=np.uint8, mode="r", shape=(rows, (cols + 7) // 8))
+    return np.unpackbits(packed, axis=1, count=cols).view(bool)
+
+def save_packed_grid(path: str, grid: Union[List[List[int]], np.ndarray]):
+    """Write grid as packed bits (1 for obstacles) in the layout load_grid() reads."""
+    np.packbits(obstacle_mask(grid), axis=1).tofile(path)
 
 class TreasureHunt:
-    def __init__(self, grid: List[List[int]]):
+    # Frontiers with at least this many cells are expanded with NumPy
+    VECTOR_FRONTIER = 128
+
+    def __init__(self, grid: Union[List[List[int]], np.ndarray]):
         self.grid = grid
-        self.rows = len(grid)
-        self.cols = len(grid[0])
+        # True where the cell is an obstacle
+        self.blocked = obstacle_mask(grid)
+        self.rows, self.cols = self.blocked.shape
         self.directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+        # Free-cell bytes and vertical jump tables, built on the first JPS query
+        self._jump_tables: Optional[Tuple[bytes, memoryview, memoryview]] = None
+
+    def set_cell(self, x: int, y: int, obstacle: bool):
+        """
+        Place or clear an obstacle. Searches and printing read self.blocked;
+        self.grid keeps the map as it was given.
+        """
+        if self.blocked is self.grid or not self.blocked.flags.owndata:
+            # Never write into the caller's array or a read-only mapping
+            self.blocked = self.blocked.copy()
+        self.blocked[x, y] = obstacle
+        self._jump_tables = None
 
     def is_valid_move(self, x: int, y: int) -> bool:
         return (0 <= x < self.rows and 
                 0 <= y < self.cols and 
-                self.grid[x][y] != 1)
+                not self.blocked[x, y])
 
     def find_treasure_bfs(self, start_x: int, start_y: int, 
+                         treasure_x: int, treasure_y: int,
+                         stats=None) -> Optional[List[Tuple[int, int]]]:
+        """
+        Breadth-first search run one frontier at a time over whole arrays.
+        Cells are discovered in the same order as a FIFO queue expanding
+        self.directions in turn, so the path is the one the queue would find.
+        stats is an optional SearchStats; the phases are "setup", "search"
+        and "path".
+        """
+        if not self.is_valid_move(start_x, start_y):
+            return None
+        if not self.is_valid_move(treasure_x, treasure_y):
+            return None
+
+        if stats is not None:
+            stats.start()
+        cols = self.cols
+        start = start_x * cols + start_y
+        treasure = treasure_x * cols + treasure_y
+        visited = np.zeros(self.rows * cols, dtype=bool)
+        parent = np.full(self.rows * cols, NO_PARENT, dtype=np.int32)
+        # Small frontiers go through plain loops over these views
+        free, seen, parents = self._free_cells(), memoryview(visited), memoryview(parent)
+        visited[start] = True
+        frontier = [start]
+        if stats is not None:
+            stats.lap("setup")
+
+        while len(frontier) and not seen[treasure]:
+            if len(frontier) < self.VECTOR_FRONTIER:
+                frontier, _ = self._scalar_levels(frontier, free, seen, parents,
+                                                  target=treasure, stats=stats)
+                continue
+            expanded = len(frontier)
+            new_frontier, new_parents = self._next_frontier(
+                np.asarray(frontier, dtype=np.int64), visited)
+            parent[new_frontier] = new_parents
+            visited[new_frontier] = True
+            frontier = new_frontier
+            if stats is not None:
+                stats.expanded(len(frontier), expanded)
+
+        if stats is not None:
+            stats.lap("search")
+        if not visited[treasure]:
+            return None
+        path = [divmod(cell, cols) for cell in path_from_parents(parent, treasure)]
+        if stats is not None:
+            stats.lap("path")
+        return path
+
+    def _free_cells(self) -> bytes:
+        """One byte per flat cell id, nonzero where the cell is free."""
+        return (~self.blocked).tobytes()
+
+    def _scalar_levels(self, frontier: Union[List[int], np.ndarray], free: bytes, seen: memoryview,
+                       parents: Optional[memoryview] = None,
+                       distances: Optional[memoryview] = None,
+                       labels: Optional[memoryview] = None,
+                       regions: Optional[memoryview] = None, target: int = -1,
+                       depth: int = 0, stats=None) -> Tuple[List[int], int]:
+        """
+        Expand BFS levels one cell at a time, in the same order as
+        _next_frontier(), for as long as the frontier stays smaller than
+        VECTOR_FRONTIER: on corridor maps most frontiers hold a cell or two,
+        where NumPy's per-call cost would dominate. New cells are marked in
+        seen and written to whichever of parents, distances and labels are
+        given. Stops early once target is seen.
+        Returns: (frontier, its depth), depth counting on from the one given
+        """
+        if isinstance(frontier, np.ndarray):
+            frontier = frontier.tolist()
+        cols, size = self.cols, self.rows * self.cols
+        # A step stays on the map when the column does and the flat id is in range
+        steps = [(dx * cols + dy, dy) for dx, dy in self.directions]
+        while (frontier and len(frontier) < self.VECTOR_FRONTIER
+               and not (target >= 0 and seen[target])):
+            depth += 1
+            level = []
+            for source in frontier:
+                y = source % cols
+                for step, dy in steps:
+                    cell = source + step
+                    if (0 <= cell < size and 0 <= y + dy < cols and free[cell] and not seen[cell]
+                            and (regions is None or regions[cell] == regions[source])):
+                        seen[cell] = True
+                        level.append(cell)
+                        if parents is not None:
+                            parents[cell] = source
+                        if distances is not None:
+                            distances[cell] = depth
+                            labels[cell] = labels[source]
+            if stats is not None:
+                stats.expanded(len(level), len(frontier))
+            frontier = level
+        return frontier, depth
+
+    def _next_frontier(self, frontier: np.ndarray, visited: np.ndarray,
+                       regions: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Free unvisited cells next to a frontier of flat cell ids, in the order
+        a FIFO queue expanding self.directions would discover them. With
+        flat regions ids, steps into a different region are not taken.
+        Returns: (new frontier, the frontier cell each one was reached from)
+        """
+        cols = self.cols
+        step_x = np.array([dx for dx, _ in self.directions])
+        step_y = np.array([dy for _, dy in self.directions])
+        # One row per frontier cell, one column per direction, in queue order
+        next_x = (frontier // cols)[:, None] + step_x
+        next_y = (frontier % cols)[:, None] + step_y
+        inside = (next_x >= 0) & (next_x < self.rows) & (next_y >= 0) & (next_y < cols)
+        cells = (next_x * cols + next_y)[inside]
+        sources = np.broadcast_to(frontier[:, None], inside.shape)[inside]
+        fresh = ~self.blocked.ravel()[cells] & ~visited[cells]
+        if regions is not None:
+            fresh &= regions[cells] == regions[sources]
+        cells, sources = cells[fresh], sources[fresh]
+        # A cell reached from several frontier cells keeps the first one
+        _, first = np.unique(cells, return_index=True)
+        first.sort()
+        return cells[first], sources[first]
+
+    def distance_field(self, sources: List[Tuple[int, int]],
+                       regions: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        One multi-source BFS from all sources at once: the number of steps
+        from every cell to its nearest source, and which source that is.
+        Equally near sources are settled in the order they are listed.
+        regions is an optional int array shaped like the grid; the search
+        then never steps between cells of different regions.
+        Returns: (distance, label) int32 arrays shaped like the grid, label
+        being the index into sources; both are -1 where no source reaches
+        """
+        rows, cols = self.rows, self.cols
+        distance = np.full(rows * cols, -1, dtype=np.int32)
+        label = np.full(rows * cols, -1, dtype=np.int32)
+        visited = np.zeros(rows * cols, dtype=bool)
+        seeds = []
+        for index, (x, y) in enumerate(sources):
+            if not self.is_valid_move(x, y):
+                raise ValueError(f"source {(x, y)} is not a free cell")
+            cell = x * cols + y
+            if not visited[cell]:
+                visited[cell] = True
+                distance[cell] = 0
+                label[cell] = index
+                seeds.append(cell)
+
+        region_view = None
+        if regions is not None:
+            regions = np.ascontiguousarray(regions).ravel()
+            region_view = memoryview(regions)
+        free, seen = self._free_cells(), memoryview(visited)
+        distances, labels = memoryview(distance), memoryview(label)
+        frontier = seeds
+        steps = 0
+        while len(frontier):
+            if len(frontier) < self.VECTOR_FRONTIER:
+                frontier, steps = self._scalar_levels(frontier, free, seen, distances=distances,
+                                                      labels=labels, regions=region_view,
+                                                      depth=steps)
+                continue
+            steps += 1
+            frontier, reached_from = self._next_frontier(
+                np.asarray(frontier, dtype=np.int64), visited, regions)
+            visited[frontier] = True
+            distance[frontier] = steps
+            label[frontier] = label[reached_from]
+        return distance.reshape(rows, cols), label.reshape(rows, cols)
+
+    def find_treasure_dfs(self, start_x: int, start_y: int,
                          treasure_x: int, treasure_y: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Depth-first search with an explicit stack, trying self.directions in
+        order at every cell. The stack holds the current path, so there is no
+        recursion limit on long corridors.
+        """
         if not self.is_valid_move(start_x, start_y):
             return None
 
-        queue = deque([(start_x, start_y)])
-        visited = {(start_x, start_y)}
-        parent = {(start_x, start_y): None}
+        rows, cols = self.rows, self.cols
+        # One byte per cell: plain indexing is cheaper than NumPy scalars here
+        free = (~self.blocked).tobytes()
+        visited = bytearray(rows * cols)
+        visited[start_x * cols + start_y] = 1
+        final_path = [(start_x, start_y)]
+        # Index of the next direction to try from each cell on the path
+        next_direction = [0]
         
-        while queue:
-            current_x, current_y = queue.popleft()
+        while final_path:
+            x, y = final_path[-1]
+            if (x, y) == (treasure_x, treasure_y):
+                return final_path
             
-            if (current_x, current_y) == (treasure_x, treasure_y):
-                return self._reconstruct_path(parent, (treasure_x, treasure_y))
+            direction = next_direction[-1]
+            if direction == len(self.directions):
+                # Dead end: backtrack
+                final_path.pop()
+                next_direction.pop()
+                continue
+            next_direction[-1] = direction + 1
             
-            for dx, dy in self.directions:
-                next_x, next_y = current_x + dx, current_y + dy
-                
-                if (self.is_valid_move(next_x, next_y) and 
-                    (next_x, next_y) not in visited):
-                    queue.append((next_x, next_y))
-                    visited.add((next_x, next_y))
-                    parent[(next_x, next_y)] = (current_x, current_y)
+            dx, dy = self.directions[direction]
+            next_x, next_y = x + dx, y + dy
+            if 0 <= next_x < rows and 0 <= next_y < cols:
+                cell = next_x * cols + next_y
+                if free[cell] and not visited[cell]:
+                    visited[cell] = 1
+                    final_path.append((next_x, next_y))
+                    next_direction.append(0)
         
         return None
 
-    def find_treasure_dfs(self, start_x: int, start_y: int,
-                         treasure_x: int, treasure_y: int) -> Optional[List[Tuple[int, int]]]:
-        visited = set()
-        final_path = []
-        
-        def dfs(x: int, y: int) -> bool:
-            if not self.is_valid_move(x, y) or (x, y) in visited:
-                return False
-            
-            visited.add((x, y))
-            final_path.append((x, y))
-            
-            if (x, y) == (treasure_x, treasure_y):
-                return True
-            
+    def find_treasure_astar(self, start_x: int, start_y: int,
+                            treasure_x: int, treasure_y: int,
+                            frontier=HeapFrontier) -> Optional[List[Tuple[int, int]]]:
+        """
+        A* with the Manhattan distance, which is exact on an open 4-connected
+        grid. Among equal f values the cell closest to the treasure is taken
+        first, so open stretches are crossed without widening the search.
+        frontier is the priority queue class (HeapFrontier or IndexedHeap).
+        """
+        if not self.is_valid_move(start_x, start_y):
+            return None
+        if not self.is_valid_move(treasure_x, treasure_y):
+            return None
+
+        rows, cols = self.rows, self.cols
+        free = (~self.blocked).tobytes()
+        treasure = (treasure_x, treasure_y)
+        start_h = abs(treasure_x - start_x) + abs(treasure_y - start_y)
+        pq = frontier()
+        pq.push((start_x, start_y), (start_h, start_h))
+        g_scores = {(start_x, start_y): 0}
+        parent = {(start_x, start_y): None}
+
+        while pq:
+            current, _ = pq.pop()
+            if current == treasure:
+                return self._reconstruct_path(parent, treasure)
+
+            x, y = current
+            new_g = g_scores[current] + 1
             for dx, dy in self.directions:
                 next_x, next_y = x + dx, y + dy
-                if dfs(next_x, next_y):
-                    return True
-            
-            final_path.pop()
-            return False
-        
-        return final_path if dfs(start_x, start_y) else None
+                if not (0 <= next_x < rows and 0 <= next_y < cols and free[next_x * cols + next_y]):
+                    continue
+                neighbor = (next_x, next_y)
+                if new_g < g_scores.get(neighbor, INF):
+                    g_scores[neighbor] = new_g
+                    parent[neighbor] = current
+                    h = abs(treasure_x - next_x) + abs(treasure_y - next_y)
+                    pq.push(neighbor, (new_g + h, h))
+
+        return None
+
+    def _jump_data(self) -> Tuple[bytes, memoryview, memoryview]:
+        """
+        Free-cell bytes plus, for every cell, the row where a vertical jump
+        from it stops going up and going down: the first later row that is
+        an obstacle or has a forced neighbor (-1 / rows past the border).
+        A cell reached moving vertically has a forced neighbor when a side
+        cell is free but the side cell of the row it came from is not, so
+        the path has to turn there.
+        """
+        if self._jump_tables is None:
+            rows, cols = self.rows, self.cols
+            free = ~self.blocked
+            walled = np.pad(self.blocked, 1, constant_values=True)
+            left_free, right_free = ~walled[1:-1, :cols], ~walled[1:-1, 2:]
+            row_ids = np.arange(rows)[:, None]
+            tables = []
+            for dx in (-1, 1):
+                # Row each cell is entered from when moving in direction dx
+                behind = walled[1 - dx:1 - dx + rows]
+                forced = (left_free & behind[:, :cols]) | (right_free & behind[:, 2:])
+                stops = self.blocked | (free & forced)
+                if dx == 1:
+                    # First stop at or below each row, shifted to strictly below
+                    first = np.minimum.accumulate(np.where(stops, row_ids, rows)[::-1], axis=0)[::-1]
+                    table = np.vstack([first[1:], np.full((1, cols), rows)])
+                else:
+                    first = np.maximum.accumulate(np.where(stops, row_ids, -1), axis=0)
+                    table = np.vstack([np.full((1, cols), -1), first[:-1]])
+                # memoryview indexing hands back plain ints, far cheaper than NumPy scalars
+                tables.append(memoryview(np.ascontiguousarray(table, dtype=np.int32)).cast("B").cast("i"))
+            self._jump_tables = (free.tobytes(), tables[0], tables[1])
+        return self._jump_tables
+
+    def find_treasure_jps(self, start_x: int, start_y: int,
+                          treasure_x: int, treasure_y: int,
+                          frontier=HeapFrontier) -> Optional[List[Tuple[int, int]]]:
+        """
+        Jump Point Search for the 4-connected grid. Shortest paths are taken
+        to move horizontally before vertically whenever both orders are open,
+        so a vertical run only stops where a wall forces a horizontal turn,
+        and a horizontal run only stops where one of its vertical runs finds
+        such a cell or the treasure. A* then expands the stopping cells only;
+        the jumps between them are filled back in, so the returned path lists
+        every cell like the other searches.
+        """
+        if not self.is_valid_move(start_x, start_y):
+            return None
+        if not self.is_valid_move(treasure_x, treasure_y):
+            return None
+
+        rows, cols = self.rows, self.cols
+        free, up_stops, down_stops = self._jump_data()
+        treasure = (treasure_x, treasure_y)
+
+        def jump_vertical(x: int, y: int, dx: int) -> Optional[Tuple[int, int]]:
+            stop = (down_stops if dx == 1 else up_stops)[x * cols + y]
+            # The treasure counts as a stop on its column
+            if y == treasure_y and (treasure_x - x) * dx > 0 and (stop - treasure_x) * dx > 0:
+                return treasure
+            if 0 <= stop < rows and free[stop * cols + y]:
+                return stop, y
+            return None
+
+        def jump_horizontal(x: int, y: int, dy: int) -> Optional[Tuple[int, int]]:
+            while True:
+                y += dy
+                if not (0 <= y < cols and free[x * cols + y]):
+                    return None
+                if (x, y) == treasure or jump_vertical(x, y, -1) or jump_vertical(x, y, 1):
+                    return x, y
+
+        start = (start_x, start_y)
+        start_h = abs(treasure_x - start_x) + abs(treasure_y - start_y)
+        pq = frontier()
+        pq.push(start, (start_h, start_h))
+        g_scores = {start: 0}
+        parent = {start: None}
+
+        while pq:
+            current, _ = pq.pop()
+            if current == treasure:
+                return self._interpolate(self._reconstruct_path(parent, treasure))
+
+            x, y = current
+            previous = parent[current]
+            if previous is None:
+                jumps = [jump_vertical(x, y, -1), jump_horizontal(x, y, 1),
+                         jump_vertical(x, y, 1), jump_horizontal(x, y, -1)]
+            elif previous[0] == x:
+                # Arrived horizontally: keep going or turn either way vertically
+                dy = 1 if y > previous[1] else -1
+                jumps = [jump_vertical(x, y, -1), jump_horizontal(x, y, dy), jump_vertical(x, y, 1)]
+            else:
+                # Arrived vertically: keep going, and turn only where forced
+                dx = 1 if x > previous[0] else -1
+                jumps = [jump_vertical(x, y, dx)]
+                for dy in (1, -1):
+                    side = y + dy
+                    if (0 <= side < cols and free[x * cols + side]
+                            and not free[(x - dx) * cols + side]):
+                        jumps.append(jump_horizontal(x, y, dy))
+
+            for jump in jumps:
+                if jump is None:
+                    continue
+                new_g = g_scores[current] + abs(jump[0] - x) + abs(jump[1] - y)
+                if new_g < g_scores.get(jump, INF):
+                    g_scores[jump] = new_g
+                    parent[jump] = current
+                    h = abs(treasure_x - jump[0]) + abs(treasure_y - jump[1])
+                    pq.push(jump, (new_g + h, h))
+
+        return None
+
+    @staticmethod
+    def _interpolate(jump_points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Fill in the cells of the straight runs between consecutive jump points."""
+        path = jump_points[:1]
+        for (x1, y1), (x2, y2) in zip(jump_points, jump_points[1:]):
+            dx = (x2 > x1) - (x2 < x1)
+            dy = (y2 > y1) - (y2 < y1)
+            for step in range(1, abs(x2 - x1) + abs(y2 - y1) + 1):
+                path.append((x1 + dx * step, y1 + dy * step))
+        return path
 
     def _reconstruct_path(self, parent: dict, 
                          end: Tuple[int, int]) -> List[Tuple[int, int]]:
@@ -77,10 +463,10 @@ class TreasureHunt:
         """Print the grid without any path."""
         print(f"\n{title}")
         print("+" + "-" * (self.cols * 4 - 1) + "+")
-        for row in self.grid:
+        for row in self.blocked:
             print("|", end=" ")
             for cell in row:
-                if cell == 1:
+                if cell:
                     print("1", end=" | ")
                 else:
                     print("0", end=" | ")
@@ -92,7 +478,7 @@ class TreasureHunt:
             print("\nNo valid path found to the treasure!")
             return
 
-        visual_grid = [row[:] for row in self.grid]
+        visual_grid = [[1 if cell else 0 for cell in row] for row in self.blocked.tolist()]
         
         # Mark the path with '*'
         for x, y in path: